@@ -0,0 +1,308 @@
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from feature_engineering import FeatureEngineer
+from panel_indicators import Panel, PanelIndicators
+from recommendation_engine import RecommendationScorer
+
+
+class RecommendationBacktester:
+    """
+    RecommendationBacktester class replays the recommendation rules on every bar of every ticker and simulates the resulting trades, so the Strong Buy / Strong Sell logic can be judged on history instead of only on the latest bar.
+    Class Methods:
+    1. prepare(data, params=None): Builds a Panel with OHLC prices, all indicators, signals and stop-loss levels for params from {ticker: cleaned df}.
+    2. directions(panel, weights=None, sentiment=0.0, signal="recommendation", strong_only=False, params=None): Returns a (dates x tickers) int8 array of trade directions (+1 long, -1 short, 0 no signal).
+    3. simulate(panel, direction, trailing=False): Runs the trades of a direction array (with any number of columns per ticker) and returns the equity curves, trade counts and wins.
+    4. run(panel, weights=None, sentiment=0.0, signal="recommendation", strong_only=False, trailing=False, params=None): Backtests one set of weights and returns one row of statistics per ticker.
+    5. sweep(panel, grid=None, sentiment=0.0, max_workers=None, ..., params=None): Backtests every combination of a weight grid in parallel and returns one row per combination.
+    6. portfolio_statistics(equity, trades, wins, n_tickers, labels): Summarizes a simulation of several side by side blocks of tickers, one row per block.
+
+    Trading rules:
+    - signal="recommendation": RecommendationScorer.score_history; Buy/Strong Buy go long and Sell/Strong Sell go short (only the Strong ones with strong_only=True).
+    - signal="composite": FeatureEngineer Composite_Signal; Strong Buy goes long and Strong Sell goes short.
+    - Trades are entered at the close of the signal bar. A position is held until the opposite signal (the position is reversed at the close) or until its stop is hit.
+    - The stop is Stop_Loss_Long / Stop_Loss_Short (close -/+ 2 ATR) of the entry bar, or moved every bar in the trade's favour with trailing=True. A stopped out trade exits at the stop, or at the open when the bar gaps through it.
+    - The ATR threshold that blocks Strong Buy / Strong Sell on a bar is the 75% quantile of the ticker's ATR over all its earlier bars (expanding, up to t-1), so no bar is scored with future volatility. Until ATR_MIN_BARS earlier ATR values exist the threshold is NaN and no Strong signal is given.
+
+    Statistics: Trades, Hit Rate (winning trades / trades), Total Return and Max Drawdown of a 1.0 equity curve per ticker; sweep reports them for the equal weight portfolio of all tickers.
+    The time loop of simulate is vectorized across all columns, so a whole weight grid is simulated in one pass per worker.
+    """
+
+    PRICE_COLUMNS = ("Open", "High", "Low", "Close", "Volume")
+    ATR_MIN_BARS = 20
+    DEFAULT_GRID = {
+        "tech": [0.5, 0.6, 0.7],
+        "sentiment": [0.3, 0.4, 0.5],
+        "ma": [0.3, 0.5, 0.7],
+        "macd": [0.2, 0.4, 0.6],
+        "rsi": [0.1, 0.3, 0.5],
+        "stochastic": [0.1, 0.2, 0.3],
+    }
+
+    @staticmethod
+    def prepare(data, params=None):
+        """
+        Build a backtest Panel from {ticker: cleaned df} (any sort order).
+        params are the indicator windows and FeatureEngineer thresholds; pass the same params to run / sweep so the score uses the thresholds of the signals.
+        """
+        panel = Panel.from_frames(data, RecommendationBacktester.PRICE_COLUMNS)
+        PanelIndicators.calculate_all_indicators(panel, params)
+        PanelIndicators.create_all_features(panel, params)
+        return panel
+
+    @classmethod
+    def _atr_threshold(cls, panel):
+        """Helper returning the (dates x tickers) 75% quantile of each ticker's ATR over its bars before every date"""
+        atr = pd.DataFrame(panel["ATR"])
+        return atr.expanding(cls.ATR_MIN_BARS).quantile(0.75).shift(1).to_numpy()
+
+    @classmethod
+    def directions(
+        cls,
+        panel,
+        weights=None,
+        sentiment=0.0,
+        signal="recommendation",
+        strong_only=False,
+        params=None,
+    ):
+        """
+        Trade direction of every bar: +1 long, -1 short, 0 no signal.
+        params are the FeatureEngineer thresholds the panel signals were built with, used by the recommendation score too.
+        """
+        if signal == "composite":
+            codes = FeatureEngineer.CODES
+            composite = panel["Composite_Signal"]
+            direction = (composite == codes["Strong Buy"]).astype(np.int8)
+            direction -= composite == codes["Strong Sell"]
+        elif signal == "recommendation":
+            recommendation = RecommendationScorer.score_history(
+                panel, sentiment, cls._atr_threshold(panel), weights, params
+            )["Recommendation"]
+            # Codes index RecommendationScorer.RECOMMENDATIONS: 0 Strong Buy, 1 Buy, 2 Hold, 3 Sell, 4 Strong Sell
+            if strong_only:
+                direction = (recommendation == 0).astype(np.int8)
+                direction -= recommendation == 4
+            else:
+                direction = (recommendation <= 1).astype(np.int8)
+                direction -= recommendation >= 3
+        else:
+            raise ValueError(f"Unknown backtest signal: {signal}")
+
+        direction[np.isnan(panel["Close"])] = 0
+        return direction
+
+    @staticmethod
+    def simulate(panel, direction, trailing=False):
+        """
+        Simulate the trades of direction, a (dates x columns) array whose columns are the panel tickers repeated any number of times (e.g. once per weight combination).
+
+        Returns:
+        equity: (dates x columns) equity curves starting at 1.0
+        trades: Number of closed trades per column (a trade still open at the end is closed at the last close)
+        wins: Number of closed trades with a positive return per column
+        """
+        repeats = direction.shape[1] // len(panel.tickers)
+
+        def tiled(field):
+            return np.tile(panel[field], repeats) if repeats > 1 else panel[field]
+
+        open_, high, low, close = tiled("Open"), tiled("High"), tiled("Low"), tiled("Close")
+        stop_long, stop_short = tiled("Stop_Loss_Long"), tiled("Stop_Loss_Short")
+
+        n_dates, n_cols = direction.shape
+        equity = np.ones((n_dates, n_cols))
+        position = np.zeros(n_cols, dtype=np.int8)
+        entry = np.full(n_cols, np.nan)
+        stop = np.full(n_cols, np.nan)
+        prev_close = np.full(n_cols, np.nan)
+        value = np.ones(n_cols)
+        trades = np.zeros(n_cols, dtype=np.int64)
+        wins = np.zeros(n_cols, dtype=np.int64)
+
+        def close_trades(mask, price):
+            returns = position[mask] * (price[mask] / entry[mask] - 1)
+            trades[mask] += 1
+            wins[mask] += returns > 0
+            position[mask] = 0
+
+        for t in range(n_dates):
+            bar = ~np.isnan(close[t])
+            long_ = bar & (position == 1)
+            short = bar & (position == -1)
+
+            # Stops, checked on this bar's range; a gap through the stop fills at the open
+            stopped_long = long_ & (low[t] <= stop)
+            stopped_short = short & (high[t] >= stop)
+            stopped = stopped_long | stopped_short
+            exit_price = np.where(
+                stopped_long,
+                np.minimum(open_[t], stop),
+                np.where(stopped_short, np.maximum(open_[t], stop), close[t]),
+            )
+
+            held = long_ | short
+            value[held] *= 1 + position[held] * (exit_price[held] / prev_close[held] - 1)
+            close_trades(stopped, exit_price)
+
+            # Signals at the close: enter when flat, reverse on the opposite signal
+            signal = direction[t]
+            reverse = bar & (position != 0) & (signal == -position)
+            close_trades(reverse, close[t])
+            enter = bar & (position == 0) & (signal != 0)
+            position[enter] = signal[enter]
+            entry[enter] = close[t][enter]
+            if trailing:
+                held = bar & ~enter
+                stop = np.where(held & (position == 1), np.fmax(stop, stop_long[t]), stop)
+                stop = np.where(held & (position == -1), np.fmin(stop, stop_short[t]), stop)
+            stop[enter] = np.where(position[enter] == 1, stop_long[t][enter], stop_short[t][enter])
+
+            prev_close[bar] = close[t][bar]
+            equity[t] = value
+
+        still_open = position != 0
+        close_trades(still_open, prev_close)
+        return equity, trades, wins
+
+    @staticmethod
+    def _drawdown(equity):
+        """Helper returning the maximum drawdown (a negative fraction) of every equity curve"""
+        return (equity / np.maximum.accumulate(equity, axis=0) - 1).min(axis=0)
+
+    @classmethod
+    def run(
+        cls,
+        panel,
+        weights=None,
+        sentiment=0.0,
+        signal="recommendation",
+        strong_only=False,
+        trailing=False,
+        params=None,
+    ):
+        """
+        Backtest one set of weights and return a DataFrame with Ticker, Trades, Wins, Hit Rate, Total Return and Max Drawdown.
+        params are the FeatureEngineer thresholds the panel was prepared with.
+        """
+        direction = cls.directions(panel, weights, sentiment, signal, strong_only, params)
+        equity, trades, wins = cls.simulate(panel, direction, trailing)
+        with np.errstate(invalid="ignore"):
+            hit_rate = wins / trades
+        return pd.DataFrame(
+            {
+                "Ticker": panel.tickers,
+                "Trades": trades,
+                "Wins": wins,
+                "Hit Rate": hit_rate,
+                "Total Return": equity[-1] - 1,
+                "Max Drawdown": cls._drawdown(equity),
+            }
+        )
+
+    @classmethod
+    def _run_combinations(
+        cls, panel, combinations, sentiment, signal, strong_only, trailing, params=None
+    ):
+        """Helper simulating a list of weight dictionaries in one pass and returning one statistics dictionary per combination"""
+        n_tickers = len(panel.tickers)
+        direction = np.hstack(
+            [
+                cls.directions(panel, weights, sentiment, signal, strong_only, params)
+                for weights in combinations
+            ]
+        )
+        equity, trades, wins = cls.simulate(panel, direction, trailing)
+        return cls.portfolio_statistics(equity, trades, wins, n_tickers, combinations)
+
+    @classmethod
+    def portfolio_statistics(cls, equity, trades, wins, n_tickers, labels):
+        """
+        Turn the output of simulate over len(labels) blocks of n_tickers columns into one statistics dictionary per block (the label dictionary plus Trades, Hit Rate, Total Return and Max Drawdown of the equal weight portfolio)
+        """
+        results = []
+        for k, label in enumerate(labels):
+            columns = slice(k * n_tickers, (k + 1) * n_tickers)
+            portfolio = equity[:, columns].mean(axis=1, keepdims=True)
+            n_trades = trades[columns].sum()
+            row = dict(label)
+            row.update(
+                {
+                    "Trades": n_trades,
+                    "Hit Rate": wins[columns].sum() / n_trades if n_trades else np.nan,
+                    "Total Return": portfolio[-1, 0] - 1,
+                    "Max Drawdown": cls._drawdown(portfolio)[0],
+                }
+            )
+            results.append(row)
+        return results
+
+    @classmethod
+    def sweep(
+        cls,
+        panel,
+        grid=None,
+        sentiment=0.0,
+        max_workers=None,
+        chunk_size=32,
+        signal="recommendation",
+        strong_only=False,
+        trailing=False,
+        params=None,
+    ):
+        """
+        Backtest every combination of the weight grid ({weight name: list of values}, DEFAULT_GRID by default) on a process pool.
+        Combinations are simulated chunk_size at a time in one vectorized pass; max_workers=1 runs everything in this process.
+        params are the FeatureEngineer thresholds the panel was prepared with.
+
+        Returns:
+        A DataFrame with one row per combination (the weights, Trades, Hit Rate, Total Return and Max Drawdown), best Total Return first
+        """
+        grid = cls.DEFAULT_GRID if grid is None else grid
+        names = list(grid)
+        combinations = [dict(zip(names, values)) for values in itertools.product(*grid.values())]
+        chunks = [
+            combinations[i : i + chunk_size] for i in range(0, len(combinations), chunk_size)
+        ]
+
+        results = []
+        if max_workers == 1 or len(chunks) == 1:
+            for chunk in chunks:
+                results.extend(
+                    cls._run_combinations(
+                        panel, chunk, sentiment, signal, strong_only, trailing, params
+                    )
+                )
+        else:
+            max_workers = max_workers or os.cpu_count()
+            with ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_init_worker,
+                initargs=(panel, sentiment, signal, strong_only, trailing, params),
+            ) as executor:
+                for chunk_results in executor.map(_run_chunk, chunks):
+                    results.extend(chunk_results)
+
+        return (
+            pd.DataFrame(results)
+            .sort_values("Total Return", ascending=False)
+            .reset_index(drop=True)
+        )
+
+
+# The panel is sent to every worker process once, not with every chunk
+_worker_args = None
+
+
+def _init_worker(panel, sentiment, signal, strong_only, trailing, params):
+    global _worker_args
+    _worker_args = (panel, sentiment, signal, strong_only, trailing, params)
+
+
+def _run_chunk(combinations):
+    panel, sentiment, signal, strong_only, trailing, params = _worker_args
+    return RecommendationBacktester._run_combinations(
+        panel, combinations, sentiment, signal, strong_only, trailing, params
+    )
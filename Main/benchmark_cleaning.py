@@ -0,0 +1,51 @@
+"""
+The code below benchmarks the StockDataCleaner fast path against the generic cleaning path.
+
+1. It loads the raw CSV files of the bundled historical data with StockDataCollector.
+
+2. It cleans every ticker with the generic path (regex price stripping and pd.to_datetime without a format) and with the Nasdaq fast path, using the best of several repeats for each.
+
+3. It checks that both paths give identical DataFrames and prints the timings and speedup per ticker.
+
+Run it from the Main directory: python benchmark_cleaning.py
+"""
+
+import time
+import pandas as pd
+from data_collection import StockDataCollector
+from data_cleaning import StockDataCleaner
+
+REPEATS = 5
+
+
+def best_time(func, *args):
+    """Best wall time of func(*args) over REPEATS runs"""
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+collector = StockDataCollector()
+collector.collect_data()
+
+total_generic = 0.0
+total_fast = 0.0
+print(f"\n{'Ticker':<8}{'Rows':>8}{'Generic (ms)':>15}{'Fast (ms)':>12}{'Speedup':>10}")
+for ticker, raw_df in collector.get_stock_data().items():
+    pd.testing.assert_frame_equal(
+        StockDataCleaner._clean_generic(raw_df), StockDataCleaner._clean_nasdaq(raw_df)
+    )
+    generic = best_time(StockDataCleaner._clean_generic, raw_df)
+    fast = best_time(StockDataCleaner._clean_nasdaq, raw_df)
+    total_generic += generic
+    total_fast += fast
+    print(
+        f"{ticker:<8}{len(raw_df):>8}{generic * 1000:>15.2f}{fast * 1000:>12.2f}{generic / fast:>9.1f}x"
+    )
+
+print(
+    f"{'Total':<16}{total_generic * 1000:>15.2f}{total_fast * 1000:>12.2f}{total_generic / total_fast:>9.1f}x"
+)
@@ -0,0 +1,132 @@
+"""
+The code below benchmarks the stages of the stock analysis pipeline separately, so regressions and scaling behaviour become visible.
+
+1. For every requested scale (tickers x years) it writes a synthetic universe of Nasdaq-layout CSVs with SyntheticOHLCVGenerator (or uses the bundled data with --bundled).
+
+2. It times each stage on its own, using the best of --repeats runs:
+    - collect: StockDataCollector.collect_data
+    - clean: StockDataCleaner.clean_all
+    - indicators: TechnicalIndicators.calculate_all_indicators for every ticker (--backend selects ta/numpy/numba)
+    - features: FeatureEngineer.create_all_features for every ticker
+
+3. It runs each stage once more under tracemalloc to report its peak memory.
+
+4. It prints one table row per scale and stage, with wall time, time per row and peak memory.
+
+Run it from the Main directory, e.g.: python benchmark_pipeline.py --scales 5x10 50x10 200x30
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+from data_collection import StockDataCollector
+from data_cleaning import StockDataCleaner
+from technical_indicators import TechnicalIndicators
+from feature_engineering import FeatureEngineer
+from synthetic_data import SyntheticOHLCVGenerator
+
+
+def stage_collect(data_path, _):
+    collector = StockDataCollector(historical_data_path=data_path)
+    collector.collect_data()
+    return collector
+
+
+def stage_clean(_, collector):
+    return StockDataCleaner.clean_all(collector)
+
+
+def make_stage_indicators(backend):
+    def stage_indicators(_, cleaned):
+        return {
+            ticker: TechnicalIndicators.calculate_all_indicators(df.copy(), backend=backend)
+            for ticker, df in cleaned.items()
+        }
+
+    return stage_indicators
+
+
+def stage_features(_, indicators):
+    return {
+        ticker: FeatureEngineer.create_all_features(df.copy())
+        for ticker, df in indicators.items()
+    }
+
+
+def run_quiet(func, *args):
+    """Run func without its progress prints"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args)
+
+
+def measure(func, data_path, stage_input, repeats):
+    """Return (output, best wall time in seconds, peak traced memory in bytes) of one stage"""
+    best = float("inf")
+    output = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        output = run_quiet(func, data_path, stage_input)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    run_quiet(func, data_path, stage_input)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return output, best, peak
+
+
+def run_scale(label, data_path, repeats, backend):
+    """Benchmark every stage on the CSV files in data_path and print the results"""
+    stages = [
+        ("collect", stage_collect),
+        ("clean", stage_clean),
+        ("indicators", make_stage_indicators(backend)),
+        ("features", stage_features),
+    ]
+    stage_input = None
+    rows = None
+    for name, func in stages:
+        stage_input, seconds, peak = measure(func, data_path, stage_input, repeats)
+        if rows is None:
+            rows = sum(len(df) for df in stage_input.get_stock_data().values())
+        print(
+            f"{label:<14}{name:<12}{rows:>12,}{seconds * 1000:>12.1f}"
+            f"{seconds / rows * 1e9:>12.0f}{peak / 2**20:>12.1f}"
+        )
+
+
+def parse_scale(text):
+    """Parse "TICKERSxYEARS" (e.g. 50x10)"""
+    tickers, years = text.lower().split("x")
+    return int(tickers), float(years)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the collect -> clean -> indicators -> features pipeline")
+    parser.add_argument("--scales", nargs="+", default=["5x10", "50x10", "200x10"], help="TICKERSxYEARS synthetic universes")
+    parser.add_argument("--bundled", action="store_true", help="Also benchmark the bundled Datasets/Historical Data")
+    parser.add_argument("--repeats", type=int, default=3, help="Timed runs per stage (best is reported)")
+    parser.add_argument("--backend", default="ta", help="Indicator backend: ta, numpy or numba")
+    args = parser.parse_args()
+
+    print(f"{'Scale':<14}{'Stage':<12}{'Rows':>12}{'Time (ms)':>12}{'ns/row':>12}{'Peak (MB)':>12}")
+    if args.bundled:
+        run_scale("bundled", StockDataCollector().historical_data_path, args.repeats, args.backend)
+
+    for scale in args.scales:
+        n_tickers, n_years = parse_scale(scale)
+        data_path = tempfile.mkdtemp(prefix="stock_bench_")
+        try:
+            SyntheticOHLCVGenerator(n_tickers=n_tickers, n_years=n_years).write_csvs(data_path)
+            run_scale(scale, data_path, args.repeats, args.backend)
+        finally:
+            shutil.rmtree(data_path, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+import numpy as np
+import pandas as pd
+
+
+class ChartDownsampler:
+    """
+    ChartDownsampler class reduces the rows of a date range to a point budget before they are turned into Plotly figures, so long histories do not ship every bar to the browser.
+    Class Methods:
+    1. lttb(x, y, threshold): Returns the positions of at most threshold points chosen by Largest-Triangle-Three-Buckets, which keeps the peaks and troughs that shape a line.
+    2. line(df, column, threshold=LINE_POINTS): Returns the Date and column rows of df kept by lttb (all rows when there are fewer than threshold).
+    3. resolution(dates, threshold=CANDLES): Returns the coarsest bar size needed to show the dates in at most threshold candles: "Daily", "Weekly", "Monthly", "Quarterly" or "Yearly".
+    4. ohlc(df, threshold=CANDLES): Returns (bars, resolution): df aggregated to that resolution (first Open, max High, min Low, last Close, summed Volume), each bar dated by its first trading day.
+
+    df is a frame of one ticker sorted oldest first, as returned by DateIndex.slice or FeatureStore.read. Budgets are in points per chart: a line needs about one point per pixel of a wide chart, a candle a few pixels.
+    """
+
+    LINE_POINTS = 1500
+    CANDLES = 300
+    # Bar sizes from finest to coarsest: (name, pandas period, approximate calendar days per bar)
+    RESOLUTIONS = [
+        ("Weekly", "W", 7),
+        ("Monthly", "M", 365.25 / 12),
+        ("Quarterly", "Q", 365.25 / 4),
+        ("Yearly", "Y", 365.25),
+    ]
+
+    @staticmethod
+    def lttb(x, y, threshold):
+        """
+        Positions of the points kept by Largest-Triangle-Three-Buckets.
+        The first and last points are always kept; the others are split into threshold - 2 buckets, and each bucket keeps the point forming the largest triangle with the point kept in the previous bucket and the average of the next bucket.
+        y must not contain NaN (line drops those rows first).
+        """
+        n = len(y)
+        if threshold >= n or threshold < 3:
+            return np.arange(n)
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+
+        edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+        # Average point of every bucket, plus the last point as the bucket after the last one
+        starts = np.append(edges[:-1], n - 1)
+        counts = np.diff(np.append(starts, n))
+        avg_x = (np.add.reduceat(x, starts) / counts).tolist()
+        avg_y = (np.add.reduceat(y, starts) / counts).tolist()
+        bounds = edges.tolist()
+
+        selected = np.empty(threshold, dtype=np.int64)
+        selected[0], selected[-1] = 0, n - 1
+        a = 0
+        for i in range(threshold - 2):
+            lo, hi = bounds[i], bounds[i + 1]
+            xa, ya = x[a], y[a]
+            # Twice the triangle area, up to its sign, is linear in the candidate point
+            area = np.abs((xa - avg_x[i + 1]) * (y[lo:hi] - ya) - (xa - x[lo:hi]) * (avg_y[i + 1] - ya))
+            a = lo + int(area.argmax())
+            selected[i + 1] = a
+        return selected
+
+    @classmethod
+    def line(cls, df, column, threshold=None):
+        """
+        Date and column of the rows of df that lttb keeps for threshold points
+        """
+        threshold = cls.LINE_POINTS if threshold is None else threshold
+        if len(df) <= threshold:
+            return df[["Date", column]]
+        values = df[column].to_numpy(float)
+        if np.isnan(values).any():
+            # NaN points are not drawn anyway and would poison the bucket averages
+            df = df[~np.isnan(values)]
+            values = values[~np.isnan(values)]
+            if len(df) <= threshold:
+                return df[["Date", column]]
+        dates = df["Date"].to_numpy()
+        # Days since the first row, so the triangle areas follow calendar time like the chart's x axis
+        days = (dates - dates[0]) / np.timedelta64(1, "D")
+        return df[["Date", column]].iloc[cls.lttb(days, values, threshold)]
+
+    @classmethod
+    def resolution(cls, dates, threshold=None):
+        """
+        Bar size for a sorted array of dates: Daily if every bar fits, otherwise the finest period giving at most threshold bars
+        """
+        threshold = cls.CANDLES if threshold is None else threshold
+        if len(dates) <= threshold:
+            return "Daily"
+        span = (dates[-1] - dates[0]) / np.timedelta64(1, "D")
+        for name, _, days in cls.RESOLUTIONS:
+            if span / days + 1 <= threshold:
+                return name
+        return cls.RESOLUTIONS[-1][0]
+
+    @classmethod
+    def ohlc(cls, df, threshold=None):
+        """
+        Aggregate the Open, High, Low, Close and Volume of df to the resolution chosen for its dates.
+        Returns the bars (a frame with Date, Open, High, Low, Close and Volume) and the resolution name.
+        """
+        columns = ["Date", "Open", "High", "Low", "Close", "Volume"]
+        dates = df["Date"].to_numpy()
+        resolution = cls.resolution(dates, threshold)
+        if resolution == "Daily":
+            return df[columns], resolution
+
+        period = dict((name, freq) for name, freq, _ in cls.RESOLUTIONS)[resolution]
+        keys = pd.DatetimeIndex(dates).to_period(period).asi8
+        # Rows are sorted, so every bar is a run of equal period keys
+        starts = np.flatnonzero(np.diff(keys, prepend=keys[0] - 1))
+        ends = np.append(starts[1:], len(keys)) - 1
+        bars = pd.DataFrame(
+            {
+                "Date": dates[starts],
+                "Open": df["Open"].to_numpy(float)[starts],
+                "High": np.fmax.reduceat(df["High"].to_numpy(float), starts),
+                "Low": np.fmin.reduceat(df["Low"].to_numpy(float), starts),
+                "Close": df["Close"].to_numpy(float)[ends],
+                "Volume": np.add.reduceat(df["Volume"].to_numpy(float), starts),
+            }
+        )
+        return bars, resolution
@@ -5,7 +5,13 @@ It allows users to select a stock ticker, view its historical price chart, techn
 The dashboard also provides a summary of all tickers, including their mean close price, standard deviation, minimum and maximum close price, mean volume, mean RSI, and mean ATR.
 
 The dashboard uses various libraries, including Streamlit, Pandas, Plotly, and NumPy, to load and process historical stock data, calculate technical indicators, and generate visualizations.
-It also uses a custom get_recommendation function to generate recommendations based on technical analysis and sentiment analysis.
+It also uses RecommendationScorer (recommendation_engine.py) to generate recommendations based on technical analysis and sentiment analysis.
+The sentiment scores come from the saved StockSentimentAnalyzer model (sentiment_analysis.py), applied to the ticker mentions of the sentiment corpus.
+When a dated corpus (Date and Text columns) is available, the recommendations use the decaying SentimentIndex (sentiment_index.py) as of each ticker's latest bar instead of the score of the whole corpus. The bundled corpus has no Date column, so set STOCK_SENTIMENT_CORPUS=<csv> to a dated corpus to enable it; the sidebar says which of the two is in use.
+Indicators and features are read from the precomputed feature store (python feature_store.py build) when it exists, so nothing is computed at page load; otherwise they are computed on the first load.
+The Summary Statistics of any date range come from prefix sums and min/max tables built once per load (RangeStatistics), not from a scan of every ticker's rows.
+The charts of the first three tabs are downsampled on the server (ChartDownsampler): lines to a fixed point budget with LTTB, candlesticks to weekly, monthly, quarterly or yearly bars when the selected range holds too many days.
+Every loader run (a cache miss) and every pipeline stage it runs is recorded in the shared PipelineMetrics (instrumentation.py), including the per-ticker errors shown as warnings; the sidebar shows the totals, and STOCK_METRICS_PORT=<port> serves them in the Prometheus format on http://127.0.0.1:<port>/metrics.
 
 The dashboard is divided into several tabs, including:
 
@@ -27,6 +33,15 @@ from technical_indicators import TechnicalIndicators
 from feature_engineering import FeatureEngineer
 from data_collection import StockDataCollector
 from data_cleaning import StockDataCleaner
+from panel_indicators import Panel
+from feature_store import FeatureStore
+from date_index import DateIndex
+from range_statistics import RangeStatistics
+from chart_downsampling import ChartDownsampler
+from recommendation_engine import RecommendationScorer
+from sentiment_analysis import StockSentimentAnalyzer
+from sentiment_index import SentimentIndex
+from instrumentation import metrics
 import numpy as np
 from datetime import datetime
 import os
@@ -40,16 +55,37 @@ historical_data_dir = os.path.join(base_dir, "..", "Datasets", "Historical Data"
 sentiment_data_path = os.path.join(
     base_dir, "..", "Datasets", "Stock Suggestion", "top5_stock_recommendations.csv"
 )
+feature_store_dir = os.path.join(base_dir, "..", "Datasets", ".features")
+sentiment_corpus_path = os.path.join(
+    base_dir, "..", "Datasets", "Sentiment Data", "stock_sentiment_data.csv"
+)
+# Dated corpus (Date and Text columns) of the SentimentIndex; the bundled corpus has no dates
+dated_corpus_path = os.environ.get("STOCK_SENTIMENT_CORPUS", sentiment_corpus_path)
 
 
-@st.cache_data
+# Prometheus export of the pipeline metrics, started once per server process when STOCK_METRICS_PORT is set
+@st.cache_resource
+def start_metrics_server(port):
+    return metrics.serve(port)
+
+
+if os.environ.get("STOCK_METRICS_PORT"):
+    start_metrics_server(int(os.environ["STOCK_METRICS_PORT"]))
+
+
+# cache_resource hands every rerun the same frames instead of unpickling a copy; they are only ever sliced, never modified
+@st.cache_resource
+@metrics.timed("dashboard.load_data")
 def load_data():
     data = {}
-    collector = StockDataCollector(historical_data_path=historical_data_dir)
+    collector = StockDataCollector(
+        historical_data_path=historical_data_dir, use_cache=True
+    )
 
     try:
         collector.collect_data()
-        data = StockDataCleaner.clean_all(collector)
+        # Oldest bar first, so indicators run forward in time and iloc[-1] is the latest bar
+        data = StockDataCleaner.clean_all(collector, sort_descending=False)
         if not data:
             st.error("No valid ticker data loaded.")
             return data
@@ -64,12 +100,14 @@ def load_data():
                 )
                 continue
             try:
-                df = TechnicalIndicators.calculate_all_indicators(df)
-                df = FeatureEngineer.create_all_features(df)
+                # The stages record their time and errors under this ticker
+                with metrics.ticker(ticker):
+                    df = TechnicalIndicators.calculate_all_indicators(df)
+                    df = FeatureEngineer.create_all_features(df)
                 if df.empty:
                     st.warning(f"Skipping {ticker}: Empty DataFrame after processing.")
                     continue
-                valid_data[ticker] = df
+                valid_data[ticker] = DateIndex.set_index(df)
             except Exception as e:
                 st.warning(f"Failed to process {ticker}: {str(e)}")
                 continue
@@ -84,11 +122,50 @@ def load_data():
     return data
 
 
-data = load_data()
-if not data:
-    st.stop()
+# Precomputed indicators and features (python feature_store.py build), memory-mapped and read per ticker and date range
+@st.cache_resource
+@metrics.timed("dashboard.load_store")
+def load_store():
+    store = FeatureStore(feature_store_dir)
+    if store.current_version() is None:
+        return None
+    return store
+
+
+@st.cache_data(ttl=300)
+def store_is_stale(version):
+    return store.is_stale(historical_data_dir, store.manifest(version)["params"])
+
+
+store = load_store()
+if store is not None:
+    data = None
+    tickers = store.tickers()
+    # Windows and thresholds the store was built with, so the scores use the thresholds of the stored signals
+    feature_params = store.manifest()["params"]
+    if store_is_stale(store.current_version()):
+        st.sidebar.warning(
+            "The feature store is older than the historical data. Rebuild it with: python feature_store.py build"
+        )
+else:
+    st.info(
+        "No feature store found, computing indicators now. Run python feature_store.py build to precompute them."
+    )
+    data = load_data()
+    if not data:
+        st.stop()
+    feature_params = None
+    tickers = sorted(list(data.keys()))
+
+
+def read_ticker(ticker, start=None, end=None, columns=None):
+    """Features of ticker between start and end (inclusive), from the feature store or the in-memory data"""
+    if store is not None:
+        return store.read(ticker, start, end, columns)
+    # A positional slice (a view) of the cached frame; all columns are kept, since selecting columns would copy
+    return DateIndex.slice(data[ticker], start, end)
+
 
-tickers = sorted(list(data.keys()))
 if not tickers:
     st.error(
         "No tickers loaded. Check the historical data directory and CSV column names."
@@ -96,141 +173,129 @@ if not tickers:
     st.stop()
 
 
-# Generate random sentiment data for specified tickers
+# The sentiment model is trained once and saved (python sentiment_analysis.py train); later runs only load it
+@st.cache_resource
+@metrics.timed("dashboard.load_sentiment_analyzer")
+def load_sentiment_analyzer():
+    return StockSentimentAnalyzer.load_or_train(sentiment_corpus_path)
+
+
+# Sentiment scores (-1 to 1) predicted by the sentiment model for the mentions of every ticker in the sentiment corpus
 @st.cache_data
+@metrics.timed("dashboard.load_sentiment_data")
 def load_sentiment_data(tickers):
-    np.random.seed(42)
+    try:
+        analyzer = load_sentiment_analyzer()
+        texts = pd.read_csv(sentiment_corpus_path)["Text"]
+        scores = analyzer.ticker_scores(texts, tickers).set_index("Ticker")
+    except Exception as e:
+        st.warning(f"Sentiment model unavailable: {str(e)}")
+        scores = pd.DataFrame(columns=["Count", "Sentiment Score"])
+
     sentiment_data = {}
     for ticker in tickers:
-        score = np.random.uniform(-1, 1)
-        if ticker in ["AAPL", "META", "NFLX", "GOOGL", "AMZN"]:
-            if score > 0.5:
-                sentiment_data[ticker] = (
-                    score,
-                    f"Due to rising hype in {ticker} stocks, they are likely to increase - Strong Buy",
-                )
-            elif score < -0.5:
-                sentiment_data[ticker] = (
-                    score,
-                    f"Due to declining sentiment in {ticker} stocks, they may face downward pressure - Strong Sell",
-                )
-            else:
-                sentiment_data[ticker] = (
-                    score,
-                    f"{ticker} stocks are showing neutral sentiment - Hold",
-                )
+        if ticker not in scores.index:
+            sentiment_data[ticker] = (
+                0.0,
+                f"{ticker} sentiment analysis not available - Hold",
+            )
+            continue
+        score = float(scores.at[ticker, "Sentiment Score"])
+        mentions = int(scores.at[ticker, "Count"])
+        if score > 0.5:
+            sentiment_data[ticker] = (
+                score,
+                f"Due to rising hype in {ticker} stocks ({mentions} mentions), they are likely to increase - Strong Buy",
+            )
+        elif score < -0.5:
+            sentiment_data[ticker] = (
+                score,
+                f"Due to declining sentiment in {ticker} stocks ({mentions} mentions), they may face downward pressure - Strong Sell",
+            )
         else:
             sentiment_data[ticker] = (
                 score,
-                f"{ticker} sentiment analysis not available - Hold",
+                f"{ticker} stocks are showing neutral sentiment ({mentions} mentions) - Hold",
             )
     return sentiment_data
 
 
 sentiment_data = load_sentiment_data(tickers)
 
+
+# All tickers as one (dates x tickers) panel, so the All Tickers tab is scored in a single vectorized pass
+@st.cache_resource
+@metrics.timed("dashboard.load_panel")
+def load_panel(tickers, version):
+    columns = [
+        "Close",
+        "Volume",
+        "RSI",
+        "ATR",
+        "Stoch_%K",
+        "Stoch_%D",
+        "Composite_Signal",
+        "MA_Signal",
+        "MACD_Cross",
+    ]
+    frames = {ticker: read_ticker(ticker, columns=columns) for ticker in tickers}
+    return Panel.from_frames(frames, columns)
+
+
+# Prefix sums of the Summary Statistics columns and min/max tables of Close, so any date range is summarized without touching its rows
+@st.cache_resource
+@metrics.timed("dashboard.load_statistics")
+def load_statistics(tickers, version):
+    return RangeStatistics.from_panel(panel, ["Close", "Volume", "RSI", "ATR"])
+
+
+panel_version = store.current_version() if store is not None else None
+panel = load_panel(tuple(tickers), panel_version)
+statistics = load_statistics(tuple(tickers), panel_version)
+
+
+# Sentiment of every ticker as of every panel date from the decaying SentimentIndex; None when the dated corpus has no Date column
+@st.cache_resource
+@metrics.timed("dashboard.load_sentiment_history")
+def load_sentiment_history(tickers, version):
+    try:
+        if "Date" not in pd.read_csv(dated_corpus_path, nrows=0).columns:
+            return None
+        mentions = SentimentIndex.mentions(
+            load_sentiment_analyzer(), dated_corpus_path, list(tickers)
+        )
+        return SentimentIndex.history(mentions, panel.dates, panel.tickers)
+    except Exception as e:
+        st.warning(f"Sentiment index unavailable: {str(e)}")
+        return None
+
+
+sentiment_history = load_sentiment_history(tuple(tickers), panel_version)
+if sentiment_history is None:
+    st.sidebar.info(
+        "Sentiment: one score per ticker over the whole corpus. The sentiment index as of each date "
+        "needs a dated corpus (Date and Text columns): set STOCK_SENTIMENT_CORPUS=<csv>."
+    )
+else:
+    st.sidebar.caption(f"Sentiment: decaying index of {os.path.basename(dated_corpus_path)}, as of each date")
+
 # Sidebar for stock selection
 st.sidebar.header("Stock Selection")
 selected_ticker = st.sidebar.selectbox("Select Ticker", tickers)
 start_date = st.sidebar.date_input("Start Date", value=datetime(2020, 1, 1))
 end_date = st.sidebar.date_input("End Date", value=datetime.now())
 
+with st.sidebar.expander("Pipeline Metrics"):
+    st.dataframe(metrics.frame().round({"Seconds": 4}), hide_index=True)
+
 # Process selected ticker data
-df = data[selected_ticker].copy()
-df = df[
-    (df["Date"] >= pd.to_datetime(start_date))
-    & (df["Date"] <= pd.to_datetime(end_date))
-]
+df = read_ticker(selected_ticker, start_date, end_date)
 
 if df.empty:
     st.warning("No data available for the selected date range.")
     st.stop()
 
 
-# Recommendation logic
-def get_recommendation(latest_data, sentiment_score, atr_threshold):
-    tech_score = 0
-    reasons = []
-    signal_contributions = {
-        "Composite": 0,
-        "MA": 0,
-        "MACD": 0,
-        "RSI": 0,
-        "Stochastic": 0,
-        "Sentiment": sentiment_score * 0.4,
-    }
-
-    if latest_data["Composite_Signal"] == "Strong Buy":
-        tech_score += 1
-        signal_contributions["Composite"] = 1
-        reasons.append("Strong buy signal from combined indicators")
-    elif latest_data["Composite_Signal"] == "Strong Sell":
-        tech_score -= 1
-        signal_contributions["Composite"] = -1
-        reasons.append("Strong sell signal from combined indicators")
-
-    if latest_data["MA_Signal"] == "Golden Cross":
-        tech_score += 0.5
-        signal_contributions["MA"] = 0.5
-        reasons.append("Golden Cross in moving averages")
-    elif latest_data["MA_Signal"] == "Death Cross":
-        tech_score -= 0.5
-        signal_contributions["MA"] = -0.5
-        reasons.append("Death Cross in moving averages")
-
-    if latest_data["MACD_Cross"] == "Bullish":
-        tech_score += 0.4
-        signal_contributions["MACD"] = 0.4
-        reasons.append("Bullish MACD crossover")
-    elif latest_data["MACD_Cross"] == "Bearish":
-        tech_score -= 0.4
-        signal_contributions["MACD"] = -0.4
-        reasons.append("Bearish MACD crossover")
-
-    if latest_data["RSI"] < 30:
-        tech_score += 0.3
-        signal_contributions["RSI"] = 0.3
-        reasons.append("RSI indicates oversold condition")
-    elif latest_data["RSI"] > 70:
-        tech_score -= 0.3
-        signal_contributions["RSI"] = -0.3
-        reasons.append("RSI indicates overbought condition")
-
-    if (
-        latest_data["Stoch_%K"] > latest_data["Stoch_%D"]
-        and latest_data["Stoch_%K"] < 20
-    ):
-        tech_score += 0.2
-        signal_contributions["Stochastic"] = 0.2
-        reasons.append("Stochastic oscillator suggests buying opportunity")
-    elif (
-        latest_data["Stoch_%K"] < latest_data["Stoch_%D"]
-        and latest_data["Stoch_%K"] > 80
-    ):
-        tech_score -= 0.2
-        signal_contributions["Stochastic"] = -0.2
-        reasons.append("Stochastic oscillator suggests selling pressure")
-
-    final_score = tech_score * 0.6 + sentiment_score * 0.4
-    if latest_data["ATR"] > atr_threshold:
-        reasons.append(
-            f"High volatility (ATR: {latest_data['ATR']:.2f} > {atr_threshold:.2f})"
-        )
-
-    if final_score > 0.8 and latest_data["ATR"] <= atr_threshold:
-        recommendation = "Strong Buy"
-    elif final_score > 0.3:
-        recommendation = "Buy"
-    elif final_score < -0.8 and latest_data["ATR"] <= atr_threshold:
-        recommendation = "Strong Sell"
-    elif final_score < -0.3:
-        recommendation = "Sell"
-    else:
-        recommendation = "Hold"
-
-    return recommendation, reasons, final_score, signal_contributions
-
-
 # Tabs
 tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs(
     [
@@ -246,7 +311,10 @@ tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs(
 with tab1:
     st.subheader(f"{selected_ticker} Stock Price")
     fig_price = px.line(
-        df, x="Date", y="Close", title=f"{selected_ticker} Closing Price"
+        ChartDownsampler.line(df, "Close"),
+        x="Date",
+        y="Close",
+        title=f"{selected_ticker} Closing Price",
     )
     fig_price.update_layout(template="plotly_dark", hovermode="x unified")
     st.plotly_chart(fig_price, use_container_width=True)
@@ -273,8 +341,14 @@ with tab2:
     )
 
     fig_tech = go.Figure()
+    close_line = ChartDownsampler.line(df, "Close")
     fig_tech.add_trace(
-        go.Scatter(x=df["Date"], y=df["Close"], name="Close", line=dict(color="white"))
+        go.Scatter(
+            x=close_line["Date"],
+            y=close_line["Close"],
+            name="Close",
+            line=dict(color="white"),
+        )
     )
     palette = {
         "SMA_50": "yellow",
@@ -295,10 +369,11 @@ with tab2:
     for ind in selected_indicators:
         if ind in df.columns:
             linestyle = "dash" if ind == "BB_Lower" else "solid"
+            ind_line = ChartDownsampler.line(df, ind)
             fig_tech.add_trace(
                 go.Scatter(
-                    x=df["Date"],
-                    y=df[ind],
+                    x=ind_line["Date"],
+                    y=ind_line[ind],
                     name=ind,
                     line=dict(color=palette[ind], dash=linestyle),
                 )
@@ -317,19 +392,24 @@ with tab2:
 
 with tab3:
     st.subheader("Candlestick Chart")
+    bars, resolution = ChartDownsampler.ohlc(df)
+    if resolution != "Daily":
+        st.caption(
+            f"{len(df)} daily bars shown as {len(bars)} {resolution.lower()} bars"
+        )
     fig_candle = go.Figure(
         data=[
             go.Candlestick(
-                x=df["Date"],
-                open=df["Open"],
-                high=df["High"],
-                low=df["Low"],
-                close=df["Close"],
+                x=bars["Date"],
+                open=bars["Open"],
+                high=bars["High"],
+                low=bars["Low"],
+                close=bars["Close"],
                 name="OHLC",
             ),
             go.Bar(
-                x=df["Date"],
-                y=df["Volume"],
+                x=bars["Date"],
+                y=bars["Volume"],
                 name="Volume",
                 marker_color="rgba(128, 128, 128, 0.3)",
                 yaxis="y2",
@@ -352,9 +432,17 @@ with tab4:
     sentiment_score, sentiment_text = sentiment_data.get(
         selected_ticker, (0, "No sentiment data available - Hold")
     )
+    if sentiment_history is not None:
+        row = DateIndex.rows(panel.dates, end=latest_data["Date"]).stop - 1
+        sentiment_score = float(
+            sentiment_history[row, panel.tickers.index(selected_ticker)]
+        )
+        sentiment_text = f"{sentiment_text} (index as of {latest_data['Date']:%Y-%m-%d}: {sentiment_score:.2f})"
     atr_threshold = df["ATR"].quantile(0.75) if "ATR" in df else 1.0
-    recommendation, reasons, final_score, signal_contributions = get_recommendation(
-        latest_data, sentiment_score, atr_threshold
+    recommendation, reasons, final_score, signal_contributions = (
+        RecommendationScorer.get_recommendation(
+            latest_data, sentiment_score, atr_threshold, params=feature_params
+        )
     )
 
     st.write(f"**Recommendation for {selected_ticker}: {recommendation}**")
@@ -437,36 +525,35 @@ with tab5:
     )
     score_threshold = st.slider("Minimum Score", -2.0, 2.0, 0.0)
 
-    all_tickers = []
-    for ticker in tickers:
-        ticker_df = data[ticker].copy()
-        ticker_df = ticker_df[
-            (ticker_df["Date"] >= pd.to_datetime(start_date))
-            & (ticker_df["Date"] <= pd.to_datetime(end_date))
+    all_tickers_df = RecommendationScorer.rank_latest(
+        panel,
+        (
+            sentiment_history
+            if sentiment_history is not None
+            else {ticker: score for ticker, (score, _) in sentiment_data.items()}
+        ),
+        pd.to_datetime(start_date),
+        pd.to_datetime(end_date),
+        params=feature_params,
+    )
+    for ticker in sorted(set(tickers) - set(all_tickers_df["Ticker"])):
+        st.warning(f"No data for {ticker} in the selected date range.")
+    all_tickers_df["Sentiment Analysis"] = [
+        sentiment_data.get(ticker, (0, "No sentiment data available - Hold"))[1]
+        for ticker in all_tickers_df["Ticker"]
+    ]
+    all_tickers_df = all_tickers_df.reindex(
+        columns=[
+            "Ticker",
+            "Close",
+            "RSI",
+            "ATR",
+            "Sentiment",
+            "Sentiment Analysis",
+            "Score",
+            "Recommendation",
         ]
-        if ticker_df.empty:
-            st.warning(f"No data for {ticker} in the selected date range.")
-            continue
-        latest = ticker_df.iloc[-1]
-        atr_thresh = ticker_df["ATR"].quantile(0.75) if "ATR" in ticker_df else 1.0
-        sentiment_score, sentiment_text = sentiment_data.get(
-            ticker, (0, "No sentiment data available - Hold")
-        )
-        rec, _, score, _ = get_recommendation(latest, sentiment_score, atr_thresh)
-        all_tickers.append(
-            {
-                "Ticker": ticker,
-                "Close": latest["Close"],
-                "RSI": latest["RSI"],
-                "ATR": latest["ATR"],
-                "Sentiment": sentiment_score,
-                "Sentiment Analysis": sentiment_text,
-                "Score": score,
-                "Recommendation": rec,
-            }
-        )
-
-    all_tickers_df = pd.DataFrame(all_tickers)
+    )
     all_tickers_df["Close"] = all_tickers_df["Close"].round(2)
     all_tickers_df["RSI"] = all_tickers_df["RSI"].round(2)
     all_tickers_df["ATR"] = all_tickers_df["ATR"].round(2)
@@ -505,30 +592,23 @@ with tab5:
 
 with tab6:
     st.subheader("Summary Statistics")
-    stats = []
-    for ticker in tickers:
-        ticker_df = data[ticker].copy()
-        ticker_df = ticker_df[
-            (ticker_df["Date"] >= pd.to_datetime(start_date))
-            & (ticker_df["Date"] <= pd.to_datetime(end_date))
-        ]
-        if ticker_df.empty:
-            st.warning(f"No data for {ticker} in the selected date range.")
-            continue
-        stats.append(
-            {
-                "Ticker": ticker,
-                "Mean Close": ticker_df["Close"].mean(),
-                "Std Close": ticker_df["Close"].std(),
-                "Min Close": ticker_df["Close"].min(),
-                "Max Close": ticker_df["Close"].max(),
-                "Mean Volume": ticker_df["Volume"].mean(),
-                "Mean RSI": ticker_df["RSI"].mean() if "RSI" in ticker_df else None,
-                "Mean ATR": ticker_df["ATR"].mean() if "ATR" in ticker_df else None,
-            }
-        )
+    summary = statistics.summary(start_date, end_date)
+    for ticker in summary.loc[summary["Rows"] == 0, "Ticker"]:
+        st.warning(f"No data for {ticker} in the selected date range.")
 
-    stats_df = pd.DataFrame(stats)
+    stats_df = summary.loc[
+        summary["Rows"] > 0,
+        [
+            "Ticker",
+            "Mean Close",
+            "Std Close",
+            "Min Close",
+            "Max Close",
+            "Mean Volume",
+            "Mean RSI",
+            "Mean ATR",
+        ],
+    ].reset_index(drop=True)
     stats_df = stats_df.round(2)
     st.dataframe(stats_df, use_container_width=True)
 
@@ -0,0 +1,159 @@
+import os
+import json
+import shutil
+import hashlib
+import numpy as np
+import pandas as pd
+
+
+class ColumnarCache:
+    """
+    ColumnarCache class stores cleaned stock DataFrames on disk as one NumPy .npy file per column, so later loads can skip CSV parsing and cleaning.
+    Class Methods:
+    1. __init__(cache_dir): Creates the cache directory (if needed) that holds one entry folder per source file.
+    2. load(source_path, mmap_mode=None): Returns the cached DataFrame for a source file, or None when there is no entry or the source file changed since it was cached.
+    3. store(source_path, df): Writes a DataFrame to the cache, keyed on the source file path, size and modification time.
+    4. invalidate(source_path): Removes the cache entry of a single source file.
+    5. clear(): Removes every cache entry.
+    6. write_frame(directory, df, metadata=None): Static helper that writes a DataFrame as .npy columns plus a manifest.json (Categorical columns as their integer codes, string columns as fixed-width unicode arrays).
+    7. read_frame(directory, mmap_mode=None, columns=None): Static helper that reads a DataFrame written by write_frame, returning (df, manifest).
+
+    Each entry folder contains a manifest.json describing the source fingerprint (path, size, mtime) and the column layout, so a stale entry is detected without opening the CSV.
+    No column is ever pickled: every .npy file is loaded with allow_pickle=False, so a cache folder cannot run code when it is read.
+    """
+
+    VERSION = 2
+    MANIFEST = "manifest.json"
+
+    def __init__(self, cache_dir):
+        self.cache_dir = os.path.abspath(cache_dir)
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def _fingerprint(source_path):
+        """Helper method returning the path/size/mtime key of a source file"""
+        stat = os.stat(source_path)
+        return {
+            "path": os.path.abspath(source_path),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+        }
+
+    def _entry_dir(self, source_path):
+        """Helper method mapping a source file to its entry folder"""
+        abs_path = os.path.abspath(source_path)
+        digest = hashlib.sha1(abs_path.encode("utf-8")).hexdigest()[:16]
+        name = os.path.splitext(os.path.basename(abs_path))[0]
+        return os.path.join(self.cache_dir, f"{name}_{digest}")
+
+    def load(self, source_path, mmap_mode=None):
+        """
+        Return the cached DataFrame of source_path, or None on a cache miss.
+        An entry is only used if it was written by the same cache version and the source file still has the same path, size and mtime.
+        """
+        entry_dir = self._entry_dir(source_path)
+        if not os.path.exists(os.path.join(entry_dir, self.MANIFEST)):
+            return None
+        try:
+            df, manifest = self.read_frame(entry_dir, mmap_mode=mmap_mode)
+        except (OSError, ValueError, KeyError):
+            # A corrupt or half-written entry is treated as a miss
+            return None
+
+        if manifest.get("version") != self.VERSION or manifest.get(
+            "source"
+        ) != self._fingerprint(source_path):
+            return None
+        return df
+
+    def store(self, source_path, df):
+        """Write df to the cache entry of source_path"""
+        metadata = {"version": self.VERSION, "source": self._fingerprint(source_path)}
+        self.write_frame(self._entry_dir(source_path), df, metadata)
+
+    def invalidate(self, source_path):
+        """Remove the cache entry of source_path (if any)"""
+        shutil.rmtree(self._entry_dir(source_path), ignore_errors=True)
+
+    def clear(self):
+        """Remove every cache entry"""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @classmethod
+    def write_frame(cls, directory, df, metadata=None):
+        """
+        Write df into directory as one .npy file per column plus a manifest.json.
+        The entry is first written to a temporary folder and then renamed, so readers never see a partially written entry.
+        """
+        tmp_dir = f"{directory}.tmp{os.getpid()}"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+
+        columns = []
+        for i, col in enumerate(df.columns):
+            file_name = f"col_{i}.npy"
+            if isinstance(df[col].dtype, pd.CategoricalDtype):
+                # Categoricals are stored as their integer codes; the labels go into the manifest
+                categorical = df[col].cat
+                np.save(os.path.join(tmp_dir, file_name), categorical.codes.to_numpy())
+                columns.append(
+                    {
+                        "name": col,
+                        "file": file_name,
+                        "dtype": "category",
+                        "categories": categorical.categories.tolist(),
+                        "ordered": bool(categorical.ordered),
+                    }
+                )
+                continue
+
+            values = df[col].to_numpy()
+            columns.append({"name": col, "file": file_name, "dtype": str(values.dtype)})
+            if values.dtype == object:
+                # Strings are stored as a fixed-width unicode array, so loading needs no pickle
+                if not all(isinstance(value, str) for value in values):
+                    shutil.rmtree(tmp_dir, ignore_errors=True)
+                    raise TypeError(
+                        f"Column {col} holds non string objects and cannot be stored without pickle"
+                    )
+                values = values.astype(str)
+            np.save(os.path.join(tmp_dir, file_name), values, allow_pickle=False)
+
+        manifest = dict(metadata or {})
+        manifest["rows"] = len(df)
+        manifest["columns"] = columns
+        with open(os.path.join(tmp_dir, cls.MANIFEST), "w") as f:
+            json.dump(manifest, f)
+
+        shutil.rmtree(directory, ignore_errors=True)
+        os.replace(tmp_dir, directory)
+
+    @classmethod
+    def read_frame(cls, directory, mmap_mode=None, columns=None):
+        """
+        Read a DataFrame written by write_frame (only the given columns, in that order, if columns is not None).
+        With mmap_mode="r" numeric columns are memory-mapped instead of read into memory.
+        Categorical columns are rebuilt from their stored codes and the labels listed in the manifest.
+        """
+        with open(os.path.join(directory, cls.MANIFEST)) as f:
+            manifest = json.load(f)
+
+        layout = manifest["columns"]
+        if columns is not None:
+            by_name = {column["name"]: column for column in layout}
+            layout = [by_name[name] for name in columns]
+
+        data = {}
+        for column in layout:
+            path = os.path.join(directory, column["file"])
+            if column["dtype"] == "object":
+                data[column["name"]] = np.load(path).astype(object)
+            elif column["dtype"] == "category":
+                data[column["name"]] = pd.Categorical.from_codes(
+                    np.load(path, mmap_mode=mmap_mode),
+                    dtype=pd.CategoricalDtype(column["categories"], column["ordered"]),
+                )
+            else:
+                data[column["name"]] = np.load(path, mmap_mode=mmap_mode)
+        return pd.DataFrame(data, copy=False), manifest
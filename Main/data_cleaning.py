@@ -1,4 +1,7 @@
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 import pandas as pd
+from instrumentation import metrics
 
 
 class StockDataCleaner:
@@ -7,17 +10,48 @@ class StockDataCleaner:
     Class Methods:
     1. clean_data(df, sort_descending=True):
         - cleans and standardizes a single stock data DataFrame by renaming columns, cleaning numeric columns, and converting/sorting dates.
+        - Frames in the Nasdaq export layout go through the fast parser below; anything else (or a Nasdaq frame the fast parser rejects) uses the generic regex/to_datetime path.
         - Returns the cleaned DataFrame.
-    2. clean_all(data_collector, sort_descending=True):
+    2. clean_all(data_collector, sort_descending=True, max_workers=None):
         - Cleans all stock data from a StockDataCollector instance by applying clean_data to each ticker's DataFrame.
+        - If max_workers is given, the tickers are cleaned in parallel on a process pool with that many workers.
+        - Each ticker is recorded as a "clean" stage of the shared PipelineMetrics (instrumentation.py); a parallel run as one "clean" stage without ticker.
         - Returns a dictionary of cleaned DataFrames, keyed by ticker symbol.
+    3. is_nasdaq_layout(df):
+        - Checks whether a raw DataFrame has the Nasdaq historical data export columns (Date, Close/Last, Volume, Open, High, Low); some exports name the close column Close.
+    4. parse_nasdaq_prices(series) / parse_nasdaq_dates(series):
+        - Fast parsers for "$123.45" prices and fixed width "MM/DD/YYYY" dates. Both raise ValueError on values that do not follow the layout.
     """
 
+    NASDAQ_COLUMNS = ["Date", "Close/Last", "Volume", "Open", "High", "Low"]
+    NASDAQ_CLOSE_COLUMNS = ["Date", "Close", "Volume", "Open", "High", "Low"]
+
     @staticmethod
     def clean_data(df, sort_descending=True):
         """
         Clean and standardize stock data DataFrame
         """
+        cleaned = None
+        if StockDataCleaner.is_nasdaq_layout(df):
+            try:
+                cleaned = StockDataCleaner._clean_nasdaq(df)
+            except ValueError:
+                # Not quite the export layout (e.g. thousands separators) -> generic path
+                cleaned = None
+        df = cleaned if cleaned is not None else StockDataCleaner._clean_generic(df)
+
+        # Sort dates
+        if "Date" in df.columns:
+            df.sort_values("Date", ascending=not sort_descending, inplace=True)
+            df.reset_index(drop=True, inplace=True)
+
+        return df
+
+    @staticmethod
+    def _clean_generic(df):
+        """
+        Generic cleaning path for unknown layouts: strips every non numeric character from the price columns and lets pandas infer the date format
+        """
         df = df.copy()
 
         # 1. Rename columns
@@ -29,20 +63,113 @@ class StockDataCleaner:
             if col in df.columns and df[col].dtype == object:
                 df[col] = df[col].str.replace(r"[^\d.]", "", regex=True).astype(float)
 
-        # 3. Convert and sort dates
+        # 3. Convert dates
         if "Date" in df.columns:
             df["Date"] = pd.to_datetime(df["Date"])
-            df.sort_values("Date", ascending=not sort_descending, inplace=True)
-            df.reset_index(drop=True, inplace=True)
 
         return df
 
     @staticmethod
-    def clean_all(data_collector, sort_descending=True):
+    def _clean_nasdaq(df):
+        """
+        Fast cleaning path for the Nasdaq export layout: fixed "$" prefix strip, fixed width date parsing and an integer Volume column
+        """
+        df = df.rename(columns={"Close/Last": "Close"})
+
+        # 1. Clean numeric columns
+        for col in ["Close", "Open", "High", "Low"]:
+            if df[col].dtype == object:
+                df[col] = StockDataCleaner.parse_nasdaq_prices(df[col])
+
+        # 2. Volume is a plain integer in the export; keep it int64 when a float column holds only whole numbers
+        volume = df["Volume"]
+        if volume.dtype == object:
+            volume = pd.to_numeric(volume.str.replace(",", "", regex=False))
+        if volume.dtype.kind == "f" and volume.notna().all():
+            if (volume % 1 == 0).all():
+                volume = volume.astype(np.int64)
+        df["Volume"] = volume
+
+        # 3. Convert dates
+        if df["Date"].dtype == object:
+            df["Date"] = StockDataCleaner.parse_nasdaq_dates(df["Date"])
+
+        return df
+
+    @classmethod
+    def is_nasdaq_layout(cls, df):
+        """Check for the Nasdaq historical data export columns"""
+        columns = list(df.columns)
+        return columns == cls.NASDAQ_COLUMNS or columns == cls.NASDAQ_CLOSE_COLUMNS
+
+    @staticmethod
+    def parse_nasdaq_prices(series):
+        """
+        Parse "$123.45" prices by blanking the fixed "$" prefix byte and converting the bytes to float64 in one NumPy call, instead of running a regex over every character.
+        Raises ValueError if a value does not start with "$" or is not a plain decimal number afterwards.
+        """
+        # The last byte stays NUL for every value that fits, so longer values are detected instead of truncated
+        raw = series.to_numpy(dtype="S24")
+        chars = raw.view(np.uint8).reshape(len(raw), 24)
+        if (chars[:, 0] != ord("$")).any() or (chars[:, -1] != 0).any():
+            raise ValueError("Price values are not in $123.45 format")
+        chars[:, 0] = ord(" ")
+        return pd.Series(raw.astype(np.float64), index=series.index, name=series.name)
+
+    @staticmethod
+    def parse_nasdaq_dates(series):
+        """
+        Parse fixed width "MM/DD/YYYY" dates straight from their bytes.
+        The digits are read as a (rows, 10) uint8 array and combined into year/month/day with array arithmetic, which avoids pd.to_datetime's per-string format handling.
+        Raises ValueError if a value is not exactly ten characters of that form or is not a valid calendar date.
+        """
+        # One extra byte to catch values longer than 10 characters (NUL padded otherwise)
+        raw = series.to_numpy(dtype="S11")
+        digits = raw.view(np.uint8).reshape(-1, 11).astype(np.int64) - ord("0")
+
+        slash = ord("/") - ord("0")
+        numeric = digits[:, [0, 1, 3, 4, 6, 7, 8, 9]]
+        if (
+            (digits[:, 2] != slash).any()
+            or (digits[:, 5] != slash).any()
+            or (digits[:, 10] != -ord("0")).any()
+            or (numeric < 0).any()
+            or (numeric > 9).any()
+        ):
+            raise ValueError("Dates are not in MM/DD/YYYY format")
+
+        month = digits[:, 0] * 10 + digits[:, 1]
+        day = digits[:, 3] * 10 + digits[:, 4]
+        year = digits[:, 6] * 1000 + digits[:, 7] * 100 + digits[:, 8] * 10 + digits[:, 9]
+        if ((month < 1) | (month > 12) | (day < 1)).any():
+            raise ValueError("Dates are not in MM/DD/YYYY format")
+
+        months = ((year - 1970) * 12 + month - 1).astype("datetime64[M]")
+        dates = months.astype("datetime64[D]") + (day - 1)
+        # Day 31 of a 30 day month would silently roll over into the next month
+        if (dates.astype("datetime64[M]") != months).any():
+            raise ValueError("Dates are not valid calendar dates")
+
+        return pd.Series(dates.astype("datetime64[ns]"), index=series.index, name=series.name)
+
+    @staticmethod
+    def clean_all(data_collector, sort_descending=True, max_workers=None):
         """
         Clean all data from a StockDataCollector instance
         """
+        if max_workers:
+            stock_data = data_collector.get_stock_data()
+            tickers = list(stock_data)
+            with metrics.stage("clean") as record, ProcessPoolExecutor(max_workers=max_workers) as executor:
+                cleaned = executor.map(
+                    StockDataCleaner.clean_data,
+                    [stock_data[ticker] for ticker in tickers],
+                    [sort_descending] * len(tickers),
+                )
+                return record.output(dict(zip(tickers, cleaned)))
+
         cleaned_data = {}
         for ticker, df in data_collector.get_stock_data().items():
-            cleaned_data[ticker] = StockDataCleaner.clean_data(df, sort_descending)
+            with metrics.stage("clean", ticker) as record:
+                cleaned_data[ticker] = record.output(StockDataCleaner.clean_data(df, sort_descending))
         return cleaned_data
@@ -1,22 +1,43 @@
 import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 import pandas as pd
+from data_cache import ColumnarCache
+from data_cleaning import StockDataCleaner
+from instrumentation import metrics
 
 
 class StockDataCollector:
     """
     StockDataCollector class is created to collect and manage historical stock data from CSV files.
     Class Methods:
-    1. __init__(historical_data_path=None): Initializes the class by setting the base directory and historical data path. If a custom path is provided, it overrides the default path.
-    2. collect_data(): Loads all CSV files from the historical data folder, extracts the ticker symbol from each file, and stores the data in two dictionaries: all_csv_data and stock_data.
+    1. __init__(historical_data_path=None, use_cache=False, cache_dir=None, lazy=False, memory_budget=None): Initializes the class by setting the base directory and historical data path. If a custom path is provided, it overrides the default path. If use_cache is True, cleaned frames are kept in a ColumnarCache under cache_dir (default: Datasets/.cache). If lazy is True, files are only indexed and parsed on demand, keeping at most memory_budget bytes of loaded tickers.
+    2. collect_data(): Loads all CSV files from the historical data folder, extracts the ticker symbol from each file, and stores the data in two dictionaries: all_csv_data and stock_data. With caching enabled (opt-in), stock_data holds cleaned frames (newest bar first, like clean_data) served from the cache whenever the source file is unchanged, and the raw HistoricalData_ frames are no longer kept in all_csv_data. In lazy mode it only builds the filename and ticker index.
     3. extract_ticker(filename): A helper method that extracts the ticker symbol from a filename.
-    4. get_raw_data(filename=None): Returns the raw data for a specific filename or all filenames if no filename is provided.
-    5. get_stock_data(ticker=None): Returns the processed data for a specific ticker symbol or all ticker symbols if no ticker is provided.
+    4. get_raw_data(filename=None): Returns the raw data for a specific filename or all filenames if no filename is provided. Files not kept in all_csv_data (lazy mode, or HistoricalData_ files with caching enabled) are read from their CSV on demand, so raw data is always the unmodified CSV.
+    5. get_stock_data(ticker=None): Returns the processed data for a specific ticker symbol or all ticker symbols if no ticker is provided. In lazy mode a ticker is loaded the first time it is requested.
+    6. get_tickers(): Returns the sorted list of tickers found in the historical data folder.
+    7. collect_parallel(max_workers=None, use_processes=True, sort_descending=True): Reads and cleans every HistoricalData_ file on a concurrent.futures pool and returns a dictionary of cleaned DataFrames keyed by ticker. Files that fail are recorded in errors instead of aborting the batch. The folder is indexed like collect_data, so get_tickers and get_raw_data (raw CSVs, read on demand) work after a parallel collect.
 
-    The _extract_ticker method is a created as a private method to be used internally by the class.
+    Every HistoricalData_ file load is recorded as a "collect" stage of the shared PipelineMetrics (instrumentation.py), and a collect_parallel call as one "collect_parallel" stage.
+
+    The _extract_ticker, _load_file and _load_lazy methods are created as private methods to be used internally by the class.
+
+    In lazy mode stock_data is a least-recently-used cache: when the loaded frames exceed memory_budget, the least recently requested tickers are evicted (the most recent one is always kept).
     """
 
     # historical_data_path => Dataset containing historical data for different tickers
-    def __init__(self, historical_data_path=None):
+    # use_cache => Store cleaned frames in a columnar on-disk cache keyed on file path, size and mtime
+    # lazy => Only index files in collect_data and load tickers on first access
+    # memory_budget => Maximum bytes of loaded tickers kept in lazy mode (None for unbounded)
+    def __init__(
+        self,
+        historical_data_path=None,
+        use_cache=False,
+        cache_dir=None,
+        lazy=False,
+        memory_budget=None,
+    ):
         try:
             self.base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         except NameError:
@@ -29,8 +50,25 @@ class StockDataCollector:
         if historical_data_path:
             self.historical_data_path = historical_data_path
 
+        self.cache = None
+        if use_cache:
+            if cache_dir is None:
+                cache_dir = os.path.join(self.base_dir, "Datasets", ".cache")
+            self.cache = ColumnarCache(cache_dir)
+
+        self.lazy = lazy
+        self.memory_budget = memory_budget
+
         self.all_csv_data = {}
-        self.stock_data = {}
+        self.stock_data = OrderedDict() if lazy else {}
+
+        # Index of the collected folder: filename -> path and (lazy mode) ticker -> filename
+        self.file_index = {}
+        self.ticker_index = {}
+        self._loaded_bytes = {}
+
+        # Per-file failures of collect_parallel: filename -> error message
+        self.errors = {}
 
     def collect_data(self):
         """
@@ -40,6 +78,9 @@ class StockDataCollector:
         2. Iterates through all files in the directory, loading CSV files into all_csv_data.
         3. If a CSV file starts with "HistoricalData_", it extracts the ticker symbol and stores the data in stock_data.
         4. Prints the number of successfully loaded tickers or an error message if an exception occurs.
+
+        When caching is enabled, HistoricalData_ files are loaded through _load_file, so their stock_data entries hold cleaned frames (newest bar first) and all_csv_data only holds the other files; get_raw_data still returns the raw CSV of any file.
+        In lazy mode no file is parsed here; only file_index and ticker_index are filled.
         """
         try:
             # Convert to absolute path and normalize
@@ -52,30 +93,184 @@ class StockDataCollector:
             for filename in os.listdir(abs_path):
                 if filename.endswith(".csv"):
                     file_path = os.path.join(abs_path, filename)
-                    self.all_csv_data[filename] = pd.read_csv(file_path)
-
-                    if filename.startswith("HistoricalData_"):
+                    self.file_index[filename] = file_path
+                    if self.lazy:
+                        if filename.startswith("HistoricalData_"):
+                            ticker = self._extract_ticker(filename)
+                            self.ticker_index[ticker] = filename
+                    elif filename.startswith("HistoricalData_"):
                         ticker = self._extract_ticker(filename)
-                        self.stock_data[ticker] = self.all_csv_data[filename]
+                        with metrics.stage("collect", ticker) as record:
+                            self.stock_data[ticker] = record.output(self._load_file(file_path))
+                        if self.cache is None:
+                            self.all_csv_data[filename] = self.stock_data[ticker]
+                    else:
+                        self.all_csv_data[filename] = pd.read_csv(file_path)
 
-            print(f"Successfully loaded {len(self.stock_data)} tickers")
+            if self.lazy:
+                print(f"Successfully indexed {len(self.ticker_index)} tickers")
+            else:
+                print(f"Successfully loaded {len(self.stock_data)} tickers")
 
         except Exception as e:
             print(f"Error loading data: {str(e)}")
             raise
 
+    def _load_file(self, file_path):
+        """
+        Helper method to load a single historical data file.
+        Without a cache this is a plain pd.read_csv. With a cache it returns the cleaned frame, newest bar first (see _read_and_clean).
+        """
+        if self.cache is None:
+            return pd.read_csv(file_path)
+        return _read_and_clean(file_path, self.cache.cache_dir)
+
+    def collect_parallel(self, max_workers=None, use_processes=True, sort_descending=True):
+        """
+        This function reads and cleans all HistoricalData_ files in parallel and returns the same {ticker: DataFrame} dictionary that clean_all would return.
+        Specifically, it:
+        1. Checks if the specified directory exists, raising a FileNotFoundError if it doesn't.
+        2. Submits one read+clean task per file to a ProcessPoolExecutor (or ThreadPoolExecutor if use_processes is False) with max_workers workers.
+        3. Stores the cleaned frames in stock_data (not in lazy mode, whose LRU keeps the frames of _load_file) and the failed files with their error message in errors.
+        4. Indexes every CSV file except the failed ones in file_index (and ticker_index) like collect_data; outside lazy mode the non-ticker CSV files are loaded into all_csv_data.
+        5. Prints the number of loaded tickers and failed files.
+
+        When caching is enabled, the workers read from and write to the same ColumnarCache.
+        """
+        abs_path = os.path.abspath(self.historical_data_path)
+        print(f"Looking for data in: {abs_path}")
+
+        if not os.path.exists(abs_path):
+            raise FileNotFoundError(f"Directory not found: {abs_path}")
+
+        cache_dir = self.cache.cache_dir if self.cache is not None else None
+        filenames = []
+        for filename in sorted(os.listdir(abs_path)):
+            if not filename.endswith(".csv"):
+                continue
+            self.file_index[filename] = os.path.join(abs_path, filename)
+            if filename.startswith("HistoricalData_"):
+                filenames.append(filename)
+                self.ticker_index[self._extract_ticker(filename)] = filename
+            elif not self.lazy:
+                self.all_csv_data[filename] = pd.read_csv(self.file_index[filename])
+
+        executor_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        results = {}
+        self.errors = {}
+        # The workers' time is recorded as one stage of this process
+        with metrics.stage("collect_parallel") as record, executor_class(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(
+                    _read_and_clean,
+                    os.path.join(abs_path, filename),
+                    cache_dir,
+                    sort_descending,
+                ): filename
+                for filename in filenames
+            }
+            for future in as_completed(futures):
+                filename = futures[future]
+                try:
+                    results[self._extract_ticker(filename)] = future.result()
+                except Exception as e:
+                    self.errors[filename] = str(e)
+                    # A failed file is left out of the index, like a file collect_data cannot read
+                    del self.file_index[filename]
+                    del self.ticker_index[self._extract_ticker(filename)]
+            record.output(results)
+
+        # Keep the ticker order stable regardless of completion order
+        cleaned_data = {ticker: results[ticker] for ticker in sorted(results)}
+        if not self.lazy:
+            self.stock_data = cleaned_data
+        print(
+            f"Successfully loaded {len(cleaned_data)} tickers ({len(self.errors)} failed)"
+        )
+        return cleaned_data
+
+    def _load_lazy(self, ticker):
+        """
+        Helper method to return a ticker in lazy mode, loading it on first access.
+        A hit moves the ticker to the most recently used end; a load may evict the least recently used tickers to stay within memory_budget.
+        """
+        if ticker in self.stock_data:
+            self.stock_data.move_to_end(ticker)
+            return self.stock_data[ticker]
+
+        filename = self.ticker_index.get(ticker)
+        if filename is None:
+            return None
+
+        with metrics.stage("collect", ticker) as record:
+            df = record.output(self._load_file(self.file_index[filename]))
+        self.stock_data[ticker] = df
+        self._loaded_bytes[ticker] = int(df.memory_usage(deep=True).sum())
+
+        if self.memory_budget is not None:
+            while (
+                len(self.stock_data) > 1
+                and sum(self._loaded_bytes.values()) > self.memory_budget
+            ):
+                evicted, _ = self.stock_data.popitem(last=False)
+                del self._loaded_bytes[evicted]
+        return df
+
     def _extract_ticker(self, filename):
         """Helper method to extract ticker from filename"""
         return filename.split("_")[1].split(".")[0]
 
     def get_raw_data(self, filename=None):
-        """Access raw data by filename"""
+        """
+        Access raw data by filename
+        Files not kept in all_csv_data are read from their CSV on demand without being kept; in lazy mode without a cache, ticker files are served through the LRU (their frames are the raw ones).
+        """
         if filename:
-            return self.all_csv_data.get(filename)
-        return self.all_csv_data
+            if filename in self.all_csv_data:
+                return self.all_csv_data[filename]
+            if filename not in self.file_index:
+                return None
+            if self.lazy and self.cache is None and filename.startswith("HistoricalData_"):
+                return self._load_lazy(self._extract_ticker(filename))
+            return pd.read_csv(self.file_index[filename])
+
+        if self.all_csv_data.keys() >= self.file_index.keys():
+            return self.all_csv_data
+        return {name: self.get_raw_data(name) for name in self.file_index}
 
     def get_stock_data(self, ticker=None):
-        """Access processed data by ticker"""
+        """
+        Access processed data by ticker
+        In lazy mode, asking for all tickers loads every file and returns a new dict; only the most recent ones stay in the LRU.
+        """
+        if self.lazy:
+            if ticker:
+                return self._load_lazy(ticker)
+            return {t: self._load_lazy(t) for t in self.get_tickers()}
+
         if ticker:
             return self.stock_data.get(ticker)
         return self.stock_data
+
+    def get_tickers(self):
+        """Sorted list of available tickers"""
+        if self.lazy:
+            return sorted(self.ticker_index)
+        return sorted(self.stock_data)
+
+
+def _read_and_clean(file_path, cache_dir=None, sort_descending=True):
+    """
+    Read and clean a single historical data file.
+    With cache_dir the cleaned frame is cached in one canonical order (oldest bar first) and clean_data(df, sort_descending) is applied again on every read, so the result does not depend on which caller wrote the entry.
+    This is a module level function so it can be pickled and sent to the worker processes of collect_parallel.
+    """
+    if not cache_dir:
+        return StockDataCleaner.clean_data(pd.read_csv(file_path), sort_descending)
+
+    cache = ColumnarCache(cache_dir)
+    df = cache.load(file_path)
+    if df is None:
+        df = StockDataCleaner.clean_data(pd.read_csv(file_path), sort_descending=False)
+        cache.store(file_path, df)
+    return StockDataCleaner.clean_data(df, sort_descending)
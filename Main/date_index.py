@@ -0,0 +1,61 @@
+import pandas as pd
+
+
+class DateIndex:
+    """
+    DateIndex class holds the date range lookups shared by the dashboard, the feature store and the recommendation scorer.
+    Class Methods:
+    1. set_index(df): Returns a copy of df indexed by a sorted DatetimeIndex built from its Date column (the Date column is kept); df itself is left unchanged. The rows are only re-sorted when they are not in date order yet.
+    2. rows(dates, start=None, end=None): Returns the slice of positions whose date lies between start and end (inclusive, None for unbounded), found by binary search on an array of dates sorted oldest or newest first.
+    3. slice(df, start=None, end=None): Returns the rows of df between start and end as a positional slice, i.e. a view of df rather than a filtered copy.
+
+    A date range lookup costs O(log N) per ticker instead of building an N element boolean mask (and a copy of the frame) for every filter.
+    """
+
+    @staticmethod
+    def set_index(df):
+        """
+        Index a copy of df by its Date column, sorted oldest first
+        """
+        if df["Date"].is_monotonic_increasing:
+            df = df.copy()
+        else:
+            df = df.sort_values("Date", kind="stable")
+        # The index is unnamed so "Date" stays unambiguous as a column label
+        df.index = pd.DatetimeIndex(df["Date"]).rename(None)
+        return df
+
+    @staticmethod
+    def _timestamp(value):
+        """Helper converting a date, string or Timestamp into a datetime64 value"""
+        return pd.Timestamp(value).to_datetime64()
+
+    @classmethod
+    def rows(cls, dates, start=None, end=None):
+        """
+        Positions of the dates between start and end (inclusive) in a sorted DatetimeIndex or datetime64 array.
+        Dates sorted newest first (e.g. clean_data's default order) are searched in reverse; the matching rows are still one contiguous slice.
+        """
+        if isinstance(dates, pd.Index):
+            dates = dates.to_numpy()
+        n = len(dates)
+        descending = n > 1 and dates[0] > dates[-1]
+        if descending:
+            dates = dates[::-1]
+        first = 0 if start is None else int(dates.searchsorted(cls._timestamp(start), "left"))
+        last = n if end is None else int(dates.searchsorted(cls._timestamp(end), "right"))
+        if descending:
+            first, last = n - last, n - first
+        return slice(first, last)
+
+    @classmethod
+    def slice(cls, df, start=None, end=None):
+        """
+        Rows of df between start and end (inclusive), as a view.
+        Uses the DatetimeIndex of df when it has one (see set_index), otherwise its Date column sorted oldest or newest first.
+        """
+        if isinstance(df.index, pd.DatetimeIndex):
+            dates = df.index
+        else:
+            dates = df["Date"].to_numpy()
+        return df.iloc[cls.rows(dates, start, end)]
@@ -1,72 +1,190 @@
 import numpy as np
+import pandas as pd
+from instrumentation import metrics
 
 
 class FeatureEngineer:
     """
     FeatureEngineer class:
     Class Methods:
-    1. generate_signals(df): Generates trading signals based on technical indicators (MA, MACD, RSI, Stochastic, Bollinger Bands) and adds them as new columns to the input dataframe df.
+    1. generate_signals(df, params=None): Generates trading signals based on technical indicators (MA, MACD, RSI, Stochastic, Bollinger Bands) and adds them as new columns to the input dataframe df.
     2. composite_signal(df): Creates a composite signal based on the RSI, Stochastic, and Bollinger Band signals, categorizing the signal as "Strong Buy", "Strong Sell", or "Neutral".
-    3. risk_management(df): Calculates stop-loss levels for long and short positions based on the Average True Range (ATR) and adds them as new columns to the input dataframe df.
-    4. create_all_features(cls, df): A class method that calls the above three methods in sequence to generate all features (signals and risk management) for the input dataframe df.
+    3. risk_management(df, params=None): Calculates stop-loss levels for long and short positions based on the Average True Range (ATR) and adds them as new columns to the input dataframe df.
+    4. create_all_features(cls, df, params=None): A class method that calls the above three methods in sequence to generate all features (signals and risk management) for the input dataframe df.
+    5. bar_features(bar, params=None): Applies the same rules as create_all_features to a single bar (a dictionary of Close and indicator values) and returns the feature values, for the streaming engine.
+    6. signal_codes(values): Returns the int8 codes of a signal column (Categorical or string labels, or a code array).
+    7. decode_signals(codes): Turns int8 codes back into a pandas Categorical of labels.
+    8. parameters(params=None): Returns DEFAULT_PARAMS (RSI 30/70, Stochastic 20/80 and the 2 x ATR stop) updated with params.
+    9. signal_rules(values, params=None) / composite_rule(rsi, stoch, bb): The signal rules as int8 codes, shared by the column (generate_signals, composite_signal), panel and bar (bar_features) versions.
+
+    Signal columns are stored as pandas Categoricals over one shared, fixed set of labels (SIGNAL_LABELS), i.e. one int8 code per cell instead of a Python string.
+    They still compare equal to their labels (df["MA_Signal"] == "Golden Cross"), and composite_signal works on the integer codes.
+    When df is not a DataFrame (e.g. a Panel of 2-D arrays) the raw int8 code arrays are stored instead.
     """
 
+    SIGNAL_LABELS = [
+        "Neutral",
+        "Golden Cross",
+        "Death Cross",
+        "Bullish",
+        "Bearish",
+        "Oversold",
+        "Overbought",
+        "Lower Band",
+        "Upper Band",
+        "Within Bands",
+        "Strong Buy",
+        "Strong Sell",
+    ]
+    SIGNAL_DTYPE = pd.CategoricalDtype(SIGNAL_LABELS)
+    SIGNAL_COLUMNS = [
+        "MA_Signal",
+        "MACD_Cross",
+        "RSI_Signal",
+        "Stoch_Signal",
+        "BB_Signal",
+        "Composite_Signal",
+    ]
+    CODES = {label: np.int8(code) for code, label in enumerate(SIGNAL_LABELS)}
+    DEFAULT_PARAMS = {
+        "rsi_oversold": 30,
+        "rsi_overbought": 70,
+        "stoch_oversold": 20,
+        "stoch_overbought": 80,
+        "stop_atr": 2,
+    }
+
+    @classmethod
+    def parameters(cls, params=None):
+        """Return DEFAULT_PARAMS updated with params"""
+        merged = dict(cls.DEFAULT_PARAMS)
+        if params:
+            merged.update(params)
+        return merged
+
+    @classmethod
+    def signal_codes(cls, values):
+        """
+        Return the int8 codes of a signal column.
+        Series and Categoricals of labels (also strings from older code or a CSV file, or Categoricals with other categories) are recoded against SIGNAL_DTYPE, unknown labels giving -1; arrays of codes are returned as they are.
+        """
+        if isinstance(values, pd.Series):
+            values = values.array
+        # Unordered CategoricalDtypes compare equal whatever the order of their categories, so the categories are compared instead
+        if isinstance(values, pd.Categorical) and values.categories.equals(
+            cls.SIGNAL_DTYPE.categories
+        ):
+            return values.codes
+        values = np.asarray(values)
+        if values.dtype.kind in "OUS":
+            return pd.Categorical(values, dtype=cls.SIGNAL_DTYPE).codes.astype(np.int8)
+        return values
+
+    @classmethod
+    def decode_signals(cls, codes):
+        """Turn int8 signal codes into a pandas Categorical of labels"""
+        return pd.Categorical.from_codes(codes, dtype=cls.SIGNAL_DTYPE)
+
+    @classmethod
+    def _store_signal(cls, df, column, codes):
+        """Helper storing a signal column as a Categorical (DataFrame) or as raw codes (anything else)"""
+        if isinstance(df, pd.DataFrame):
+            df[column] = cls.decode_signals(codes)
+        else:
+            df[column] = codes
+
+    @staticmethod
+    def _select(conditions, choices, default):
+        """Helper applying np.select to arrays and Series, or picking the first true condition of a single bar (much cheaper than np.select on scalars)"""
+        if isinstance(conditions[0], (bool, np.bool_)):
+            for condition, choice in zip(conditions, choices):
+                if condition:
+                    return choice
+            return default
+        return np.select(conditions, choices, default=default)
+
+    @staticmethod
+    def signal_rules(values, params=None):
+        """
+        The trading signal rules, as int8 codes (see CODES).
+        values is anything indexable by indicator name: a DataFrame, a Panel of 2-D arrays or a single bar (dictionary or Series of scalars), so the column, panel and bar versions all share these rules.
+        Returns a dictionary with the MA_Signal, MACD_Cross, RSI_Signal, Stoch_Signal and BB_Signal codes (arrays, or scalars for a single bar).
+        """
+        codes = FeatureEngineer.CODES
+        params = FeatureEngineer.parameters(params)
+        select = FeatureEngineer._select
+        sma_fast, sma_slow = values["SMA_50"], values["SMA_200"]
+        rsi = values["RSI"]
+        stoch_k, stoch_d = values["Stoch_%K"], values["Stoch_%D"]
+        close = values["Close"]
+
+        return {
+            "MA_Signal": select(
+                [sma_fast > sma_slow, sma_fast < sma_slow],
+                [codes["Golden Cross"], codes["Death Cross"]],
+                codes["Neutral"],
+            ),
+            "MACD_Cross": select(
+                [values["MACD"] > values["MACD_Signal"]], [codes["Bullish"]], codes["Bearish"]
+            ),
+            "RSI_Signal": select(
+                [rsi < params["rsi_oversold"], rsi > params["rsi_overbought"]],
+                [codes["Oversold"], codes["Overbought"]],
+                codes["Neutral"],
+            ),
+            "Stoch_Signal": select(
+                [
+                    (stoch_k < params["stoch_oversold"]) & (stoch_k > stoch_d),
+                    (stoch_k > params["stoch_overbought"]) & (stoch_k < stoch_d),
+                ],
+                [codes["Oversold"], codes["Overbought"]],
+                codes["Neutral"],
+            ),
+            "BB_Signal": select(
+                [close <= values["BB_Lower"], close >= values["BB_Upper"]],
+                [codes["Lower Band"], codes["Upper Band"]],
+                codes["Within Bands"],
+            ),
+        }
+
+    @staticmethod
+    def composite_rule(rsi, stoch, bb):
+        """The Composite_Signal rule on the int8 codes of RSI_Signal, Stoch_Signal and BB_Signal (arrays, or scalars for a single bar)"""
+        codes = FeatureEngineer.CODES
+        return FeatureEngineer._select(
+            [
+                (rsi == codes["Oversold"])
+                & (stoch == codes["Oversold"])
+                & (bb == codes["Lower Band"]),
+                (rsi == codes["Overbought"])
+                & (stoch == codes["Overbought"])
+                & (bb == codes["Upper Band"]),
+            ],
+            [codes["Strong Buy"], codes["Strong Sell"]],
+            codes["Neutral"],
+        )
+
     @staticmethod
-    def generate_signals(df):
+    def generate_signals(df, params=None):
         """
         Generating trading signals based on various technical indicators and adds them as new columns to the dataframe.
 
         Parameters:
         df (pandas dataframe): DataFrame containing stock price data and calculated technical indicators.
+        params (dict, optional): Overrides of the DEFAULT_PARAMS thresholds.
 
         Returns:
-        df: The input DataFrame with additional columns for trading signals.
+        df: The input DataFrame with additional columns for trading signals (Categoricals over SIGNAL_LABELS).
 
-        Signals generated:
+        Signals generated (the rules are defined once, in signal_rules):
         - MA_Signal: Indicates "Golden Cross" when SMA_50 > SMA_200, "Death Cross" when SMA_50 < SMA_200, and "Neutral" otherwise.
         - MACD_Cross: Indicates "Bullish" when MACD > MACD_Signal and "Bearish" otherwise.
         - RSI_Signal: Indicates "Oversold" when RSI < 30, "Overbought" when RSI > 70, and "Neutral" otherwise.
         - Stoch_Signal: Indicates "Oversold" when Stoch_%K < 20 and %K > %D, "Overbought" when Stoch_%K > 80 and %K < %D, and "Neutral" otherwise.
         - BB_Signal: Indicates "Lower Band" when Close price is less than or equal to BB_Lower, "Upper Band" when Close price is greater than or equal to BB_Upper, and "Within Bands" otherwise.
         """
-        # Trading signals using Technical Indicators
-
-        # MA Signals
-        df["MA_Signal"] = np.where(
-            df["SMA_50"] > df["SMA_200"],
-            "Golden Cross",
-            np.where(df["SMA_50"] < df["SMA_200"], "Death Cross", "Neutral"),
-        )
-
-        # MACD Signals
-        df["MACD_Cross"] = np.where(
-            df["MACD"] > df["MACD_Signal"], "Bullish", "Bearish"
-        )
-
-        # RSI Signals
-        df["RSI_Signal"] = np.select(
-            [df["RSI"] < 30, df["RSI"] > 70],
-            ["Oversold", "Overbought"],
-            default="Neutral",
-        )
-
-        # Stochastic Signals
-        df["Stoch_Signal"] = np.select(
-            [
-                (df["Stoch_%K"] < 20) & (df["Stoch_%K"] > df["Stoch_%D"]),
-                (df["Stoch_%K"] > 80) & (df["Stoch_%K"] < df["Stoch_%D"]),
-            ],
-            ["Oversold", "Overbought"],
-            default="Neutral",
-        )
-
-        # Bollinger Band Signals
-        df["BB_Signal"] = np.select(
-            [df["Close"] <= df["BB_Lower"], df["Close"] >= df["BB_Upper"]],
-            ["Lower Band", "Upper Band"],
-            default="Within Bands",
-        )
-
+        for column, codes in FeatureEngineer.signal_rules(df, params).items():
+            FeatureEngineer._store_signal(df, column, codes)
         return df
 
     @staticmethod
@@ -83,52 +201,83 @@ class FeatureEngineer:
 
         Returns:
         df: The dataframe with the added "Composite_Signal" column
+
+        The conditions are evaluated on the int8 signal codes (composite_rule), not on string labels.
         """
-        df["Composite_Signal"] = np.where(
-            (df["RSI_Signal"] == "Oversold")
-            & (df["Stoch_Signal"] == "Oversold")
-            & (df["BB_Signal"] == "Lower Band"),
-            "Strong Buy",
-            np.where(
-                (df["RSI_Signal"] == "Overbought")
-                & (df["Stoch_Signal"] == "Overbought")
-                & (df["BB_Signal"] == "Upper Band"),
-                "Strong Sell",
-                "Neutral",
+        FeatureEngineer._store_signal(
+            df,
+            "Composite_Signal",
+            FeatureEngineer.composite_rule(
+                FeatureEngineer.signal_codes(df["RSI_Signal"]),
+                FeatureEngineer.signal_codes(df["Stoch_Signal"]),
+                FeatureEngineer.signal_codes(df["BB_Signal"]),
             ),
         )
         return df
 
     @staticmethod
-    def risk_management(df):
+    def risk_management(df, params=None):
         """
         This function takes a pandas dataframe df as input and adds two new columns "Stop_Loss_Long"
         and "Stop_Loss_Short" based on the ATR (Average True Range) indicator. The stop loss levels are
-        calculated as twice the ATR from the current close price.
+        calculated as twice the ATR (params["stop_atr"] times) from the current close price.
 
         Parameters:
         df: The dataframe containing the stock price data
+        params: Optional overrides of DEFAULT_PARAMS
 
         Returns:
         df: The dataframe with the added "Stop_Loss_Long" and "Stop_Loss_Short" columns
         """
-        df["Stop_Loss_Long"] = df["Close"] - 2 * df["ATR"]
-        df["Stop_Loss_Short"] = df["Close"] + 2 * df["ATR"]
+        stop_atr = FeatureEngineer.parameters(params)["stop_atr"]
+        df["Stop_Loss_Long"] = df["Close"] - stop_atr * df["ATR"]
+        df["Stop_Loss_Short"] = df["Close"] + stop_atr * df["ATR"]
         return df
 
     @classmethod
-    def create_all_features(cls, df):
+    def create_all_features(cls, df, params=None):
         """
         This function takes a pandas dataframe df as input and generates all features used in the dashboard
         by calling the generate_signals, composite_signal, and risk_management methods.
 
         Parameters:
         df: The dataframe containing the stock price data
+        params: Optional overrides of DEFAULT_PARAMS
 
         Returns:
         df: The dataframe with all features added
+
+        For a DataFrame the thresholds used (parameters(params)) are added to df.attrs["params"], next to the indicator windows recorded by TechnicalIndicators.calculate_all_indicators.
+        Each call is recorded as a "features" stage of the shared PipelineMetrics (instrumentation.py), for the ticker set with metrics.ticker().
         """
-        df = cls.generate_signals(df)
-        df = cls.composite_signal(df)
-        df = cls.risk_management(df)
-        return df
+        with metrics.stage("features") as record:
+            df = cls.generate_signals(df, params)
+            df = cls.composite_signal(df)
+            df = cls.risk_management(df, params)
+            if isinstance(df, pd.DataFrame):
+                df.attrs["params"] = {**df.attrs.get("params", {}), **cls.parameters(params)}
+            return record.output(df)
+
+    @staticmethod
+    def bar_features(bar, params=None):
+        """
+        This function applies the rules of generate_signals, composite_signal and risk_management (signal_rules and composite_rule) to one bar instead of a whole dataframe.
+
+        Parameters:
+        bar: A dictionary (or Series) with Close, SMA_50, SMA_200, MACD, MACD_Signal, RSI, Stoch_%K, Stoch_%D, BB_Upper, BB_Lower and ATR values
+        params: Optional overrides of DEFAULT_PARAMS
+
+        Returns:
+        features: A dictionary with MA_Signal, MACD_Cross, RSI_Signal, Stoch_Signal, BB_Signal, Composite_Signal, Stop_Loss_Long and Stop_Loss_Short
+        """
+        params = FeatureEngineer.parameters(params)
+        codes = FeatureEngineer.signal_rules(bar, params)
+        codes["Composite_Signal"] = FeatureEngineer.composite_rule(
+            codes["RSI_Signal"], codes["Stoch_Signal"], codes["BB_Signal"]
+        )
+        features = {
+            column: FeatureEngineer.SIGNAL_LABELS[code] for column, code in codes.items()
+        }
+        features["Stop_Loss_Long"] = bar["Close"] - params["stop_atr"] * bar["ATR"]
+        features["Stop_Loss_Short"] = bar["Close"] + params["stop_atr"] * bar["ATR"]
+        return features
@@ -0,0 +1,225 @@
+import hashlib
+import json
+import os
+import shutil
+import numpy as np
+
+
+class StreamingScaler:
+    """
+    StreamingScaler class keeps the running count, min, max, mean and sum of squared deviations of every column, so a scaler can be fitted on the training rows only and grown row block by row block in walk-forward use without refitting.
+    Class Methods:
+    1. __init__(method="minmax", feature_range=(0, 1)): "minmax" scales like MinMaxScaler(feature_range), "standard" like StandardScaler (population variance).
+    2. partial_fit(values): Adds a block of rows (or one row) to the statistics (Chan's parallel mean/variance update).
+    3. merge(other): Adds the statistics of another scaler fitted on other rows.
+    4. transform(values) / inverse_transform(values, columns=None): Scales rows to float32 / maps scaled values of the given columns back to their units (e.g. a predicted target).
+    5. state() / from_state(state): JSON compatible dictionary of the scaler / the scaler of such a dictionary.
+
+    Constant columns scale to the lower end of the range (minmax) or to 0 (standard), as the scikit-learn scalers do.
+    """
+
+    def __init__(self, method="minmax", feature_range=(0, 1)):
+        if method not in ("minmax", "standard"):
+            raise ValueError(f"Unknown scaling method {method}")
+        self.method = method
+        self.feature_range = tuple(feature_range)
+        self.count = 0
+        self.min = self.max = self.mean = self.m2 = None
+
+    def partial_fit(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        if values.ndim == 1:
+            values = values[None, :]
+        if len(values) == 0:
+            return self
+        count = len(values)
+        mean = values.mean(axis=0)
+        m2 = ((values - mean) ** 2).sum(axis=0)
+        return self._combine(count, values.min(axis=0), values.max(axis=0), mean, m2)
+
+    def _combine(self, count, low, high, mean, m2):
+        """Helper adding the statistics of count other rows"""
+        if self.count == 0:
+            self.count, self.min, self.max, self.mean, self.m2 = count, low, high, mean, m2
+            return self
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean = self.mean + delta * (count / total)
+        self.m2 = self.m2 + m2 + delta * delta * (self.count * count / total)
+        self.min = np.fmin(self.min, low)
+        self.max = np.fmax(self.max, high)
+        self.count = total
+        return self
+
+    def merge(self, other):
+        if other.count == 0:
+            return self
+        return self._combine(other.count, other.min, other.max, other.mean, other.m2)
+
+    def _scale(self):
+        """Helper returning (offset, scale) with scaled = (values - offset) / scale (+ the lower end of the range for minmax)"""
+        if self.count == 0:
+            raise ValueError("The scaler has not been fitted")
+        if self.method == "minmax":
+            span = self.max - self.min
+            span = np.where(span == 0, 1.0, span) / (self.feature_range[1] - self.feature_range[0])
+            return self.min, span
+        std = np.sqrt(self.m2 / self.count)
+        return self.mean, np.where(std == 0, 1.0, std)
+
+    def transform(self, values):
+        offset, scale = self._scale()
+        scaled = (np.asarray(values, dtype=np.float64) - offset) / scale
+        if self.method == "minmax":
+            scaled += self.feature_range[0]
+        return scaled.astype(np.float32)
+
+    def inverse_transform(self, values, columns=None):
+        offset, scale = self._scale()
+        if columns is not None:
+            offset, scale = offset[columns], scale[columns]
+        values = np.asarray(values, dtype=np.float64)
+        if self.method == "minmax":
+            values = values - self.feature_range[0]
+        return values * scale + offset
+
+    def state(self):
+        state = {"method": self.method, "feature_range": list(self.feature_range), "count": self.count}
+        if self.count:
+            state.update({name: getattr(self, name).tolist() for name in ("min", "max", "mean", "m2")})
+        return state
+
+    @classmethod
+    def from_state(cls, state):
+        scaler = cls(state["method"], state["feature_range"])
+        scaler.count = state["count"]
+        if scaler.count:
+            for name in ("min", "max", "mean", "m2"):
+                setattr(scaler, name, np.asarray(state[name], dtype=np.float64))
+        return scaler
+
+
+class FeatureMatrix:
+    """
+    FeatureMatrix class turns the indicator frame of a ticker into the model ready float32 matrix (features, then the target) and a scaler fitted on its training rows, and caches both on disk.
+    Class Methods:
+    1. __init__(features, target=None, train_fraction=0.8, method="minmax", cache_dir=None): Sets the columns, the share of rows the scaler is fitted on and the cache folder (default: Datasets/.matrices).
+    2. build(df): Returns (matrix, dates): the feature columns and the target of an indicator frame sorted oldest first, rows with NaN dropped, as one contiguous float32 array. A frame whose dates are not strictly increasing raises ValueError.
+    3. train_rows(rows): Number of leading rows the scaler is fitted on.
+    4. fit(matrix, rows=None): Returns a StreamingScaler fitted on the first rows of matrix only (train_rows by default).
+    5. expanding(matrix, starts): Generator yielding (start, scaler) with the scaler fitted on the rows before every start, each step only adding the new rows (walk-forward use).
+    6. load_or_build(ticker, source, compute): Returns (matrix, dates, scaler) from the cache when an entry for the same ticker, source and settings exists, otherwise calls compute() for the indicator frame, builds, fits and stores them.
+    7. from_store(ticker, store): load_or_build on a FeatureStore, keyed on its current version.
+
+    TARGETS are target columns computed from the frame: Next_Close (the next bar's close) and Next_Change (the next bar's Close - Open, the Target of Notebooks/LSTM_prediction.ipynb); any other target must be a column of the frame.
+    A cache entry is a folder with matrix.npy (read memory-mapped), dates.npy and entry.json (the key and the scaler state), written to a temporary folder and renamed like ColumnarCache entries.
+    """
+
+    FORMAT_VERSION = 1
+    TARGETS = {
+        "Next_Close": lambda df: df["Close"].shift(-1),
+        "Next_Change": lambda df: (df["Close"] - df["Open"]).shift(-1),
+    }
+    ENTRY = "entry.json"
+
+    def __init__(self, features, target=None, train_fraction=0.8, method="minmax", cache_dir=None):
+        self.features = list(features)
+        self.target = target
+        self.train_fraction = train_fraction
+        self.method = method
+        if cache_dir is None:
+            base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            cache_dir = os.path.join(base_dir, "Datasets", ".matrices")
+        self.cache_dir = os.path.abspath(cache_dir)
+
+    @property
+    def columns(self):
+        return self.features + ([self.target] if self.target else [])
+
+    def build(self, df):
+        """
+        Model ready (matrix, dates) of an indicator frame sorted oldest first; the target of the last row is unknown, so that row is dropped with the other rows holding NaN
+        """
+        # On a newest first frame the targets would be the previous bar's and the training rows the latest ones, so it is refused rather than re-sorted (its indicators ran backwards in time too)
+        if not (df["Date"].is_monotonic_increasing and df["Date"].is_unique):
+            raise ValueError("The frame must be sorted oldest first with unique dates, e.g. StockDataCleaner.clean_data(df, sort_descending=False)")
+        data = {feature: df[feature].to_numpy(dtype=np.float64) for feature in self.features}
+        if self.target:
+            target = self.TARGETS[self.target](df) if self.target in self.TARGETS else df[self.target]
+            data[self.target] = np.asarray(target, dtype=np.float64)
+        matrix = np.column_stack(list(data.values())) if data else np.empty((len(df), 0))
+        keep = ~np.isnan(matrix).any(axis=1)
+        return np.ascontiguousarray(matrix[keep], dtype=np.float32), df["Date"].to_numpy()[keep]
+
+    def train_rows(self, rows):
+        return int(rows * self.train_fraction)
+
+    def fit(self, matrix, rows=None):
+        rows = self.train_rows(len(matrix)) if rows is None else rows
+        return StreamingScaler(self.method).partial_fit(matrix[:rows])
+
+    def expanding(self, matrix, starts):
+        """
+        Scalers fitted on the rows before every (increasing) start, for walk-forward validation; the same scaler object is updated in place
+        """
+        scaler = StreamingScaler(self.method)
+        fitted = 0
+        for start in starts:
+            if start < fitted:
+                raise ValueError("starts must be increasing")
+            scaler.partial_fit(matrix[fitted:start])
+            fitted = start
+            yield start, scaler
+
+    def _key(self, ticker, source):
+        """Helper returning the cache key (everything the matrix and the scaler depend on) and its folder"""
+        key = {
+            "format": self.FORMAT_VERSION,
+            "ticker": ticker,
+            "source": source,
+            "columns": self.columns,
+            "train_fraction": self.train_fraction,
+            "method": self.method,
+        }
+        digest = hashlib.sha1(json.dumps(key, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:16]
+        return key, os.path.join(self.cache_dir, f"{ticker}_{digest}")
+
+    def load(self, ticker, source, mmap_mode="r"):
+        """
+        Cached (matrix, dates, scaler) of ticker for source, or None on a cache miss
+        """
+        key, entry_dir = self._key(ticker, source)
+        try:
+            with open(os.path.join(entry_dir, self.ENTRY)) as f:
+                entry = json.load(f)
+            if json.loads(json.dumps(key, default=str)) != entry["key"]:
+                return None
+            matrix = np.load(os.path.join(entry_dir, "matrix.npy"), mmap_mode=mmap_mode)
+            dates = np.load(os.path.join(entry_dir, "dates.npy"))
+        except (OSError, ValueError, KeyError):
+            # A missing, corrupt or half-written entry is a miss
+            return None
+        return matrix, dates, StreamingScaler.from_state(entry["scaler"])
+
+    def load_or_build(self, ticker, source, compute):
+        cached = self.load(ticker, source)
+        if cached is not None:
+            return cached
+        matrix, dates = self.build(compute())
+        scaler = self.fit(matrix)
+
+        key, entry_dir = self._key(ticker, source)
+        tmp_dir = f"{entry_dir}.tmp{os.getpid()}"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+        np.save(os.path.join(tmp_dir, "matrix.npy"), matrix)
+        np.save(os.path.join(tmp_dir, "dates.npy"), dates.astype("datetime64[ns]"))
+        with open(os.path.join(tmp_dir, self.ENTRY), "w") as f:
+            json.dump({"key": key, "scaler": scaler.state()}, f, default=str)
+        shutil.rmtree(entry_dir, ignore_errors=True)
+        os.replace(tmp_dir, entry_dir)
+        return matrix, dates, scaler
+
+    def from_store(self, ticker, store):
+        source = {"store": store.store_dir, "version": store.current_version()}
+        return self.load_or_build(ticker, source, lambda: store.read(ticker).reset_index(drop=True))
@@ -0,0 +1,283 @@
+"""
+The code below maintains the precomputed feature store read by the dashboard, so no indicator has to be calculated at request time.
+
+Build (or rebuild) the store from the Main directory with:
+    python feature_store.py build [--data-dir DIR] [--store-dir DIR] [--workers N] [--backend ta|numpy|numba] [--param sma_fast=20 ...]
+
+Show the current version with:
+    python feature_store.py info [--store-dir DIR]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+import pandas as pd
+from data_cache import ColumnarCache
+from data_collection import StockDataCollector, _read_and_clean
+from technical_indicators import TechnicalIndicators
+from feature_engineering import FeatureEngineer
+from incremental_indicators import IndicatorState
+from date_index import DateIndex
+
+
+class FeatureStore:
+    """
+    FeatureStore class keeps the indicator and feature frames of every ticker on disk, as versioned ColumnarCache frames that can be memory-mapped.
+    Class Methods:
+    1. __init__(store_dir=None): Opens (or creates) the store directory (default: Datasets/.features).
+    2. build(historical_data_path=None, params=None, max_workers=None, backend="ta", cache_dir=None, keep=2): Reads, cleans and computes all indicators and features of every HistoricalData_ file on a process pool, writes them as a new version and makes it current.
+    3. current_version() / versions(): Name of the version readers use / all versions on disk, oldest first.
+    4. manifest(version=None): The store.json of a version (parameters, fingerprints of all source files, rows and date range per built ticker, errors of the failed ones).
+    5. tickers(): Sorted tickers of the current version.
+    6. read(ticker, start=None, end=None, columns=None, mmap_mode="r"): Reads one ticker, optionally only a date range and a subset of columns. Columns are memory-mapped, so only the pages of the requested rows are read from disk.
+    7. is_stale(historical_data_path=None, params=None): True when there is no current version or it was built from other source files or parameters.
+    8. prune(keep=2): Removes all but the newest keep versions (never the current one).
+
+    Layout: <store_dir>/<version>/<ticker>/ holds one ColumnarCache.write_frame entry per ticker (oldest bar first) and <store_dir>/<version>/store.json the version manifest.
+    <store_dir>/CURRENT names the current version; it is replaced atomically after a build is complete, so readers never see a half built version.
+    """
+
+    FORMAT_VERSION = 1
+    CURRENT = "CURRENT"
+    MANIFEST = "store.json"
+
+    def __init__(self, store_dir=None):
+        if store_dir is None:
+            base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            store_dir = os.path.join(base_dir, "Datasets", ".features")
+        self.store_dir = os.path.abspath(store_dir)
+        os.makedirs(self.store_dir, exist_ok=True)
+        self._manifests = {}
+
+    @staticmethod
+    def parameters(params=None):
+        """Indicator windows and feature thresholds the store is built with (defaults updated with params)"""
+        merged = IndicatorState.parameters(params)
+        merged.update(FeatureEngineer.parameters(params))
+        return merged
+
+    @staticmethod
+    def _sources(historical_data_path):
+        """Helper returning {ticker: file fingerprint} of the HistoricalData_ files of a folder"""
+        sources = {}
+        for filename in sorted(os.listdir(historical_data_path)):
+            if filename.endswith(".csv") and filename.startswith("HistoricalData_"):
+                ticker = filename.split("_")[1].split(".")[0]
+                sources[ticker] = ColumnarCache._fingerprint(
+                    os.path.join(historical_data_path, filename)
+                )
+        return sources
+
+    def current_version(self):
+        """Name of the current version, or None if the store was never built"""
+        try:
+            with open(os.path.join(self.store_dir, self.CURRENT)) as f:
+                version = f.read().strip()
+        except FileNotFoundError:
+            return None
+        if not os.path.exists(os.path.join(self.store_dir, version, self.MANIFEST)):
+            return None
+        return version
+
+    def versions(self):
+        """Complete versions on disk, oldest first"""
+        return sorted(
+            name
+            for name in os.listdir(self.store_dir)
+            if os.path.exists(os.path.join(self.store_dir, name, self.MANIFEST))
+        )
+
+    def manifest(self, version=None):
+        """Manifest of version (the current one by default); versions are immutable, so manifests are read once"""
+        version = version or self.current_version()
+        if version is None:
+            raise FileNotFoundError(f"Feature store {self.store_dir} has not been built")
+        if version not in self._manifests:
+            with open(os.path.join(self.store_dir, version, self.MANIFEST)) as f:
+                self._manifests[version] = json.load(f)
+        return self._manifests[version]
+
+    def tickers(self):
+        """Sorted tickers of the current version"""
+        return sorted(self.manifest()["tickers"])
+
+    def read(self, ticker, start=None, end=None, columns=None, mmap_mode="r"):
+        """
+        Read the features of ticker between start and end (inclusive, None for unbounded).
+        columns selects a subset of columns (Date is always included); the rows are located by binary search on the sorted Date column (DateIndex), and the returned frame holds views of the memory-mapped files, indexed by their dates.
+        """
+        version = self.current_version()
+        entry = self.manifest(version)["tickers"].get(ticker)
+        if entry is None:
+            raise KeyError(f"{ticker} is not in the feature store")
+        if columns is not None:
+            columns = ["Date"] + [col for col in columns if col != "Date"]
+
+        df, _ = ColumnarCache.read_frame(
+            os.path.join(self.store_dir, version, entry["path"]), mmap_mode, columns
+        )
+        df = DateIndex.slice(df, start, end)
+        # Only the selected rows' dates are turned into the DatetimeIndex
+        df.index = pd.DatetimeIndex(df["Date"]).rename(None)
+        return df
+
+    def is_stale(self, historical_data_path=None, params=None):
+        """True if the current version is missing or does not match the source files / parameters"""
+        if self.current_version() is None:
+            return True
+        manifest = self.manifest()
+        if historical_data_path is None:
+            historical_data_path = StockDataCollector().historical_data_path
+        return (
+            manifest["format"] != self.FORMAT_VERSION
+            or manifest["sources"] != self._sources(historical_data_path)
+            or manifest["params"] != self.parameters(params)
+        )
+
+    def build(
+        self,
+        historical_data_path=None,
+        params=None,
+        max_workers=None,
+        backend="ta",
+        cache_dir=None,
+        keep=2,
+    ):
+        """
+        Build a new version from the HistoricalData_ files of historical_data_path and make it current.
+        Each worker reads, cleans (oldest bar first), computes the indicators and features of one file and writes it straight into the version folder; only a small summary travels back.
+        cache_dir optionally reuses the cleaned frames of a ColumnarCache. Returns the manifest of the new version.
+        """
+        if historical_data_path is None:
+            historical_data_path = StockDataCollector().historical_data_path
+        historical_data_path = os.path.abspath(historical_data_path)
+        params = self.parameters(params)
+        sources = self._sources(historical_data_path)
+
+        digest = hashlib.sha1(
+            json.dumps([params, backend], sort_keys=True).encode("utf-8")
+        ).hexdigest()[:8]
+        version = f"{datetime.now().strftime('%Y%m%dT%H%M%S%f')}-{digest}"
+        version_dir = os.path.join(self.store_dir, version)
+        os.makedirs(version_dir)
+
+        tickers, errors = {}, {}
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(
+                    _build_ticker,
+                    source["path"],
+                    os.path.join(version_dir, ticker),
+                    params,
+                    backend,
+                    cache_dir,
+                ): ticker
+                for ticker, source in sources.items()
+            }
+            for future in as_completed(futures):
+                ticker = futures[future]
+                try:
+                    tickers[ticker] = dict(future.result(), path=ticker)
+                except Exception as e:
+                    errors[ticker] = str(e)
+
+        manifest = {
+            "format": self.FORMAT_VERSION,
+            "version": version,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "params": params,
+            "backend": backend,
+            # Every source file, also the failed ones, so is_stale compares against the whole folder
+            "sources": sources,
+            "tickers": {ticker: tickers[ticker] for ticker in sorted(tickers)},
+            "errors": errors,
+        }
+        with open(os.path.join(version_dir, self.MANIFEST), "w") as f:
+            json.dump(manifest, f, indent=1)
+
+        pointer = os.path.join(self.store_dir, f"{self.CURRENT}.tmp{os.getpid()}")
+        with open(pointer, "w") as f:
+            f.write(version)
+        os.replace(pointer, os.path.join(self.store_dir, self.CURRENT))
+
+        self.prune(keep)
+        return manifest
+
+    def prune(self, keep=2):
+        """Remove all but the newest keep versions, always keeping the current one"""
+        current = self.current_version()
+        for version in self.versions()[:-keep] if keep > 0 else self.versions():
+            if version != current:
+                shutil.rmtree(os.path.join(self.store_dir, version), ignore_errors=True)
+
+
+def _build_ticker(file_path, entry_dir, params, backend, cache_dir):
+    """
+    Read, clean and compute the features of one file and write them to entry_dir.
+    This is a module level function so it can be pickled and sent to the worker processes of FeatureStore.build.
+    """
+    df = _read_and_clean(file_path, cache_dir, sort_descending=False)
+    df = TechnicalIndicators.calculate_all_indicators(df, backend=backend, params=params)
+    df = FeatureEngineer.create_all_features(df, params)
+    ColumnarCache.write_frame(entry_dir, df)
+    return {
+        "rows": len(df),
+        "start": str(df["Date"].iloc[0].date()) if len(df) else None,
+        "end": str(df["Date"].iloc[-1].date()) if len(df) else None,
+    }
+
+
+def parse_param(text):
+    """Parse a NAME=VALUE parameter override (e.g. sma_fast=20 or bb_dev=2.5)"""
+    name, value = text.split("=", 1)
+    number = float(value)
+    return name, int(number) if number.is_integer() and "." not in value else number
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or inspect the precomputed feature store")
+    parser.add_argument("command", choices=["build", "info"])
+    parser.add_argument("--data-dir", default=None, help="Folder with the HistoricalData_ CSV files")
+    parser.add_argument("--store-dir", default=None, help="Feature store folder (default: Datasets/.features)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--backend", default="ta", help="Indicator backend: ta, numpy or numba")
+    parser.add_argument("--param", action="append", default=[], help="NAME=VALUE override of an indicator window or threshold")
+    parser.add_argument("--keep", type=int, default=2, help="Versions to keep on disk")
+    args = parser.parse_args()
+
+    store = FeatureStore(args.store_dir)
+    if args.command == "build":
+        start = time.perf_counter()
+        manifest = store.build(
+            args.data_dir,
+            params=dict(parse_param(text) for text in args.param),
+            max_workers=args.workers,
+            backend=args.backend,
+            keep=args.keep,
+        )
+        print(
+            f"Built version {manifest['version']} with {len(manifest['tickers'])} tickers "
+            f"({len(manifest['errors'])} failed) in {time.perf_counter() - start:.2f} s"
+        )
+        for ticker, error in manifest["errors"].items():
+            print(f"  {ticker}: {error}")
+        return
+
+    version = store.current_version()
+    if version is None:
+        print(f"Feature store {store.store_dir} has not been built")
+        return
+    manifest = store.manifest(version)
+    print(f"Version {version} (created {manifest['created']}, backend {manifest['backend']})")
+    print(f"Stale: {store.is_stale(args.data_dir)}")
+    for ticker, entry in manifest["tickers"].items():
+        print(f"  {ticker:<8}{entry['rows']:>8} rows  {entry['start']} .. {entry['end']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,331 @@
+import math
+from array import array
+import pandas as pd
+
+
+class RingBuffer:
+    """
+    RingBuffer class is a fixed size buffer of floats stored in a flat array('d'), so a window of N values costs 8*N bytes.
+    Class Methods:
+    1. append(value): Adds a value and returns the value it overwrote (None while the buffer is not full yet).
+    2. ago(i): Returns the value appended i bars before the newest one (ago(0) is the newest).
+    3. __len__ / __iter__: Number of stored values and iteration from oldest to newest.
+    """
+
+    __slots__ = ("values", "capacity", "start", "length")
+
+    def __init__(self, capacity):
+        self.values = array("d", bytes(8 * capacity))
+        self.capacity = capacity
+        self.start = 0
+        self.length = 0
+
+    def append(self, value):
+        """Add value, returning the overwritten oldest value once the buffer is full"""
+        if self.length < self.capacity:
+            self.values[(self.start + self.length) % self.capacity] = value
+            self.length += 1
+            return None
+        evicted = self.values[self.start]
+        self.values[self.start] = value
+        self.start = (self.start + 1) % self.capacity
+        return evicted
+
+    def ago(self, i):
+        """Value appended i bars before the newest one"""
+        return self.values[(self.start + self.length - 1 - i) % self.capacity]
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        for i in range(self.length):
+            yield self.values[(self.start + i) % self.capacity]
+
+
+class IndicatorState:
+    """
+    IndicatorState class keeps the running state needed to extend the TechnicalIndicators columns one bar at a time, instead of recomputing them over the whole history.
+    Class Methods:
+    1. __init__(params=None): Creates an empty state (no bars seen yet) for the indicator windows of params (see DEFAULT_PARAMS).
+    2. update(high, low, close): Adds one bar and returns a dictionary with the new SMA_50, SMA_200, EMA_12, EMA_26, MACD, MACD_Signal, MACD_Hist, RSI, Stoch_%K, Stoch_%D, BB_Upper, BB_Lower and ATR values.
+    3. append(new_rows): Adds every row of an OHLC DataFrame and returns a DataFrame holding only the new rows with their indicator columns.
+    4. from_history(df, params=None): Class method that builds the state by replaying an existing OHLC DataFrame.
+    5. parameters(params=None): Class method returning DEFAULT_PARAMS (the indicator windows) updated with params.
+
+    The state consists of (default windows in brackets):
+    - a ring buffer of the last sma_slow (200) closes with rolling sums over the last sma_fast/sma_slow (50/200) closes (SMA) and the last bb_window (20) closes and squared closes (Bollinger Bands)
+    - the previous ema_fast (12), ema_slow (26) and MACD signal values
+    - Wilder averages of gains/losses (RSI) and of the true range (ATR)
+    - ring buffers of the last stoch_window (14) lows/highs and the last stoch_smooth (3) raw %K values (Stochastic)
+
+    All windows are fixed size RingBuffers and the class uses __slots__, so one state with the default windows takes roughly 2 KB and thousands of tickers fit in memory.
+    Columns keep their default names (SMA_50, EMA_12, ...) whatever the windows, like TechnicalIndicators.calculate_all_indicators with params.
+
+    The values follow the ta library with fillna=True as used by TechnicalIndicators, including its warm-up behaviour, so appending bars gives the same result as a full recompute with the same params up to floating point tolerance.
+    Rows are appended after the last row of the history, in whatever order that history is stored.
+    """
+
+    __slots__ = (
+        "params",
+        "count",
+        "prev_close",
+        "closes",
+        "sum_fast",
+        "sum_slow",
+        "sum_bb",
+        "sumsq_bb",
+        "shift",
+        "ema_fast",
+        "ema_slow",
+        "macd_signal",
+        "avg_gain",
+        "avg_loss",
+        "lows",
+        "highs",
+        "raw_k",
+        "last_k",
+        "last_d",
+        "tr_sum",
+        "atr",
+    )
+
+    COLUMNS = [
+        "SMA_50",
+        "SMA_200",
+        "EMA_12",
+        "EMA_26",
+        "MACD",
+        "MACD_Signal",
+        "MACD_Hist",
+        "RSI",
+        "Stoch_%K",
+        "Stoch_%D",
+        "BB_Upper",
+        "BB_Lower",
+        "ATR",
+    ]
+
+    # Indicator windows; TechnicalIndicators, PanelIndicators and IndicatorState accept other values through their params argument
+    DEFAULT_PARAMS = {
+        "sma_fast": 50,
+        "sma_slow": 200,
+        "ema_fast": 12,
+        "ema_slow": 26,
+        "macd_signal": 9,
+        "rsi_window": 14,
+        "stoch_window": 14,
+        "stoch_smooth": 3,
+        "bb_window": 20,
+        "bb_dev": 2,
+        "atr_window": 14,
+    }
+
+    @classmethod
+    def parameters(cls, params=None):
+        """Return DEFAULT_PARAMS updated with params"""
+        merged = dict(cls.DEFAULT_PARAMS)
+        if params:
+            merged.update(params)
+        return merged
+
+    def __init__(self, params=None):
+        # Only the indicator windows are kept (params may also hold FeatureEngineer thresholds)
+        self.params = {
+            name: value
+            for name, value in self.parameters(params).items()
+            if name in self.DEFAULT_PARAMS
+        }
+        p = self.params
+        self.count = 0
+        self.prev_close = None
+
+        # Moving averages (the close ring also serves the shorter SMA and Bollinger windows)
+        self.closes = RingBuffer(max(p["sma_fast"], p["sma_slow"], p["bb_window"]))
+        self.sum_fast = 0.0
+        self.sum_slow = 0.0
+
+        # Bollinger Bands (sums are taken around the first close to limit cancellation)
+        self.sum_bb = 0.0
+        self.sumsq_bb = 0.0
+        self.shift = None
+
+        # EMA / MACD
+        self.ema_fast = None
+        self.ema_slow = None
+        self.macd_signal = None
+
+        # RSI
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+
+        # Stochastic
+        self.lows = RingBuffer(p["stoch_window"])
+        self.highs = RingBuffer(p["stoch_window"])
+        self.raw_k = RingBuffer(p["stoch_smooth"])
+        self.last_k = None
+        self.last_d = None
+
+        # ATR
+        self.tr_sum = 0.0
+        self.atr = 0.0
+
+    @classmethod
+    def from_history(cls, df, params=None):
+        """
+        Build the state for params by replaying the High, Low and Close columns of an existing DataFrame
+        """
+        state = cls(params)
+        for high, low, close in zip(
+            df["High"].to_numpy(float), df["Low"].to_numpy(float), df["Close"].to_numpy(float)
+        ):
+            state.update(high, low, close)
+        return state
+
+    def append(self, new_rows):
+        """
+        Add every row of new_rows and return a copy of new_rows with the indicator columns filled in
+        """
+        values = [
+            self.update(high, low, close)
+            for high, low, close in zip(
+                new_rows["High"].to_numpy(float),
+                new_rows["Low"].to_numpy(float),
+                new_rows["Close"].to_numpy(float),
+            )
+        ]
+        result = new_rows.copy()
+        indicators = pd.DataFrame(values, index=new_rows.index, columns=self.COLUMNS)
+        for col in self.COLUMNS:
+            result[col] = indicators[col]
+        return result
+
+    @staticmethod
+    def _dropped(ring, window):
+        """Helper returning the close leaving a window of the ring when the next close is appended (None while the window is not full)"""
+        return ring.ago(window - 1) if len(ring) >= window else None
+
+    def update(self, high, low, close):
+        """
+        Add one bar and return its indicator values
+        """
+        p = self.params
+        n = self.count
+        self.count += 1
+
+        # 1. Trend: SMA (min_periods=1), EMA and MACD (adjust=False, seeded with the first close)
+        if self.shift is None:
+            self.shift = close
+        dropped_fast = self._dropped(self.closes, p["sma_fast"])
+        dropped_slow = self._dropped(self.closes, p["sma_slow"])
+        dropped_bb = self._dropped(self.closes, p["bb_window"])
+        self.closes.append(close)
+
+        self.sum_fast += close
+        if dropped_fast is not None:
+            self.sum_fast -= dropped_fast
+        self.sum_slow += close
+        if dropped_slow is not None:
+            self.sum_slow -= dropped_slow
+        window = len(self.closes)
+        sma_fast = self.sum_fast / min(window, p["sma_fast"])
+        sma_slow = self.sum_slow / min(window, p["sma_slow"])
+
+        if n == 0:
+            self.ema_fast = self.ema_slow = close
+        else:
+            self.ema_fast += (close - self.ema_fast) * (2 / (p["ema_fast"] + 1))
+            self.ema_slow += (close - self.ema_slow) * (2 / (p["ema_slow"] + 1))
+        macd = self.ema_fast - self.ema_slow
+        if n == 0:
+            self.macd_signal = macd
+        else:
+            self.macd_signal += (macd - self.macd_signal) * (2 / (p["macd_signal"] + 1))
+
+        # 2. Momentum: RSI with Wilder smoothing (the first bar counts as a zero change)
+        if n > 0:
+            change = close - self.prev_close
+            gain = change if change > 0 else 0.0
+            loss = -change if change < 0 else 0.0
+            self.avg_gain += (gain - self.avg_gain) / p["rsi_window"]
+            self.avg_loss += (loss - self.avg_loss) / p["rsi_window"]
+        if self.avg_loss == 0:
+            rsi = 100.0
+        else:
+            rsi = 100 - 100 / (1 + self.avg_gain / self.avg_loss)
+
+        # Stochastic over the last stoch_window bars (fewer while warming up)
+        self.lows.append(low)
+        self.highs.append(high)
+        lowest = min(self.lows)
+        highest = max(self.highs)
+        numerator = close - lowest
+        denominator = highest - lowest
+        if denominator != 0:
+            k = 100 * numerator / denominator
+        elif numerator != 0:
+            k = math.copysign(math.inf, numerator)
+        else:
+            k = math.nan
+        self.raw_k.append(k)
+
+        # ta fills non finite %K/%D values forward, and with 50 before the first valid one
+        if math.isfinite(k):
+            self.last_k = k
+        stoch_k = self.last_k if self.last_k is not None else 50.0
+
+        valid_k = [value for value in self.raw_k if not math.isnan(value)]
+        d = sum(valid_k) / len(valid_k) if valid_k else math.nan
+        if math.isfinite(d):
+            self.last_d = d
+        stoch_d = self.last_d if self.last_d is not None else 50.0
+
+        # 3. Volatility: Bollinger Bands (bb_window, bb_dev, population std)
+        centered = close - self.shift
+        self.sum_bb += centered
+        self.sumsq_bb += centered * centered
+        if dropped_bb is not None:
+            dropped = dropped_bb - self.shift
+            self.sum_bb -= dropped
+            self.sumsq_bb -= dropped * dropped
+        size = min(window, p["bb_window"])
+        mean = self.sum_bb / size
+        std = math.sqrt(max(self.sumsq_bb / size - mean * mean, 0.0))
+        bb_mavg = mean + self.shift
+
+        # ATR: zero until atr_window bars, then the mean true range, then Wilder smoothing
+        atr_window = p["atr_window"]
+        if n == 0:
+            true_range = high - low
+        else:
+            true_range = max(
+                high - low, abs(high - self.prev_close), abs(low - self.prev_close)
+            )
+        if n < atr_window - 1:
+            self.tr_sum += true_range
+            atr = 0.0
+        elif n == atr_window - 1:
+            self.tr_sum += true_range
+            self.atr = self.tr_sum / atr_window
+            atr = self.atr
+        else:
+            self.atr = (self.atr * (atr_window - 1) + true_range) / atr_window
+            atr = self.atr
+
+        self.prev_close = close
+
+        return {
+            "SMA_50": sma_fast,
+            "SMA_200": sma_slow,
+            "EMA_12": self.ema_fast,
+            "EMA_26": self.ema_slow,
+            "MACD": macd,
+            "MACD_Signal": self.macd_signal,
+            "MACD_Hist": macd - self.macd_signal,
+            "RSI": rsi,
+            "Stoch_%K": stoch_k,
+            "Stoch_%D": stoch_d,
+            "BB_Upper": bb_mavg + p["bb_dev"] * std,
+            "BB_Lower": bb_mavg - p["bb_dev"] * std,
+            "ATR": atr,
+        }
@@ -0,0 +1,220 @@
+import math
+import warnings
+import numpy as np
+import pandas as pd
+from panel_indicators import Panel, PanelIndicators
+from incremental_indicators import IndicatorState
+
+try:
+    import numba
+except ImportError:  # Numba is optional; without it the "numba" backend uses the NumPy kernels
+    numba = None
+
+
+INDICATOR_COLUMNS = IndicatorState.COLUMNS
+
+
+def _fused_kernel(high, low, close, out):
+    """
+    Single pass over contiguous float64 high/low/close arrays, writing the 13 indicator columns (in INDICATOR_COLUMNS order) into out with shape (13, rows).
+    It follows the ta library with fillna=True as used by TechnicalIndicators: SMA/BB with expanding warm-up, EMAs seeded with the first close, Wilder RSI/ATR and forward filled Stochastic values.
+    Written with plain loops and scalars so Numba can compile it; it also runs (slowly) as normal Python.
+    """
+    n = close.shape[0]
+    sum_50 = 0.0
+    sum_200 = 0.0
+    sum_20 = 0.0
+    sumsq_20 = 0.0
+    shift = close[0] if n > 0 else 0.0
+    ema_12 = 0.0
+    ema_26 = 0.0
+    signal = 0.0
+    avg_gain = 0.0
+    avg_loss = 0.0
+    tr_sum = 0.0
+    atr = 0.0
+    last_k = 50.0
+    last_d = 50.0
+    k_1 = math.nan
+    k_2 = math.nan
+
+    for i in range(n):
+        c = close[i]
+
+        # Trend
+        sum_50 += c
+        if i >= 50:
+            sum_50 -= close[i - 50]
+        sum_200 += c
+        if i >= 200:
+            sum_200 -= close[i - 200]
+        out[0, i] = sum_50 / min(i + 1, 50)
+        out[1, i] = sum_200 / min(i + 1, 200)
+
+        if i == 0:
+            ema_12 = c
+            ema_26 = c
+        else:
+            ema_12 += (c - ema_12) * (2.0 / 13.0)
+            ema_26 += (c - ema_26) * (2.0 / 27.0)
+        macd = ema_12 - ema_26
+        if i == 0:
+            signal = macd
+        else:
+            signal += (macd - signal) * (2.0 / 10.0)
+        out[2, i] = ema_12
+        out[3, i] = ema_26
+        out[4, i] = macd
+        out[5, i] = signal
+        out[6, i] = macd - signal
+
+        # RSI
+        if i > 0:
+            change = c - close[i - 1]
+            gain = change if change > 0 else 0.0
+            loss = -change if change < 0 else 0.0
+            avg_gain += (gain - avg_gain) / 14.0
+            avg_loss += (loss - avg_loss) / 14.0
+        if avg_loss == 0:
+            out[7, i] = 100.0
+        else:
+            out[7, i] = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+        # Stochastic %K over the last 14 bars, then %D over the last 3 raw %K values
+        lowest = low[i]
+        highest = high[i]
+        for j in range(max(0, i - 13), i):
+            if low[j] < lowest:
+                lowest = low[j]
+            if high[j] > highest:
+                highest = high[j]
+        numerator = c - lowest
+        denominator = highest - lowest
+        if denominator != 0:
+            raw_k = 100.0 * numerator / denominator
+        elif numerator != 0:
+            raw_k = math.inf if numerator > 0 else -math.inf
+        else:
+            raw_k = math.nan
+
+        total = 0.0
+        count = 0
+        for value in (raw_k, k_1, k_2):
+            if not math.isnan(value):
+                total += value
+                count += 1
+        raw_d = total / count if count > 0 else math.nan
+        k_2 = k_1
+        k_1 = raw_k
+
+        # Non finite values are forward filled (50 before the first finite one)
+        if math.isfinite(raw_k):
+            last_k = raw_k
+        if math.isfinite(raw_d):
+            last_d = raw_d
+        out[8, i] = last_k
+        out[9, i] = last_d
+
+        # Bollinger Bands (population std of the last 20 closes)
+        centered = c - shift
+        sum_20 += centered
+        sumsq_20 += centered * centered
+        if i >= 20:
+            dropped = close[i - 20] - shift
+            sum_20 -= dropped
+            sumsq_20 -= dropped * dropped
+        size = min(i + 1, 20)
+        mean = sum_20 / size
+        std = math.sqrt(max(sumsq_20 / size - mean * mean, 0.0))
+        out[10, i] = mean + shift + 2.0 * std
+        out[11, i] = mean + shift - 2.0 * std
+
+        # ATR
+        if i == 0:
+            true_range = high[i] - low[i]
+        else:
+            true_range = max(
+                high[i] - low[i],
+                abs(high[i] - close[i - 1]),
+                abs(low[i] - close[i - 1]),
+            )
+        if i < 13:
+            tr_sum += true_range
+            atr = 0.0
+        elif i == 13:
+            tr_sum += true_range
+            atr = tr_sum / 14.0
+        else:
+            atr = (atr * 13.0 + true_range) / 14.0
+        out[12, i] = atr
+
+    return out
+
+
+class IndicatorKernels:
+    """
+    IndicatorKernels class provides the alternative (non ta) backends of TechnicalIndicators.calculate_all_indicators.
+    Class Methods:
+    1. available_backends(): Returns the backends usable in this environment ("ta" and "numpy" always, "numba" when Numba is installed).
+    2. compute(df, backend, params=None): Returns a dictionary of the 13 indicator arrays of df (High, Low and Close columns) computed by the "numpy" or "numba" backend.
+
+    The "numpy" backend is not fused: it runs the PanelIndicators array kernels on a one ticker panel, one vectorized pass (or recursive filter) per indicator.
+    The "numba" backend runs _fused_kernel, a single pass over contiguous float64 arrays compiled with numba.njit. The kernel has the default windows built in, so without Numba installed, or with non default windows in params, the "numba" backend cannot be honoured: compute emits a RuntimeWarning and uses the "numpy" backend.
+    Both follow the ta library with fillna=True, which stays the reference oracle in the tests.
+    """
+
+    _compiled = None
+
+    @staticmethod
+    def available_backends():
+        """Backends usable in this environment"""
+        backends = ["ta", "numpy"]
+        if numba is not None:
+            backends.append("numba")
+        return backends
+
+    @classmethod
+    def _numba_kernel(cls):
+        """Helper compiling _fused_kernel on first use"""
+        if cls._compiled is None:
+            cls._compiled = numba.njit(cache=True)(_fused_kernel)
+        return cls._compiled
+
+    @classmethod
+    def compute(cls, df, backend="numpy", params=None):
+        """
+        Compute the indicator arrays of df with the "numpy" or "numba" backend
+        A "numba" request that falls back to the "numpy" backend (Numba not installed, or non default windows) emits a RuntimeWarning.
+        """
+        params = IndicatorState.parameters(params)
+        if backend not in ("numpy", "numba"):
+            raise ValueError(f"Unknown indicator backend: {backend}")
+
+        high = np.ascontiguousarray(df["High"].to_numpy(dtype=np.float64))
+        low = np.ascontiguousarray(df["Low"].to_numpy(dtype=np.float64))
+        close = np.ascontiguousarray(df["Close"].to_numpy(dtype=np.float64))
+
+        # The fused kernel has the default windows built in
+        if backend == "numba":
+            if numba is None:
+                reason = "Numba is not installed"
+            elif any(params[key] != value for key, value in IndicatorState.DEFAULT_PARAMS.items()):
+                reason = "the fused kernel only supports the default windows"
+            else:
+                out = np.empty((len(INDICATOR_COLUMNS), len(close)))
+                cls._numba_kernel()(high, low, close, out)
+                return dict(zip(INDICATOR_COLUMNS, out))
+            warnings.warn(
+                f'The "numba" indicator backend falls back to "numpy": {reason}',
+                RuntimeWarning,
+                stacklevel=2,
+            )
+
+        # A one ticker panel; rows are kept in the order of df
+        panel = Panel(
+            pd.RangeIndex(len(close)),
+            ["_"],
+            {"High": high[:, None], "Low": low[:, None], "Close": close[:, None]},
+        )
+        PanelIndicators.calculate_all_indicators(panel, params)
+        return {col: panel[col][:, 0] for col in INDICATOR_COLUMNS}
@@ -0,0 +1,287 @@
+"""
+This code provides the instrumentation of the pipeline stages: the StockDataCollector file loads, StockDataCleaner.clean_all, TechnicalIndicators.calculate_all_indicators, FeatureEngineer.create_all_features and the dashboard loaders record their wall time, rows and bytes into the shared metrics object below.
+
+Run the pipeline once and print its metrics with:
+    python instrumentation.py [--data-dir DIR] [--backend ta|numpy|numba] [--log FILE] [--prometheus FILE] [--profile DIR]
+
+--log appends one JSON line per stage run (the STOCK_METRICS_LOG environment variable does the same for any process, e.g. the dashboard), --prometheus writes the Prometheus text export, and --profile captures a cProfile and tracemalloc profile of the run into DIR.
+The dashboard serves the Prometheus export on http://127.0.0.1:<port>/metrics when STOCK_METRICS_PORT is set.
+"""
+
+import argparse
+import contextvars
+import cProfile
+import functools
+import json
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import numpy as np
+import pandas as pd
+
+
+class StageRecord:
+    """
+    StageRecord class holds one run of a stage: stage, ticker, start time, seconds, rows, bytes (of its output), allocated (net bytes traced by tracemalloc while it ran, only when tracing) and error.
+    output(result) sets rows and bytes from a DataFrame, an array or a dictionary of them, and returns result.
+    """
+
+    __slots__ = ("stage", "ticker", "time", "seconds", "rows", "bytes", "allocated", "error")
+
+    def __init__(self, stage, ticker):
+        self.stage = stage
+        self.ticker = ticker
+        self.time = time.time()
+        self.seconds = 0.0
+        self.rows = self.bytes = self.allocated = self.error = None
+
+    def output(self, result):
+        if isinstance(result, dict):
+            sizes = [self._size(value) for value in result.values()]
+            sizes = [size for size in sizes if size is not None]
+            if sizes:
+                self.rows = sum(rows for rows, _ in sizes)
+                self.bytes = sum(nbytes for _, nbytes in sizes)
+        else:
+            size = self._size(result)
+            if size is not None:
+                self.rows, self.bytes = size
+        return result
+
+    @staticmethod
+    def _size(value):
+        """Helper returning (rows, bytes) of a DataFrame or array, None for anything else (object columns count their pointers only)"""
+        if isinstance(value, pd.DataFrame):
+            return len(value), int(value.memory_usage(index=True, deep=False).sum())
+        if isinstance(value, np.ndarray):
+            return len(value), int(value.nbytes)
+        return None
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class PipelineMetrics:
+    """
+    PipelineMetrics class collects StageRecords and their running totals per (stage, ticker).
+    Class Methods:
+    1. __init__(log_path=None, max_records=10000): Creates an empty collector; with log_path every record is also appended to that file as a JSON line. Only the last max_records records are kept, the totals cover every run.
+    2. stage(name, ticker=None): Context manager timing a block and yielding its StageRecord (call record.output(result) for rows and bytes); an exception is recorded as the error and raised again. ticker defaults to the one set with ticker().
+    3. ticker(ticker): Context manager setting the ticker of the stages run inside it (per thread / task, e.g. calculate_all_indicators called for one ticker).
+    4. timed(name): Decorator recording every call of a function as a stage, with its result as output.
+    5. frame(): Returns the totals as a DataFrame (Stage, Ticker, Calls, Seconds, Rows, Bytes, Allocated, Errors).
+    6. prometheus(): Returns the totals in the Prometheus text exposition format.
+    7. serve(port=9108, host="127.0.0.1"): Serves prometheus() on http://host:port/metrics from a daemon thread and returns the server.
+    8. profile(directory): Context manager capturing cProfile and tracemalloc while it runs and writing profile.prof, profile.txt and tracemalloc.txt into directory; stages run meanwhile also record their allocated bytes.
+    9. reset(): Forgets every record and total.
+
+    Records are kept in the process that ran the stage: work done in process pool workers (e.g. clean_all with max_workers) is recorded as one stage of the parent.
+    The cost of a stage is two perf_counter calls and one locked dictionary update, so the hooks stay on in production.
+    """
+
+    PREFIX = "stock_pipeline_stage"
+    TOTALS = ["Calls", "Seconds", "Rows", "Bytes", "Allocated", "Errors"]
+
+    def __init__(self, log_path=None, max_records=10000):
+        self.log_path = log_path
+        self.records = deque(maxlen=max_records)
+        self.totals = {}
+        self.lock = threading.Lock()
+        self._ticker = contextvars.ContextVar("ticker", default=None)
+
+    @contextmanager
+    def stage(self, name, ticker=None):
+        record = StageRecord(name, ticker if ticker is not None else self._ticker.get())
+        tracing = tracemalloc.is_tracing()
+        before = tracemalloc.get_traced_memory()[0] if tracing else 0
+        start = time.perf_counter()
+        try:
+            yield record
+        except Exception as e:
+            record.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            record.seconds = time.perf_counter() - start
+            if tracing and tracemalloc.is_tracing():
+                record.allocated = tracemalloc.get_traced_memory()[0] - before
+            self._add(record)
+
+    @contextmanager
+    def ticker(self, ticker):
+        token = self._ticker.set(ticker)
+        try:
+            yield
+        finally:
+            self._ticker.reset(token)
+
+    def timed(self, name):
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.stage(name) as record:
+                    return record.output(func(*args, **kwargs))
+
+            return wrapper
+
+        return decorator
+
+    def _add(self, record):
+        """Helper storing a finished record, updating its totals and appending it to the log"""
+        with self.lock:
+            self.records.append(record)
+            totals = self.totals.setdefault((record.stage, record.ticker), [0, 0.0, 0, 0, 0, 0])
+            totals[0] += 1
+            totals[1] += record.seconds
+            totals[2] += record.rows or 0
+            totals[3] += record.bytes or 0
+            totals[4] += record.allocated or 0
+            totals[5] += record.error is not None
+            if self.log_path:
+                with open(self.log_path, "a") as f:
+                    f.write(json.dumps(record.to_dict()) + "\n")
+
+    def frame(self):
+        with self.lock:
+            rows = [[stage, ticker] + totals for (stage, ticker), totals in self.totals.items()]
+        frame = pd.DataFrame(rows, columns=["Stage", "Ticker"] + self.TOTALS)
+        return frame.sort_values(["Stage", "Ticker"], key=lambda col: col.fillna(""), ignore_index=True)
+
+    @staticmethod
+    def _label(value):
+        """Helper escaping a Prometheus label value"""
+        return str("" if value is None else value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    def prometheus(self):
+        metrics = [
+            ("calls_total", "Number of runs of a pipeline stage", 0),
+            ("seconds_total", "Wall time spent in a pipeline stage", 1),
+            ("rows_total", "Rows output by a pipeline stage", 2),
+            ("bytes_total", "Bytes of the frames output by a pipeline stage", 3),
+            ("allocated_bytes_total", "Net bytes allocated by a pipeline stage while tracemalloc was tracing", 4),
+            ("errors_total", "Runs of a pipeline stage that raised", 5),
+        ]
+        with self.lock:
+            totals = sorted(self.totals.items(), key=lambda item: (item[0][0], item[0][1] or ""))
+        lines = []
+        for suffix, help_text, position in metrics:
+            name = f"{self.PREFIX}_{suffix}"
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for (stage, ticker), values in totals:
+                lines.append(f'{name}{{stage="{self._label(stage)}",ticker="{self._label(ticker)}"}} {values[position]:.6g}')
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port=9108, host="127.0.0.1"):
+        collector = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = collector.prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+    @contextmanager
+    def profile(self, directory, top=30):
+        os.makedirs(directory, exist_ok=True)
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            if started:
+                tracemalloc.stop()
+
+            profiler.dump_stats(os.path.join(directory, "profile.prof"))
+            with open(os.path.join(directory, "profile.txt"), "w") as f:
+                pstats.Stats(profiler, stream=f).sort_stats("cumulative").print_stats(top)
+            with open(os.path.join(directory, "tracemalloc.txt"), "w") as f:
+                f.write(f"Current {current / 2**20:.1f} MB, peak {peak / 2**20:.1f} MB\n")
+                for stat in snapshot.statistics("lineno")[:top]:
+                    f.write(f"{stat}\n")
+
+    def reset(self):
+        with self.lock:
+            self.records.clear()
+            self.totals.clear()
+
+
+# Shared collector of the pipeline hooks
+metrics = PipelineMetrics(log_path=os.environ.get("STOCK_METRICS_LOG"))
+
+
+def run_pipeline(historical_data_path=None, backend="ta"):
+    """
+    Collect, clean (oldest bar first) and compute the indicators and features of every ticker, recording every stage; returns {ticker: frame}
+    """
+    # Imported here: the pipeline modules import this one for their hooks
+    from data_collection import StockDataCollector
+    from data_cleaning import StockDataCleaner
+    from technical_indicators import TechnicalIndicators
+    from feature_engineering import FeatureEngineer
+
+    collector = StockDataCollector(historical_data_path)
+    collector.collect_data()
+    data = StockDataCleaner.clean_all(collector, sort_descending=False)
+    featured = {}
+    for ticker, df in data.items():
+        with metrics.ticker(ticker):
+            df = TechnicalIndicators.calculate_all_indicators(df, backend=backend)
+            featured[ticker] = FeatureEngineer.create_all_features(df)
+    return featured
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the pipeline once and report the metrics of every stage")
+    parser.add_argument("--data-dir", default=None, help="Folder with the HistoricalData_ CSV files")
+    parser.add_argument("--backend", default="ta", help="Indicator backend: ta, numpy or numba")
+    parser.add_argument("--log", default=None, help="Append one JSON line per stage run to this file")
+    parser.add_argument("--prometheus", default=None, help="Write the Prometheus text export to this file")
+    parser.add_argument("--profile", default=None, help="Write cProfile and tracemalloc profiles of the run to this folder")
+    args = parser.parse_args()
+
+    if args.log:
+        metrics.log_path = args.log
+    if args.profile:
+        with metrics.profile(args.profile):
+            run_pipeline(args.data_dir, args.backend)
+        print(f"Profiles written to {os.path.abspath(args.profile)}")
+    else:
+        run_pipeline(args.data_dir, args.backend)
+
+    frame = metrics.frame()
+    frame["Seconds"] = frame["Seconds"].round(4)
+    print(frame.to_string(index=False))
+    if args.prometheus:
+        with open(args.prometheus, "w") as f:
+            f.write(metrics.prometheus())
+
+
+if __name__ == "__main__":
+    # Run the imported module, whose metrics object is the one the pipeline modules record into
+    import instrumentation
+
+    instrumentation.main()
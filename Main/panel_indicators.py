@@ -0,0 +1,408 @@
+import numpy as np
+import pandas as pd
+from feature_engineering import FeatureEngineer
+from incremental_indicators import IndicatorState
+
+
+class Panel:
+    """
+    Panel class holds one 2-D array (dates x tickers) per field, e.g. panel["Close"][t, j] is the close of tickers[j] on dates[t].
+    Class Methods:
+    1. __init__(dates, tickers, fields=None): Creates a panel from a sorted DatetimeIndex, a list of tickers and a dictionary of 2-D arrays.
+    2. from_frames(data): Class method that aligns a dictionary of per-ticker DataFrames ({ticker: df} with a Date column) on the union of their dates.
+    3. to_frame(columns=None): Returns a long DataFrame with a (Date, Ticker) MultiIndex, keeping only the dates on which each ticker has a Close. Signal code arrays are decoded into Categorical columns.
+    4. __getitem__ / __setitem__ / __contains__: Access the field arrays like DataFrame columns, so FeatureEngineer methods work on a panel unchanged.
+
+    Dates a ticker has no bar for (e.g. before its listing date) hold NaN in every numeric field.
+    """
+
+    __slots__ = ("dates", "tickers", "fields")
+
+    def __init__(self, dates, tickers, fields=None):
+        self.dates = dates
+        self.tickers = list(tickers)
+        self.fields = fields if fields is not None else {}
+
+    @classmethod
+    def from_frames(cls, data, columns=("Open", "High", "Low", "Close", "Volume")):
+        """
+        Build a panel from {ticker: df}. Rows are sorted by date (oldest first) whatever the order of the input frames.
+        Categorical columns (the FeatureEngineer signals) are stored as int8 code arrays, with -1 where a ticker has no bar.
+        """
+        tickers = sorted(data)
+        dates = pd.DatetimeIndex(
+            np.unique(np.concatenate([data[t]["Date"].to_numpy() for t in tickers]))
+        )
+        first = data[tickers[0]] if tickers else None
+        fields = {}
+        for col in columns:
+            if col in FeatureEngineer.SIGNAL_COLUMNS or (
+                first is not None and isinstance(first[col].dtype, pd.CategoricalDtype)
+            ):
+                fields[col] = np.full((len(dates), len(tickers)), -1, dtype=np.int8)
+            else:
+                fields[col] = np.full((len(dates), len(tickers)), np.nan)
+
+        for j, ticker in enumerate(tickers):
+            df = data[ticker]
+            rows = dates.get_indexer(df["Date"])
+            for col in columns:
+                if fields[col].dtype == np.int8:
+                    fields[col][rows, j] = FeatureEngineer.signal_codes(df[col])
+                else:
+                    fields[col][rows, j] = df[col].to_numpy(dtype=float)
+        return cls(dates, tickers, fields)
+
+    def to_frame(self, columns=None):
+        """
+        Long DataFrame indexed by (Date, Ticker) with one column per field
+        """
+        columns = list(self.fields) if columns is None else columns
+        listed = ~np.isnan(self.fields["Close"])
+        date_idx, ticker_idx = np.nonzero(listed)
+        index = pd.MultiIndex.from_arrays(
+            [self.dates[date_idx], np.asarray(self.tickers, dtype=object)[ticker_idx]],
+            names=["Date", "Ticker"],
+        )
+        frame = {}
+        for col in columns:
+            values = np.asarray(self.fields[col])[listed]
+            if col in FeatureEngineer.SIGNAL_COLUMNS:
+                values = FeatureEngineer.decode_signals(values)
+            frame[col] = values
+        return pd.DataFrame(frame, index=index)
+
+    def __getitem__(self, field):
+        return self.fields[field]
+
+    def __setitem__(self, field, values):
+        self.fields[field] = values
+
+    def __contains__(self, field):
+        return field in self.fields
+
+
+class PanelIndicators:
+    """
+    PanelIndicators class computes the TechnicalIndicators columns for every ticker of a Panel at once, with NumPy array operations over (dates x tickers) arrays instead of one ta call per ticker.
+    Class Methods:
+    1. trend_indicators(panel, params=None): SMA_50, SMA_200, EMA_12, EMA_26, MACD, MACD_Signal and MACD_Hist.
+    2. momentum_indicators(panel, params=None): RSI, Stoch_%K and Stoch_%D.
+    3. volatility_indicators(panel, params=None): BB_Upper, BB_Lower and ATR.
+    4. calculate_all_indicators(cls, panel, params=None): Calls the three methods above and returns the panel.
+    5. create_all_features(panel, params=None): Runs FeatureEngineer.create_all_features on the panel arrays.
+
+    params overrides the default windows (IndicatorState.DEFAULT_PARAMS) or signal thresholds (FeatureEngineer.DEFAULT_PARAMS); the column names stay the default ones (SMA_50 is the fast SMA whatever its window).
+    The underscore helpers take precomputed intermediates (cumulative sums, gains/losses, true ranges, rolling extremes), so a parameter sweep can share them between configurations.
+
+    Every ticker starts its indicators on its own first bar, matching TechnicalIndicators (ta with fillna=True) applied to that ticker's rows sorted oldest first.
+    Rolling windows are built from cumulative sums (means) or a few shifted element-wise min/max passes (Stochastic); the recursive EMA/Wilder averages take one time loop whose body is vectorized across all tickers.
+    Missing bars after the listing date are skipped: the EMA/Wilder states carry over and rolling windows span the last window bars of the ticker, not the last window dates.
+    When some ticker has such gaps, the rolling windows run on the rows reordered so that every ticker's bars come first (_bar_order) and the results are put back in date order; without gaps they run on the dates directly.
+    """
+
+    @staticmethod
+    def _listed(close):
+        """Helper returning (valid bar mask, bar number since listing) of a close panel"""
+        valid = ~np.isnan(close)
+        bar_number = np.cumsum(valid, axis=0) - 1
+        return valid, bar_number
+
+    @staticmethod
+    def _bar_order(valid):
+        """Helper returning None when the bars of every ticker are consecutive dates, otherwise the row order (per ticker) putting its bars first, oldest first"""
+        runs = valid[:1].sum(axis=0) + (valid[1:] & ~valid[:-1]).sum(axis=0)
+        if (runs <= 1).all():
+            return None
+        return np.argsort(~valid, axis=0, kind="stable")
+
+    @staticmethod
+    def _compact(values, order):
+        """Helper reordering the rows of every ticker by order (bar k of a ticker on row k)"""
+        return np.take_along_axis(values, order, axis=0)
+
+    @staticmethod
+    def _expand(values, order):
+        """Helper putting rows reordered by order back in date order"""
+        expanded = np.empty_like(values)
+        np.put_along_axis(expanded, order, values, axis=0)
+        return expanded
+
+    @classmethod
+    def _window_diff(cls, cumulative, window, order=None):
+        """Helper turning a cumulative sum down the rows into the total over the last window rows (the last window bars with the order of _bar_order)"""
+        if order is not None:
+            return cls._expand(cls._window_diff(cls._compact(cumulative, order), window), order)
+        total = cumulative.astype(float)
+        total[window:] -= cumulative[:-window]
+        return total
+
+    @classmethod
+    def _rolling_sum(cls, values, known, window, order=None):
+        """Helper returning the sum of the known values and their count over the last window rows (bars with order)"""
+        total = cls._window_diff(np.cumsum(np.where(known, values, 0.0), axis=0), window, order)
+        count = cls._window_diff(np.cumsum(known, axis=0), window, order)
+        return total, count
+
+    @staticmethod
+    def _first_valid(values, valid):
+        """Helper returning the first valid value of each column (0 for empty columns)"""
+        first = np.argmax(valid, axis=0)
+        ref = values[first, np.arange(values.shape[1])]
+        return np.where(np.isnan(ref), 0.0, ref)
+
+    @staticmethod
+    def _forward_fill(values, default):
+        """Helper that fills non finite values with the last finite value above them, or default if there is none"""
+        finite = np.isfinite(values)
+        rows = np.where(finite, np.arange(len(values))[:, None], -1)
+        np.maximum.accumulate(rows, axis=0, out=rows)
+        filled = values[np.maximum(rows, 0), np.arange(values.shape[1])]
+        return np.where(rows >= 0, filled, default)
+
+    @staticmethod
+    def _shift(values, periods):
+        """Helper shifting rows down by periods, filling the top with NaN"""
+        shifted = np.full_like(values, np.nan)
+        if periods < len(values):
+            shifted[periods:] = values[: len(values) - periods]
+        return shifted
+
+    @staticmethod
+    def _mask(values, valid):
+        """Helper setting the dates without a bar to NaN"""
+        return np.where(valid, values, np.nan)
+
+    @classmethod
+    def _sma(cls, close, valid, window, order=None):
+        """Rolling mean with min_periods=1, centered on the first close to limit cancellation"""
+        ref = cls._first_valid(close, valid)
+        total, count = cls._rolling_sum(close - ref, valid, window, order)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return cls._mask(total / count + ref, valid)
+
+    @staticmethod
+    def _recursive_average(values, alpha):
+        """
+        Helper running state += alpha * (values - state) down the rows, starting from 0.
+        alpha is a (dates x tickers) array: 1 seeds the average with that value, 0 keeps the previous state (missing bars).
+        The loop body is three in-place vector operations across all tickers.
+        """
+        values = np.where(alpha == 0, 0.0, values)
+        if values.shape[1] == 1:
+            # A single ticker is faster as a loop over Python floats than as 1-element array operations
+            state = 0.0
+            column = []
+            for x, a in zip(values[:, 0].tolist(), alpha[:, 0].tolist()):
+                state += a * (x - state)
+                column.append(state)
+            return np.array(column).reshape(-1, 1)
+
+        output = np.empty_like(values)
+        state = np.zeros(values.shape[1])
+        step = np.empty_like(state)
+        for t in range(len(values)):
+            np.subtract(values[t], state, out=step)
+            step *= alpha[t]
+            state += step
+            output[t] = state
+        return output
+
+    @classmethod
+    def _ema(cls, values, valid, bar_number, alpha):
+        """Exponential average (adjust=False) seeded with the first valid value of each ticker"""
+        weights = np.where(valid, np.where(bar_number == 0, 1.0, alpha), 0.0)
+        return cls._recursive_average(values, weights)
+
+    @classmethod
+    def trend_indicators(cls, panel, params=None):
+        """
+        Calculates SMA_50, SMA_200, EMA_12, EMA_26 and MACD (12, 26, 9) for all tickers of the panel (windows from params, see IndicatorState.DEFAULT_PARAMS)
+        """
+        params = IndicatorState.parameters(params)
+        close = panel["Close"]
+        valid, bar_number = cls._listed(close)
+        order = cls._bar_order(valid)
+
+        panel["SMA_50"] = cls._sma(close, valid, params["sma_fast"], order)
+        panel["SMA_200"] = cls._sma(close, valid, params["sma_slow"], order)
+
+        ema_fast = cls._ema(close, valid, bar_number, 2 / (params["ema_fast"] + 1))
+        ema_slow = cls._ema(close, valid, bar_number, 2 / (params["ema_slow"] + 1))
+        for col, values in cls._macd(
+            ema_fast, ema_slow, valid, bar_number, params["macd_signal"]
+        ).items():
+            panel[col] = values
+        return panel
+
+    @classmethod
+    def _macd(cls, ema_fast, ema_slow, valid, bar_number, signal_window):
+        """Helper returning the EMA and MACD columns from the fast and slow EMAs"""
+        macd = ema_fast - ema_slow
+        macd_signal = cls._ema(macd, valid, bar_number, 2 / (signal_window + 1))
+        return {
+            "EMA_12": cls._mask(ema_fast, valid),
+            "EMA_26": cls._mask(ema_slow, valid),
+            "MACD": cls._mask(macd, valid),
+            "MACD_Signal": cls._mask(macd_signal, valid),
+            "MACD_Hist": cls._mask(macd - macd_signal, valid),
+        }
+
+    @classmethod
+    def _previous_close(cls, close, valid):
+        """Helper returning the close of the previous existing bar (NaN on the first bar)"""
+        previous = cls._shift(cls._forward_fill(close, np.nan), 1)
+        return np.where(valid, previous, np.nan)
+
+    @classmethod
+    def _gains_losses(cls, close, valid):
+        """Helper returning the gains and losses of every bar; the first bar counts as a zero change"""
+        change = close - cls._previous_close(close, valid)
+        change = np.where(np.isnan(change), 0.0, change)
+        gain = np.where(valid, np.maximum(change, 0.0), np.nan)
+        loss = np.where(valid, np.maximum(-change, 0.0), np.nan)
+        return gain, loss
+
+    @classmethod
+    def _rsi(cls, gain, loss, valid, bar_number, window):
+        """Helper returning the RSI from Wilder averages of gains and losses"""
+        avg_gain = cls._ema(gain, valid, bar_number, 1 / window)
+        avg_loss = cls._ema(loss, valid, bar_number, 1 / window)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            rsi = np.where(avg_loss == 0, 100.0, 100 - 100 / (1 + avg_gain / avg_loss))
+        return cls._mask(rsi, valid)
+
+    @classmethod
+    def _rolling_extremes(cls, low, high, valid, window, start=None, order=None):
+        """
+        Helper returning the lowest low and highest high over the last window rows (fewer while warming up) via shifted element-wise min/max.
+        start=(lowest, highest, smaller_window) continues from the extremes of a smaller window instead of from scratch.
+        With the order of _bar_order the windows span bars instead of rows.
+        """
+        if order is not None:
+            if start is not None:
+                start = (cls._compact(start[0], order), cls._compact(start[1], order), start[2])
+            lowest, highest = cls._rolling_extremes(
+                cls._compact(low, order), cls._compact(high, order), cls._compact(valid, order), window, start
+            )
+            return cls._expand(lowest, order), cls._expand(highest, order)
+        valid_low = np.where(valid, low, np.nan)
+        valid_high = np.where(valid, high, np.nan)
+        if start is None:
+            lowest, highest, first = valid_low.copy(), valid_high.copy(), 1
+        else:
+            lowest, highest, first = start[0].copy(), start[1].copy(), start[2]
+        for k in range(first, min(window, len(low))):
+            np.fmin(lowest[k:], valid_low[:-k], out=lowest[k:])
+            np.fmax(highest[k:], valid_high[:-k], out=highest[k:])
+        return lowest, highest
+
+    @classmethod
+    def _stochastic(cls, close, lowest, highest, valid, smooth_window, order=None):
+        """Helper returning Stoch_%K and Stoch_%D from the rolling extremes"""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            raw_k = 100 * (close - lowest) / (highest - lowest)
+        raw_k = np.where(valid, raw_k, np.nan)
+
+        # %D: mean of the available raw %K values over smooth_window bars; non finite values are forward filled (50 before the first one)
+        known = ~np.isnan(raw_k)
+        total, count = cls._rolling_sum(raw_k, known, smooth_window, order)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            raw_d = np.where(valid & (count > 0), total / count, np.nan)
+        return (
+            cls._mask(cls._forward_fill(raw_k, 50.0), valid),
+            cls._mask(cls._forward_fill(raw_d, 50.0), valid),
+        )
+
+    @classmethod
+    def momentum_indicators(cls, panel, params=None):
+        """
+        Calculates RSI (14) and the Stochastic Oscillator (14, 3) for all tickers of the panel (windows from params, see IndicatorState.DEFAULT_PARAMS)
+        """
+        params = IndicatorState.parameters(params)
+        close, high, low = panel["Close"], panel["High"], panel["Low"]
+        valid, bar_number = cls._listed(close)
+        order = cls._bar_order(valid)
+
+        gain, loss = cls._gains_losses(close, valid)
+        panel["RSI"] = cls._rsi(gain, loss, valid, bar_number, params["rsi_window"])
+
+        lowest, highest = cls._rolling_extremes(low, high, valid, params["stoch_window"], order=order)
+        panel["Stoch_%K"], panel["Stoch_%D"] = cls._stochastic(
+            close, lowest, highest, valid, params["stoch_smooth"], order
+        )
+        return panel
+
+    @classmethod
+    def _bollinger(cls, ref, total, total_sq, count, valid, window_dev):
+        """Helper returning the Bollinger Bands from rolling sums of centered values and squares (population std)"""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = total / count
+            std = np.sqrt(np.maximum(total_sq / count - mean * mean, 0.0))
+        return (
+            cls._mask(mean + ref + window_dev * std, valid),
+            cls._mask(mean + ref - window_dev * std, valid),
+        )
+
+    @classmethod
+    def _true_range(cls, close, high, low, valid):
+        """Helper returning the true range of every bar (high - low on the first bar, 0 without a bar)"""
+        previous = cls._previous_close(close, valid)
+        true_range = np.fmax(
+            high - low, np.fmax(np.abs(high - previous), np.abs(low - previous))
+        )
+        return np.where(valid, true_range, 0.0)
+
+    @classmethod
+    def _atr(cls, true_range, valid, bar_number, window):
+        """Helper returning the ATR: zero for the first window - 1 bars, mean true range on bar window, Wilder smoothing afterwards"""
+        seed = np.cumsum(true_range, axis=0) / window
+        seeding = valid & (bar_number == window - 1)
+        weights = np.where(
+            valid & (bar_number > window - 1), 1 / window, np.where(seeding, 1.0, 0.0)
+        )
+        atr = cls._recursive_average(np.where(seeding, seed, true_range), weights)
+        return cls._mask(atr, valid)
+
+    @classmethod
+    def volatility_indicators(cls, panel, params=None):
+        """
+        Calculates Bollinger Bands (20, 2) and ATR (14) for all tickers of the panel (windows from params, see IndicatorState.DEFAULT_PARAMS)
+        """
+        params = IndicatorState.parameters(params)
+        close, high, low = panel["Close"], panel["High"], panel["Low"]
+        valid, bar_number = cls._listed(close)
+        order = cls._bar_order(valid)
+
+        ref = cls._first_valid(close, valid)
+        centered = close - ref
+        total, count = cls._rolling_sum(centered, valid, params["bb_window"], order)
+        total_sq, _ = cls._rolling_sum(
+            centered * centered, valid, params["bb_window"], order
+        )
+        panel["BB_Upper"], panel["BB_Lower"] = cls._bollinger(
+            ref, total, total_sq, count, valid, params["bb_dev"]
+        )
+
+        true_range = cls._true_range(close, high, low, valid)
+        panel["ATR"] = cls._atr(true_range, valid, bar_number, params["atr_window"])
+        return panel
+
+    @classmethod
+    def calculate_all_indicators(cls, panel, params=None):
+        """
+        Calculates all technical indicators (trend, momentum and volatility) for all tickers of the panel and returns it
+        """
+        panel = cls.trend_indicators(panel, params)
+        panel = cls.momentum_indicators(panel, params)
+        panel = cls.volatility_indicators(panel, params)
+        return panel
+
+    @staticmethod
+    def create_all_features(panel, params=None):
+        """
+        Generates the FeatureEngineer signals (as int8 code arrays) and stop-loss levels for all tickers of the panel (thresholds from params, see FeatureEngineer.DEFAULT_PARAMS).
+        Dates without a bar get meaningless codes; Panel.to_frame drops them.
+        """
+        with np.errstate(invalid="ignore"):
+            return FeatureEngineer.create_all_features(panel, params)
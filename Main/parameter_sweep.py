@@ -0,0 +1,319 @@
+import csv
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+import pandas as pd
+from incremental_indicators import IndicatorState
+from feature_engineering import FeatureEngineer
+from panel_indicators import Panel, PanelIndicators
+from backtest import RecommendationBacktester
+
+
+class SharedIndicators:
+    """
+    SharedIndicators class computes the indicator columns of a price Panel for many parameter sets, keeping every intermediate result that more than one set can use.
+    Class Methods:
+    1. __init__(panel): Takes a Panel with Open, High, Low and Close and computes the parameter free intermediates once: listing mask, bar numbers, the centered close cumulative sums (plain and squared), gains/losses and true ranges.
+    2. indicators(params=None): Returns the 13 indicator arrays (IndicatorState.COLUMNS) for params, with the same values as PanelIndicators.calculate_all_indicators(panel, params).
+    3. panel_for(params=None): Returns a Panel with the prices, those indicators and the FeatureEngineer features for params.
+    4. sma(window), ema(span), macd(fast, slow, signal), rsi(window), stochastic(window, smooth_window), bollinger(window, window_dev), atr(window): The memoized building blocks.
+
+    Shared intermediates:
+    - one cumulative sum of the close (and one of its square) serves every SMA window and every Bollinger Band window
+    - EMAs are kept per span (the fast and slow MACD EMAs are reused across signal windows), Wilder RSI per window, ATR per window
+    - Stochastic rolling extremes are kept per window, and a longer window continues from the longest shorter one instead of starting over
+    """
+
+    def __init__(self, panel):
+        close = panel["Close"]
+        self.panel = panel
+        self.valid, self.bar_number = PanelIndicators._listed(close)
+        self.order = PanelIndicators._bar_order(self.valid)
+        self.ref = PanelIndicators._first_valid(close, self.valid)
+        centered = np.where(self.valid, close - self.ref, 0.0)
+        self.close_sum = np.cumsum(centered, axis=0)
+        self.close_sq_sum = np.cumsum(centered * centered, axis=0)
+        self.count = self.bar_number + 1
+        self.gain, self.loss = PanelIndicators._gains_losses(close, self.valid)
+        self.true_range = PanelIndicators._true_range(
+            close, panel["High"], panel["Low"], self.valid
+        )
+        self.memo = {}
+
+    def _cached(self, key, compute):
+        """Helper returning memo[key], computing it on first use"""
+        if key not in self.memo:
+            self.memo[key] = compute()
+        return self.memo[key]
+
+    def _window_sums(self, window):
+        """Rolling (sum, sum of squares, count) of the centered close over window bars"""
+        return self._cached(
+            ("sums", window),
+            lambda: (
+                PanelIndicators._window_diff(self.close_sum, window, self.order),
+                PanelIndicators._window_diff(self.close_sq_sum, window, self.order),
+                PanelIndicators._window_diff(self.count, window, self.order),
+            ),
+        )
+
+    def sma(self, window):
+        def compute():
+            total, _, count = self._window_sums(window)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                return PanelIndicators._mask(total / count + self.ref, self.valid)
+
+        return self._cached(("sma", window), compute)
+
+    def ema(self, span):
+        return self._cached(
+            ("ema", span),
+            lambda: PanelIndicators._ema(
+                self.panel["Close"], self.valid, self.bar_number, 2 / (span + 1)
+            ),
+        )
+
+    def macd(self, fast, slow, signal):
+        return self._cached(
+            ("macd", fast, slow, signal),
+            lambda: PanelIndicators._macd(
+                self.ema(fast), self.ema(slow), self.valid, self.bar_number, signal
+            ),
+        )
+
+    def rsi(self, window):
+        return self._cached(
+            ("rsi", window),
+            lambda: PanelIndicators._rsi(
+                self.gain, self.loss, self.valid, self.bar_number, window
+            ),
+        )
+
+    def extremes(self, window):
+        def compute():
+            shorter = [key[1] for key in self.memo if key[0] == "extremes" and key[1] < window]
+            start = None
+            if shorter:
+                lowest, highest = self.memo[("extremes", max(shorter))]
+                start = (lowest, highest, max(shorter))
+            return PanelIndicators._rolling_extremes(
+                self.panel["Low"], self.panel["High"], self.valid, window, start, self.order
+            )
+
+        return self._cached(("extremes", window), compute)
+
+    def stochastic(self, window, smooth_window):
+        def compute():
+            lowest, highest = self.extremes(window)
+            return PanelIndicators._stochastic(
+                self.panel["Close"], lowest, highest, self.valid, smooth_window, self.order
+            )
+
+        return self._cached(("stochastic", window, smooth_window), compute)
+
+    def bollinger(self, window, window_dev):
+        def compute():
+            total, total_sq, count = self._window_sums(window)
+            return PanelIndicators._bollinger(
+                self.ref, total, total_sq, count, self.valid, window_dev
+            )
+
+        return self._cached(("bollinger", window, window_dev), compute)
+
+    def atr(self, window):
+        return self._cached(
+            ("atr", window),
+            lambda: PanelIndicators._atr(
+                self.true_range, self.valid, self.bar_number, window
+            ),
+        )
+
+    def indicators(self, params=None):
+        """
+        Indicator arrays for params (see IndicatorState.DEFAULT_PARAMS), built from the shared intermediates
+        """
+        params = IndicatorState.parameters(params)
+        columns = {
+            "SMA_50": self.sma(params["sma_fast"]),
+            "SMA_200": self.sma(params["sma_slow"]),
+        }
+        columns.update(
+            self.macd(params["ema_fast"], params["ema_slow"], params["macd_signal"])
+        )
+        columns["RSI"] = self.rsi(params["rsi_window"])
+        columns["Stoch_%K"], columns["Stoch_%D"] = self.stochastic(
+            params["stoch_window"], params["stoch_smooth"]
+        )
+        columns["BB_Upper"], columns["BB_Lower"] = self.bollinger(
+            params["bb_window"], params["bb_dev"]
+        )
+        columns["ATR"] = self.atr(params["atr_window"])
+        return columns
+
+    def panel_for(self, params=None):
+        """
+        A Panel with the prices, the indicators for params and the FeatureEngineer signals and stop-loss levels for params
+        """
+        fields = {col: self.panel[col] for col in ("Open", "High", "Low", "Close")}
+        fields.update(self.indicators(params))
+        panel = Panel(self.panel.dates, self.panel.tickers, fields)
+        return PanelIndicators.create_all_features(panel, params)
+
+
+class ParameterSweep:
+    """
+    ParameterSweep class backtests a grid of indicator windows and signal thresholds over all tickers on a process pool.
+    Class Methods:
+    1. configurations(grid): Returns the list of parameter dictionaries of a grid ({parameter: list of values}), ordered so that neighbouring configurations share indicator windows.
+    2. evaluate(shared, configurations, signal="recommendation", trailing=False): Backtests a list of configurations on a SharedIndicators in one vectorized simulation and returns one result dictionary per configuration.
+    3. iter_sweep(panel, grid=None, max_workers=None, chunk_size=16, ...): Generator yielding the result dictionaries as soon as their chunk of configurations is done.
+    4. run(panel, grid=None, output_path=None, ...): Runs iter_sweep, appends every finished row to output_path (CSV) if given, and returns a compact results DataFrame.
+    5. parameters(): Returns the default value of every parameter (IndicatorState.DEFAULT_PARAMS and FeatureEngineer.DEFAULT_PARAMS).
+
+    Parameters are the keys of IndicatorState.DEFAULT_PARAMS (windows) and FeatureEngineer.DEFAULT_PARAMS (RSI/Stochastic thresholds and stop_atr, the ATR multiple of the stop-loss); parameters missing from the grid keep their default.
+    Each configuration is scored with the RecommendationBacktester rules; the result row holds the parameters plus Trades, Hit Rate, Total Return and Max Drawdown of the equal weight portfolio.
+    The indicator column names keep the default windows (SMA_50 is the fast SMA whatever sma_fast is), so the outputs record the full parameter set: every CSV row has a column per parameter, and the results DataFrame keeps the parameters not in the grid in results.attrs["params"].
+    Every worker process receives the price panel once and keeps its own SharedIndicators across chunks, so an SMA window or an RSI window is computed once per worker whatever the number of configurations using it.
+    """
+
+    DEFAULT_GRID = {
+        "sma_fast": [20, 50],
+        "sma_slow": [100, 200],
+        "rsi_window": [9, 14, 21],
+        "rsi_oversold": [25, 30],
+        "rsi_overbought": [70, 75],
+        "stop_atr": [1.5, 2, 3],
+    }
+    METRICS = ["Trades", "Hit Rate", "Total Return", "Max Drawdown"]
+
+    @staticmethod
+    def parameters():
+        """Default value of every indicator window and signal threshold"""
+        return {**IndicatorState.DEFAULT_PARAMS, **FeatureEngineer.DEFAULT_PARAMS}
+
+    @staticmethod
+    def configurations(grid):
+        """
+        All combinations of the grid as parameter dictionaries, indicator windows varying slowest
+        """
+        names = sorted(grid, key=lambda name: name not in IndicatorState.DEFAULT_PARAMS)
+        return [
+            dict(zip(names, values))
+            for values in itertools.product(*(grid[name] for name in names))
+        ]
+
+    @staticmethod
+    def evaluate(shared, configurations, signal="recommendation", trailing=False):
+        """
+        Backtest configurations on the panel of shared and return one dictionary per configuration
+        """
+        panels = [shared.panel_for(params) for params in configurations]
+        fields = ("Open", "High", "Low", "Close", "Stop_Loss_Long", "Stop_Loss_Short")
+        wide = Panel(
+            shared.panel.dates,
+            shared.panel.tickers * len(panels),
+            {col: np.hstack([panel[col] for panel in panels]) for col in fields},
+        )
+        direction = np.hstack(
+            [
+                RecommendationBacktester.directions(panel, signal=signal, params=params)
+                for panel, params in zip(panels, configurations)
+            ]
+        )
+        equity, trades, wins = RecommendationBacktester.simulate(wide, direction, trailing)
+        return RecommendationBacktester.portfolio_statistics(
+            equity, trades, wins, len(shared.panel.tickers), configurations
+        )
+
+    @classmethod
+    def iter_sweep(
+        cls,
+        panel,
+        grid=None,
+        max_workers=None,
+        chunk_size=16,
+        signal="recommendation",
+        trailing=False,
+    ):
+        """
+        Yield one result dictionary per configuration of the grid, in order of completion.
+        panel is a Panel with Open, High, Low and Close (e.g. Panel.from_frames of the cleaned data); max_workers=1 runs everything in this process.
+        """
+        grid = cls.DEFAULT_GRID if grid is None else grid
+        configurations = cls.configurations(grid)
+        chunks = [
+            configurations[i : i + chunk_size]
+            for i in range(0, len(configurations), chunk_size)
+        ]
+        prices = Panel(
+            panel.dates,
+            panel.tickers,
+            {col: panel[col] for col in ("Open", "High", "Low", "Close")},
+        )
+
+        if max_workers == 1 or len(chunks) == 1:
+            shared = SharedIndicators(prices)
+            for chunk in chunks:
+                yield from cls.evaluate(shared, chunk, signal, trailing)
+            return
+
+        with ProcessPoolExecutor(
+            max_workers=max_workers or os.cpu_count(),
+            initializer=_init_worker,
+            initargs=(prices, signal, trailing),
+        ) as executor:
+            futures = [executor.submit(_evaluate_chunk, chunk) for chunk in chunks]
+            for future in as_completed(futures):
+                yield from future.result()
+
+    @classmethod
+    def run(cls, panel, grid=None, output_path=None, **kwargs):
+        """
+        Run the sweep and return the results as a compact DataFrame (smallest integer / float32 columns), best Total Return first.
+        With output_path every row is appended to that CSV file as soon as it is done, so partial results survive an interrupted sweep; each CSV row holds every parameter (defaults included) so the file describes its configurations on its own.
+        The parameters missing from the grid are kept with their default in results.attrs["params"].
+        Other keyword arguments are passed to iter_sweep.
+        """
+        defaults = cls.parameters()
+        rows = []
+        writer = None
+        handle = open(output_path, "w", newline="") if output_path else None
+        try:
+            for row in cls.iter_sweep(panel, grid, **kwargs):
+                if handle is not None:
+                    full_row = {**defaults, **row}
+                    if writer is None:
+                        writer = csv.DictWriter(handle, fieldnames=list(full_row))
+                        writer.writeheader()
+                    writer.writerow(full_row)
+                    handle.flush()
+                rows.append(row)
+        finally:
+            if handle is not None:
+                handle.close()
+
+        results = pd.DataFrame(rows)
+        for col in results.columns:
+            if col in cls.METRICS and col != "Trades":
+                results[col] = results[col].astype(np.float32)
+            else:
+                downcast = "integer" if results[col].dtype.kind == "i" else "float"
+                results[col] = pd.to_numeric(results[col], downcast=downcast)
+        results = results.sort_values("Total Return", ascending=False).reset_index(drop=True)
+        results.attrs["params"] = {name: value for name, value in defaults.items() if name not in results.columns}
+        return results
+
+
+# Per worker process: the price panel and its SharedIndicators, kept across chunks
+_worker_state = None
+
+
+def _init_worker(prices, signal, trailing):
+    global _worker_state
+    _worker_state = (SharedIndicators(prices), signal, trailing)
+
+
+def _evaluate_chunk(configurations):
+    shared, signal, trailing = _worker_state
+    return ParameterSweep.evaluate(shared, configurations, signal, trailing)
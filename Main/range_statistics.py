@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+from date_index import DateIndex
+from panel_indicators import PanelIndicators
+
+
+class RangeStatistics:
+    """
+    RangeStatistics class answers date range summaries (count, mean, std, min, max) of panel fields without scanning the rows of the range.
+    Class Methods:
+    1. __init__(dates, tickers, fields, extremes=("Close",)): Builds the lookup structures from a sorted DatetimeIndex, a list of tickers and {column: (dates x tickers) array}; min and max are only available for the columns in extremes.
+    2. from_panel(panel, columns=("Close", "Volume", "RSI", "ATR"), extremes=("Close",)): Class method building them from the fields of a Panel.
+    3. count(column, rows) / mean(column, rows) / std(column, rows) / min(column, rows) / max(column, rows): Per ticker statistic of a column over a slice of rows (e.g. DateIndex.rows(dates, start, end)).
+    4. summary(start=None, end=None): Returns a DataFrame with one row per ticker: Ticker, Rows (bars with a Close, or with the first column) and Mean/Std of every column, plus Min/Max of the extremes columns, between start and end (inclusive).
+
+    Structures, built once per panel (all tickers at once, column by column):
+    - prefix sums of the values and of their squares, centered on each ticker's first value to limit cancellation, plus prefix counts of the non NaN values: mean and std of any range are two subtractions, O(1)
+    - sparse tables of the minima and maxima over every power of two run of rows: min and max of any range combine two overlapping runs, O(1) after an O(N log N) build
+    The sparse tables take about 2 * log2(dates) times the memory of their column (18 GB for 10,000 dates x 2,000 tickers and four columns), so they are only built for the extremes columns (the dashboard shows the Close min/max only).
+    The range itself is found by DateIndex in O(log N), so a summary costs the same whatever the length of the history.
+
+    NaN values (dates a ticker has no bar for) are skipped, and std is the sample standard deviation, like the pandas Series methods.
+    """
+
+    __slots__ = ("dates", "tickers", "ref", "sums", "sums_sq", "counts", "minima", "maxima")
+
+    def __init__(self, dates, tickers, fields, extremes=("Close",)):
+        self.dates = dates
+        self.tickers = list(tickers)
+        self.ref, self.sums, self.sums_sq, self.counts = {}, {}, {}, {}
+        self.minima, self.maxima = {}, {}
+        for col, values in fields.items():
+            values = np.asarray(values, dtype=float)
+            valid = ~np.isnan(values)
+            ref = PanelIndicators._first_valid(values, valid)
+            centered = np.where(valid, values - ref, 0.0)
+            self.ref[col] = ref
+            self.sums[col] = self._prefix(centered)
+            self.sums_sq[col] = self._prefix(centered * centered)
+            self.counts[col] = self._prefix(valid.astype(np.int64))
+            if col in extremes:
+                self.minima[col] = self._sparse_table(values, np.fmin)
+                self.maxima[col] = self._sparse_table(values, np.fmax)
+
+    @classmethod
+    def from_panel(cls, panel, columns=("Close", "Volume", "RSI", "ATR"), extremes=("Close",)):
+        """Build the statistics of the given panel fields (min/max of the extremes ones)"""
+        return cls(panel.dates, panel.tickers, {col: panel[col] for col in columns}, extremes)
+
+    @staticmethod
+    def _prefix(values):
+        """Helper returning the cumulative sums down the rows with a leading row of zeros (row i holds the total of the first i rows)"""
+        prefix = np.zeros((len(values) + 1,) + values.shape[1:], dtype=values.dtype)
+        np.cumsum(values, axis=0, out=prefix[1:])
+        return prefix
+
+    @staticmethod
+    def _sparse_table(values, combine):
+        """Helper returning levels where levels[k][i] combines rows i .. i + 2**k - 1 (np.fmin / np.fmax skip NaN)"""
+        levels = [values]
+        width = 1
+        while 2 * width <= len(values):
+            previous = levels[-1]
+            levels.append(combine(previous[:-width], previous[width:]))
+            width *= 2
+        return levels
+
+    @staticmethod
+    def _bounds(rows):
+        """Helper returning the (first, stop) positions of a slice of rows"""
+        return rows.start or 0, rows.stop
+
+    def count(self, column, rows):
+        first, stop = self._bounds(rows)
+        return self.counts[column][stop] - self.counts[column][first]
+
+    def mean(self, column, rows):
+        first, stop = self._bounds(rows)
+        count = self.count(column, rows)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = (self.sums[column][stop] - self.sums[column][first]) / count
+        return mean + self.ref[column]
+
+    def std(self, column, rows):
+        first, stop = self._bounds(rows)
+        count = self.count(column, rows)
+        total = self.sums[column][stop] - self.sums[column][first]
+        total_sq = self.sums_sq[column][stop] - self.sums_sq[column][first]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            variance = (total_sq - total * total / count) / (count - 1)
+        return np.where(count > 1, np.sqrt(np.maximum(variance, 0.0)), np.nan)
+
+    def _range_extreme(self, levels, rows, combine):
+        """Helper combining the two power of two runs that cover a slice of rows"""
+        first, stop = self._bounds(rows)
+        if stop <= first:
+            return np.full(len(self.tickers), np.nan)
+        k = (stop - first).bit_length() - 1
+        return combine(levels[k][first], levels[k][stop - (1 << k)])
+
+    def min(self, column, rows):
+        return self._range_extreme(self.minima[column], rows, np.fmin)
+
+    def max(self, column, rows):
+        return self._range_extreme(self.maxima[column], rows, np.fmax)
+
+    def summary(self, start=None, end=None):
+        """
+        Per ticker summary of every column between start and end (inclusive, None for unbounded)
+        """
+        rows = DateIndex.rows(self.dates, start, end)
+        columns = list(self.sums)
+        summary = {
+            "Ticker": self.tickers,
+            "Rows": self.count("Close" if "Close" in self.sums else columns[0], rows),
+        }
+        for col in columns:
+            summary[f"Mean {col}"] = self.mean(col, rows)
+            summary[f"Std {col}"] = self.std(col, rows)
+            if col in self.minima:
+                summary[f"Min {col}"] = self.min(col, rows)
+                summary[f"Max {col}"] = self.max(col, rows)
+        return pd.DataFrame(summary)
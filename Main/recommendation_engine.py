@@ -0,0 +1,316 @@
+import numpy as np
+import pandas as pd
+from feature_engineering import FeatureEngineer
+from date_index import DateIndex
+
+
+class RecommendationScorer:
+    """
+    RecommendationScorer class turns the technical signals and a sentiment score into a Strong Buy / Buy / Hold / Sell / Strong Sell recommendation.
+    Class Methods:
+    1. get_recommendation(latest_data, sentiment_score, atr_threshold, weights=None, params=None): Scores a single bar (a Series of one ticker) and returns (recommendation, reasons, final_score, signal_contributions), with human readable reasons.
+    2. score(signals, sentiment, atr_threshold, weights=None, params=None): Vectorized version of get_recommendation. Works on arrays of any (broadcastable) shape, e.g. one value per ticker or a (dates x tickers) panel, and returns a dictionary of arrays.
+    3. rank_latest(panel, sentiment, start=None, end=None, weights=None, params=None): Scores the latest bar of every ticker of a Panel within a date range and returns one row per ticker.
+    4. score_history(panel, sentiment, atr_threshold, weights=None, params=None): Scores every bar of every ticker of a Panel at once.
+
+    Scoring rules (weights are the DEFAULT_WEIGHTS entries, thresholds the FeatureEngineer.parameters(params) entries, so a swept threshold is the same in the signals and in the score):
+    - Composite_Signal Strong Buy / Strong Sell: +/- composite
+    - MA_Signal Golden Cross / Death Cross: +/- ma
+    - MACD_Cross Bullish / Bearish: +/- macd
+    - RSI below rsi_oversold (30) / above rsi_overbought (70): +/- rsi
+    - Stochastic %K above %D below stoch_oversold (20) / %K below %D above stoch_overbought (80): +/- stochastic
+    - final_score = tech_score * tech + sentiment * sentiment_weight
+    - Strong Buy above 0.8 (only if ATR <= atr_threshold), Buy above 0.3, Strong Sell below -0.8 (only if ATR <= atr_threshold), Sell below -0.3, Hold otherwise.
+    """
+
+    DEFAULT_WEIGHTS = {
+        "composite": 1.0,
+        "ma": 0.5,
+        "macd": 0.4,
+        "rsi": 0.3,
+        "stochastic": 0.2,
+        "tech": 0.6,
+        "sentiment": 0.4,
+    }
+    RECOMMENDATIONS = ["Strong Buy", "Buy", "Hold", "Sell", "Strong Sell"]
+    RECOMMENDATION_DTYPE = pd.CategoricalDtype(RECOMMENDATIONS)
+
+    @classmethod
+    def _weights(cls, weights):
+        """Helper merging custom weights into DEFAULT_WEIGHTS"""
+        merged = dict(cls.DEFAULT_WEIGHTS)
+        if weights:
+            merged.update(weights)
+        return merged
+
+    @classmethod
+    def get_recommendation(
+        cls, latest_data, sentiment_score, atr_threshold, weights=None, params=None
+    ):
+        """
+        This function scores one bar of one ticker.
+
+        Parameters:
+        latest_data: A Series with Composite_Signal, MA_Signal, MACD_Cross, RSI, Stoch_%K, Stoch_%D and ATR
+        sentiment_score: Sentiment score of the ticker between -1 and 1
+        atr_threshold: ATR level above which Strong Buy/Strong Sell are downgraded (high volatility)
+        params: RSI/Stochastic thresholds (see FeatureEngineer.DEFAULT_PARAMS)
+
+        Returns:
+        recommendation, reasons, final_score, signal_contributions
+        """
+        w = cls._weights(weights)
+        p = FeatureEngineer.parameters(params)
+        tech_score = 0
+        reasons = []
+        signal_contributions = {
+            "Composite": 0,
+            "MA": 0,
+            "MACD": 0,
+            "RSI": 0,
+            "Stochastic": 0,
+            "Sentiment": sentiment_score * w["sentiment"],
+        }
+
+        if latest_data["Composite_Signal"] == "Strong Buy":
+            tech_score += w["composite"]
+            signal_contributions["Composite"] = w["composite"]
+            reasons.append("Strong buy signal from combined indicators")
+        elif latest_data["Composite_Signal"] == "Strong Sell":
+            tech_score -= w["composite"]
+            signal_contributions["Composite"] = -w["composite"]
+            reasons.append("Strong sell signal from combined indicators")
+
+        if latest_data["MA_Signal"] == "Golden Cross":
+            tech_score += w["ma"]
+            signal_contributions["MA"] = w["ma"]
+            reasons.append("Golden Cross in moving averages")
+        elif latest_data["MA_Signal"] == "Death Cross":
+            tech_score -= w["ma"]
+            signal_contributions["MA"] = -w["ma"]
+            reasons.append("Death Cross in moving averages")
+
+        if latest_data["MACD_Cross"] == "Bullish":
+            tech_score += w["macd"]
+            signal_contributions["MACD"] = w["macd"]
+            reasons.append("Bullish MACD crossover")
+        elif latest_data["MACD_Cross"] == "Bearish":
+            tech_score -= w["macd"]
+            signal_contributions["MACD"] = -w["macd"]
+            reasons.append("Bearish MACD crossover")
+
+        if latest_data["RSI"] < p["rsi_oversold"]:
+            tech_score += w["rsi"]
+            signal_contributions["RSI"] = w["rsi"]
+            reasons.append("RSI indicates oversold condition")
+        elif latest_data["RSI"] > p["rsi_overbought"]:
+            tech_score -= w["rsi"]
+            signal_contributions["RSI"] = -w["rsi"]
+            reasons.append("RSI indicates overbought condition")
+
+        if (
+            latest_data["Stoch_%K"] > latest_data["Stoch_%D"]
+            and latest_data["Stoch_%K"] < p["stoch_oversold"]
+        ):
+            tech_score += w["stochastic"]
+            signal_contributions["Stochastic"] = w["stochastic"]
+            reasons.append("Stochastic oscillator suggests buying opportunity")
+        elif (
+            latest_data["Stoch_%K"] < latest_data["Stoch_%D"]
+            and latest_data["Stoch_%K"] > p["stoch_overbought"]
+        ):
+            tech_score -= w["stochastic"]
+            signal_contributions["Stochastic"] = -w["stochastic"]
+            reasons.append("Stochastic oscillator suggests selling pressure")
+
+        final_score = tech_score * w["tech"] + sentiment_score * w["sentiment"]
+        if latest_data["ATR"] > atr_threshold:
+            reasons.append(
+                f"High volatility (ATR: {latest_data['ATR']:.2f} > {atr_threshold:.2f})"
+            )
+
+        if final_score > 0.8 and latest_data["ATR"] <= atr_threshold:
+            recommendation = "Strong Buy"
+        elif final_score > 0.3:
+            recommendation = "Buy"
+        elif final_score < -0.8 and latest_data["ATR"] <= atr_threshold:
+            recommendation = "Strong Sell"
+        elif final_score < -0.3:
+            recommendation = "Sell"
+        else:
+            recommendation = "Hold"
+
+        return recommendation, reasons, final_score, signal_contributions
+
+    @classmethod
+    def score(cls, signals, sentiment, atr_threshold, weights=None, params=None):
+        """
+        Vectorized get_recommendation.
+
+        Parameters:
+        signals: A mapping (DataFrame, Panel or dictionary of arrays) with Composite_Signal, MA_Signal and MACD_Cross (Categoricals or int8 codes), RSI, Stoch_%K, Stoch_%D and ATR
+        sentiment: Sentiment score(s), broadcastable against the signal arrays
+        atr_threshold: ATR threshold(s), broadcastable against the signal arrays
+        params: RSI/Stochastic thresholds (see FeatureEngineer.DEFAULT_PARAMS)
+
+        Returns:
+        A dictionary with the Composite, MA, MACD, RSI, Stochastic and Sentiment contributions, tech_score, final_score and the Recommendation codes (index into RECOMMENDATIONS)
+        """
+        w = cls._weights(weights)
+        p = FeatureEngineer.parameters(params)
+        codes = FeatureEngineer.CODES
+
+        composite = FeatureEngineer.signal_codes(signals["Composite_Signal"])
+        ma = FeatureEngineer.signal_codes(signals["MA_Signal"])
+        macd = FeatureEngineer.signal_codes(signals["MACD_Cross"])
+        rsi = np.asarray(signals["RSI"], dtype=float)
+        stoch_k = np.asarray(signals["Stoch_%K"], dtype=float)
+        stoch_d = np.asarray(signals["Stoch_%D"], dtype=float)
+        atr = np.asarray(signals["ATR"], dtype=float)
+        sentiment = np.asarray(sentiment, dtype=float)
+
+        contributions = {
+            "Composite": np.select(
+                [composite == codes["Strong Buy"], composite == codes["Strong Sell"]],
+                [w["composite"], -w["composite"]],
+                default=0.0,
+            ),
+            "MA": np.select(
+                [ma == codes["Golden Cross"], ma == codes["Death Cross"]],
+                [w["ma"], -w["ma"]],
+                default=0.0,
+            ),
+            "MACD": np.select(
+                [macd == codes["Bullish"], macd == codes["Bearish"]],
+                [w["macd"], -w["macd"]],
+                default=0.0,
+            ),
+            "RSI": np.select(
+                [rsi < p["rsi_oversold"], rsi > p["rsi_overbought"]],
+                [w["rsi"], -w["rsi"]],
+                default=0.0,
+            ),
+            "Stochastic": np.select(
+                [
+                    (stoch_k > stoch_d) & (stoch_k < p["stoch_oversold"]),
+                    (stoch_k < stoch_d) & (stoch_k > p["stoch_overbought"]),
+                ],
+                [w["stochastic"], -w["stochastic"]],
+                default=0.0,
+            ),
+        }
+
+        # Same summation order as get_recommendation, so both give identical floats
+        tech_score = (
+            contributions["Composite"]
+            + contributions["MA"]
+            + contributions["MACD"]
+            + contributions["RSI"]
+            + contributions["Stochastic"]
+        )
+        final_score = tech_score * w["tech"] + sentiment * w["sentiment"]
+        calm = atr <= atr_threshold
+
+        recommendation = np.select(
+            [
+                (final_score > 0.8) & calm,
+                final_score > 0.3,
+                (final_score < -0.8) & calm,
+                final_score < -0.3,
+            ],
+            [0, 1, 4, 3],
+            default=2,
+        ).astype(np.int8)
+
+        result = dict(contributions)
+        result["Sentiment"] = np.broadcast_to(sentiment * w["sentiment"], final_score.shape)
+        result["tech_score"] = tech_score
+        result["final_score"] = final_score
+        result["Recommendation"] = recommendation
+        return result
+
+    @classmethod
+    def rank_latest(
+        cls, panel, sentiment, start=None, end=None, weights=None, params=None
+    ):
+        """
+        Score the latest bar of every ticker within [start, end].
+
+        Parameters:
+        panel: A Panel with the indicator and signal fields (see PanelIndicators / Panel.from_frames)
+        sentiment: Sentiment score per ticker, as an array in panel.tickers order or a dictionary (missing tickers score 0), or a (dates x tickers) array (e.g. SentimentIndex.history) read at each ticker's latest bar
+        start, end: Date range (None for unbounded); the ATR threshold of each ticker is the 75% quantile of its ATR in that range
+        params: RSI/Stochastic thresholds (see FeatureEngineer.DEFAULT_PARAMS), normally the ones the panel signals were built with
+
+        Returns:
+        A DataFrame with one row per ticker that has data in the range: Ticker, Date, Close, RSI, ATR, Sentiment, the contributions, Score and Recommendation
+        """
+        if isinstance(sentiment, dict):
+            sentiment = [sentiment.get(ticker, 0.0) for ticker in panel.tickers]
+        sentiment = np.asarray(sentiment, dtype=float)
+
+        rows = DateIndex.rows(panel.dates, start, end)
+        listed = ~np.isnan(panel["Close"][rows])
+        keep = np.flatnonzero(listed.any(axis=0))
+        listed = listed[:, keep]
+
+        # Last row with a bar, per ticker (only tickers with data in the range are kept)
+        last = (
+            len(listed) - 1 - np.argmax(listed[::-1], axis=0) if len(keep) else keep
+        )
+
+        def latest(field):
+            return panel[field][rows][last, keep]
+
+        signals = {
+            field: latest(field)
+            for field in [
+                "Close",
+                "Composite_Signal",
+                "MA_Signal",
+                "MACD_Cross",
+                "RSI",
+                "Stoch_%K",
+                "Stoch_%D",
+                "ATR",
+            ]
+        }
+        atr_threshold = (
+            np.nanquantile(panel["ATR"][rows][:, keep], 0.75, axis=0)
+            if len(keep)
+            else np.empty(0)
+        )
+        if sentiment.ndim == 2:
+            sentiment = sentiment[rows][last, keep]
+        else:
+            sentiment = np.broadcast_to(sentiment, len(panel.tickers))[keep]
+        scored = cls.score(signals, sentiment, atr_threshold, weights, params)
+
+        return pd.DataFrame(
+            {
+                "Ticker": [panel.tickers[j] for j in keep],
+                "Date": panel.dates[rows][last],
+                "Close": signals["Close"],
+                "RSI": signals["RSI"],
+                "ATR": signals["ATR"],
+                "Sentiment": sentiment,
+                "Composite": scored["Composite"],
+                "MA": scored["MA"],
+                "MACD": scored["MACD"],
+                "RSI Contribution": scored["RSI"],
+                "Stochastic": scored["Stochastic"],
+                "Score": scored["final_score"],
+                "Recommendation": pd.Categorical.from_codes(
+                    scored["Recommendation"], dtype=cls.RECOMMENDATION_DTYPE
+                ),
+            }
+        )
+
+    @classmethod
+    def score_history(cls, panel, sentiment, atr_threshold, weights=None, params=None):
+        """
+        Score every bar of every ticker of the panel at once.
+        sentiment and atr_threshold may be scalars, one value per ticker or full (dates x tickers) arrays (e.g. a time aligned sentiment index).
+        Returns the dictionary of (dates x tickers) arrays produced by score.
+        """
+        return cls.score(panel, sentiment, atr_threshold, weights, params)
@@ -0,0 +1,555 @@
+"""
+The code below is the stock sentiment model of Notebooks/stock_sentiment_analysis.ipynb as a module, so the dashboard can use a fitted model instead of training one on every run.
+
+Train (or retrain) the model and save it from the Main directory with:
+    python sentiment_analysis.py train [--data PATH] [--model PATH]
+
+Print the per-ticker sentiment scores of the corpus (read in chunks) with:
+    python sentiment_analysis.py scores [--data PATH] [--model PATH] [--chunk-size N] [TICKER ...]
+
+With --streaming both commands use the out-of-core StreamingSentimentAnalyzer instead, for corpora larger than memory.
+"""
+
+import argparse
+import os
+import re
+import time
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS, HashingVectorizer, TfidfVectorizer
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
+from sklearn.model_selection import train_test_split
+from data_cache import ColumnarCache
+
+
+class TickerMatcher:
+    """
+    TickerMatcher class finds the tickers mentioned in texts: one regular expression pass collects the candidate words, and each candidate is a single hash lookup.
+    Class Methods:
+    1. __init__(universe=None, aliases=None, stop_words=(), lowercase_min=4): universe is the set of known tickers, aliases maps a ticker to other symbols it is mentioned under. Without a universe every candidate that is not a stop word is a ticker (like the notebook's extract_tickers).
+    2. extract(text): Returns the tickers mentioned in one text, in order of appearance (a ticker mentioned twice appears twice).
+    3. mentions(texts): Returns a DataFrame with one row per mention in a batch of texts: Row (position of the text in the batch) and Ticker.
+
+    Without a universe the candidates are the notebook's: 2 to 5 letter words of the upper-cased text.
+    With a universe the candidates keep their case and may be 1 to 5 letters with a class suffix (F, T, BRK.B), and a candidate counts when it is a symbol of the universe and
+    - it is a cashtag ($AAPL, $aapl), or
+    - it is not a stop word and is written in upper case (CAT), or has at least lowercase_min letters (aapl, nflx: the sentiment corpus writes most tickers in lower case).
+    So ordinary words (all, now, it, on, cat) are not mentions of ALL, NOW, IT, ON or CAT, which only count as cashtags or, when not stop words, in upper case. lowercase_min=None ignores lower case mentions.
+    """
+
+    PATTERN = re.compile(r'\b[A-Z]{2,5}\b')
+    SYMBOL_PATTERN = re.compile(r'(?<![\w.$])\$?[A-Za-z]{1,5}(?:\.[A-Za-z]{1,2})?(?!\w)')
+
+    def __init__(self, universe=None, aliases=None, stop_words=(), lowercase_min=4):
+        self.stop_words = frozenset(stop_words)
+        self.lowercase_min = lowercase_min
+        self.symbols = None
+        if universe is not None:
+            self.symbols = {}
+            for ticker in universe:
+                self.symbols[ticker] = ticker
+                for symbol in (aliases or {}).get(ticker, []):
+                    self.symbols[symbol] = ticker
+
+    def _counts(self, candidate, symbol):
+        """Helper telling whether a universe candidate (as written, and its upper-cased symbol) is a mention"""
+        if candidate.startswith("$"):
+            return True
+        if symbol in self.stop_words:
+            return False
+        return candidate == symbol or (self.lowercase_min is not None and len(candidate) >= self.lowercase_min)
+
+    def extract(self, text):
+        if self.symbols is None:
+            candidates = self.PATTERN.findall(text.upper())
+            return [word for word in candidates if word not in self.stop_words]
+        tickers = []
+        for candidate in self.SYMBOL_PATTERN.findall(text):
+            symbol = candidate.lstrip("$").upper()
+            if symbol in self.symbols and self._counts(candidate, symbol):
+                tickers.append(self.symbols[symbol])
+        return tickers
+
+    def mentions(self, texts):
+        texts = pd.Series(texts, dtype=object).reset_index(drop=True).fillna("")
+        if self.symbols is None:
+            candidates = texts.str.upper().str.findall(self.PATTERN).explode().dropna()
+            tickers = candidates[~candidates.isin(self.stop_words)]
+        else:
+            candidates = texts.str.findall(self.SYMBOL_PATTERN).explode().dropna()
+            symbols = candidates.str.lstrip("$").str.upper()
+            known = symbols.isin(self.symbols.keys())
+            candidates, symbols = candidates[known], symbols[known]
+            counted = candidates.str.startswith("$") | (
+                ~symbols.isin(self.stop_words)
+                & ((candidates == symbols) | (candidates.str.len() >= (self.lowercase_min or np.inf)))
+            )
+            tickers = symbols[counted].map(self.symbols)
+        return pd.DataFrame(
+            {"Row": tickers.index.to_numpy(dtype=np.int64), "Ticker": tickers.to_numpy(dtype=object)}
+        )
+
+
+class SentimentCounts:
+    """
+    SentimentCounts class keeps running Positive, Negative, Count and Total (sum of the sentiment values) per ticker, so a corpus can be aggregated chunk by chunk in memory proportional to the number of tickers, not of texts.
+    Class Methods:
+    1. update(tickers, sentiments): Adds one mention per element (a ticker and its sentiment value; positive values count as Positive, negative ones as Negative).
+    2. merge(other): Adds the counts of another SentimentCounts, e.g. one aggregated by another process.
+    3. frame(): Returns the counts as a DataFrame with Ticker, Positive, Negative, Count and Total, sorted by ticker.
+    """
+
+    COLUMNS = ["Positive", "Negative", "Count", "Total"]
+
+    def __init__(self):
+        self.counts = pd.DataFrame(columns=self.COLUMNS, dtype=float)
+
+    def _add(self, counts):
+        """Helper adding a DataFrame of counts indexed by ticker"""
+        self.counts = counts if self.counts.empty else self.counts.add(counts, fill_value=0)
+
+    def update(self, tickers, sentiments):
+        sentiments = np.asarray(sentiments, dtype=float)
+        if len(sentiments) == 0:
+            return
+        chunk = pd.DataFrame(
+            {
+                "Positive": sentiments > 0,
+                "Negative": sentiments < 0,
+                "Count": 1,
+                "Total": sentiments,
+            },
+            index=np.asarray(tickers, dtype=object),
+        )
+        self._add(chunk.groupby(level=0, sort=False).sum().astype(float))
+
+    def merge(self, other):
+        if not other.counts.empty:
+            self._add(other.counts)
+        return self
+
+    def frame(self):
+        counts = self.counts.sort_index()
+        return pd.DataFrame(
+            {
+                "Ticker": counts.index.to_numpy(dtype=object),
+                "Positive": counts["Positive"].to_numpy(dtype=np.int64),
+                "Negative": counts["Negative"].to_numpy(dtype=np.int64),
+                "Count": counts["Count"].to_numpy(dtype=np.int64),
+                "Total": counts["Total"].to_numpy(dtype=float),
+            }
+        )
+
+
+class StockSentimentAnalyzer:
+    """
+    StockSentimentAnalyzer class analyzes the sentiment of stock-related text data with TF-IDF features and a Logistic Regression classifier.
+    Class Methods:
+    1. extract_tickers(text) / ticker_matcher(universe=None): Extracts stock tickers from text data / returns the TickerMatcher for a known universe of tickers (with STOP_WORDS, the COMMON_WORDS and the English stop words, which only count as cashtags).
+    2. preprocess_text(text) / preprocess_texts(texts): Cleans and preprocesses one text / a Series of texts.
+    3. train_model(df): Trains the sentiment model on a dataset with Text and Sentiment columns and returns the test accuracy.
+    4. analyze_stock_sentiments(df, universe=None, chunk_size=100000): Analyzes the sentiment of each stock ticker in a dataset, in one pass over chunks of chunk_size texts.
+    5. predict_sentiment(text, batch_size=10000): Predicts the sentiment of one text (a dictionary) or of a list/Series of texts (a DataFrame), transforming batch_size texts at a time into one sparse matrix.
+    6. generate_recommendations(sentiment_summary, top_n=5): Generates top stock recommendations based on sentiment analysis.
+    7. read_chunks(source, chunk_size=100000) / score_stream(source, tickers=None, chunk_size=100000): Reads a corpus chunk by chunk (e.g. a CSV with read_csv(chunksize=...)) / scores it into running per ticker SentimentCounts.
+    8. ticker_scores(texts, tickers, batch_size=10000): Returns the predicted Positive, Negative, Count and Sentiment Score (-1 to 1) of every ticker mentioned in texts.
+    9. save(model_path=None) / load(model_path=None): Writes / reads the fitted vectorizer and model (default: Datasets/.models/sentiment_model.joblib).
+    10. load_or_train(data_path=None, model_path=None): Class method returning the saved model, training and saving it first when there is none or it was trained on another version of the data.
+
+    The model is trained on Datasets/Sentiment Data/stock_sentiment_data.csv (Text, and Sentiment 1 for positive and -1 for negative).
+    About the data: Stock-Market Sentiment Dataset from Kaggle (link-> https://www.kaggle.com/datasets/yash612/stockmarket-sentiment-dataset)
+    """
+
+    # Tickers that are mentioned under an older symbol in the corpus (the Kaggle tweets predate these symbols)
+    TICKER_ALIASES = {"META": ["FB"], "GOOGL": ["GOOG"]}
+    MODEL_FILE = "sentiment_model.joblib"
+    COMMON_WORDS = {'THE', 'AND', 'FOR', 'ARE', 'BUT', 'NOT', 'YOU', 'ALL', 'CAN', 'HER', 'WAS', 'ONE', 'OUR', 'HAD', 'HAS', 'HIS', 'TWO', 'NOW', 'WAY', 'WHO', 'ITS', 'NEW', 'USE', 'MAN', 'DAY', 'GET', 'OWN', 'SAY', 'SHE', 'HOW', 'HIM', 'OLD', 'SEE', 'MAY', 'OUT', 'TOP', 'PUT', 'END', 'WHY', 'TRY', 'GOD', 'SIX', 'DOG', 'EAT', 'AGO', 'SIT', 'FUN', 'BAD', 'YES', 'YET', 'ARM', 'FAR', 'OFF', 'BAG', 'BIG', 'BOX', 'CUT', 'FEW', 'LOT', 'RUN', 'SET', 'WIN', 'LET', 'RED', 'HOT', 'BIT', 'GOT', 'TOO', 'ADD', 'MAP', 'CAR', 'JOB', 'WAR', 'LAW', 'AGE', 'BOY', 'DID', 'FIX', 'OIL', 'SUN', 'ART', 'BED', 'EYE', 'FLY', 'GUN', 'HIE', 'JOY', 'KEY', 'LAY', 'MOM', 'PAY', 'ROW', 'TEA', 'VAN', 'ZIP'}
+    # Words that are only a ticker mention of a universe as a cashtag ($ALL, $IT)
+    STOP_WORDS = frozenset(COMMON_WORDS) | frozenset(word.upper() for word in ENGLISH_STOP_WORDS)
+
+    def __init__(self):
+        self.vectorizer = TfidfVectorizer(max_features=5000, stop_words='english', ngram_range=(1, 2))
+        self.model = LogisticRegression(random_state=42)
+        self.ticker_extractor = TickerMatcher(stop_words=self.COMMON_WORDS)
+        self.sentiment_counts = SentimentCounts()
+        self.metadata = {}
+
+    @classmethod
+    def default_paths(cls):
+        """Helper returning the default (data_path, model_path)"""
+        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        return (
+            os.path.join(base_dir, "Datasets", "Sentiment Data", "stock_sentiment_data.csv"),
+            os.path.join(base_dir, "Datasets", ".models", cls.MODEL_FILE),
+        )
+
+    @staticmethod
+    def read_chunks(source, chunk_size=100000):
+        """
+        Yield DataFrames of at most chunk_size rows (a Text column, and Sentiment and Date when the source has them) from source: a CSV path (read with read_csv(chunksize=...), never loaded whole), a DataFrame, a Series or list of texts, or an iterable of DataFrames
+        """
+        if isinstance(source, (str, os.PathLike)):
+            with pd.read_csv(
+                source, chunksize=chunk_size, usecols=lambda col: col in ("Text", "Sentiment", "Date")
+            ) as reader:
+                yield from reader
+            return
+        if isinstance(source, (pd.Series, list, tuple)):
+            source = pd.DataFrame({"Text": pd.Series(source, dtype=object).to_numpy()})
+        if isinstance(source, pd.DataFrame):
+            for start in range(0, len(source), chunk_size):
+                yield source.iloc[start : start + chunk_size]
+            return
+        yield from source
+
+    def extract_tickers(self, text):
+        """Extract stock tickers from text (every 2 to 5 letter word that is not one of the COMMON_WORDS)"""
+        return self.ticker_extractor.extract(text)
+
+    def ticker_matcher(self, universe=None):
+        """TickerMatcher for a known universe of tickers (mentions under TICKER_ALIASES symbols count for their ticker), or the open one of extract_tickers when universe is None"""
+        if universe is None:
+            return self.ticker_extractor
+        return TickerMatcher(universe, self.TICKER_ALIASES, self.STOP_WORDS)
+
+    def preprocess_text(self, text):
+        """
+        Clean and preprocess text
+        1. Removes user mentions (e.g., @username) and URLs from the text.
+        2. Removes non-alphabetic characters (except spaces) from the text.
+        3. Joins split words back together with a single space.
+        4. Converts the text to lowercase.
+        """
+        # Remove user mentions and URLs
+        text = re.sub(r'@\w+', '', text)
+        text = re.sub(r'http\S+', '', text)
+        text = re.sub(r'[^a-zA-Z\s]', ' ', text)
+        text = ' '.join(text.split())
+        return text.lower()
+
+    @staticmethod
+    def preprocess_texts(texts):
+        """Same cleaning as preprocess_text for a whole Series of texts, with pandas string methods instead of a Python loop"""
+        texts = pd.Series(texts, dtype=object).fillna("")
+        return (
+            texts.str.replace(r'@\w+', '', regex=True)
+            .str.replace(r'http\S+', '', regex=True)
+            .str.replace(r'[^a-zA-Z\s]', ' ', regex=True)
+            .str.split()
+            .str.join(' ')
+            .str.lower()
+        )
+
+    def train_model(self, df):
+        """Training the sentiment analysis model with LogisticRegression"""
+        print("Training sentiment analysis model...")
+
+        # Preprocess texts and extract features
+        X = self.vectorizer.fit_transform(self.preprocess_texts(df['Text']))
+        y = df['Sentiment']
+
+        # Split data
+        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+
+        # Train model
+        self.model.fit(X_train, y_train)
+
+        # Evaluate model
+        y_pred = self.model.predict(X_test)
+        accuracy = accuracy_score(y_test, y_pred)
+        print(f"Model Accuracy: {accuracy:.3f}")
+        print("\nClassification Report:")
+        print(classification_report(y_test, y_pred))
+        print("Confusion Matrix (rows: actual, columns: predicted):")
+        print(confusion_matrix(y_test, y_pred))
+
+        self.metadata = {
+            "accuracy": accuracy,
+            "rows": len(df),
+            "sklearn": sklearn.__version__,
+            "trained": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        return accuracy
+
+    def analyze_stock_sentiments(self, df, universe=None, chunk_size=100000):
+        """
+        Analyze sentiment for each stock ticker.
+        df is a DataFrame with Text and Sentiment columns, or any source of read_chunks (e.g. the path of a CSV larger than memory).
+        The texts are matched and counted chunk_size rows at a time (TickerMatcher, SentimentCounts), so memory grows with the number of tickers, not of texts; universe restricts the tickers to a known set.
+        """
+        print("Analyzing stock sentiments...")
+
+        matcher = self.ticker_matcher(universe)
+        self.sentiment_counts = SentimentCounts()
+        for chunk in self.read_chunks(df, chunk_size):
+            mentions = matcher.mentions(chunk['Text'])
+            sentiments = chunk['Sentiment'].to_numpy()[mentions['Row'].to_numpy()]
+            self.sentiment_counts.update(mentions['Ticker'], sentiments)
+
+        counts = self.sentiment_counts.frame()
+        if len(counts) == 0:
+            print("No stock tickers found in the data.")
+            return pd.DataFrame()
+
+        # Aggregate sentiment by ticker
+        sentiment_summary = pd.DataFrame({
+            'ticker': counts['Ticker'],
+            'mention_count': counts['Count'],
+            'avg_sentiment': (counts['Total'] / counts['Count']).round(3),
+            'total_sentiment': counts['Total'].round(3),
+            'text_count': counts['Count'],
+        })
+
+        # Filter tickers with at least 2 mentions
+        sentiment_summary = sentiment_summary[sentiment_summary['mention_count'] >= 2]
+
+        return sentiment_summary.sort_values('avg_sentiment', ascending=False)
+
+    def _probabilities(self, texts, batch_size=10000):
+        """Helper returning the (negative, positive) class probabilities of texts, batch_size texts per sparse matrix"""
+        texts = pd.Series(texts, dtype=object).reset_index(drop=True)
+        negative_col = list(self.model.classes_).index(-1)
+        positive_col = list(self.model.classes_).index(1)
+        negative = np.empty(len(texts))
+        positive = np.empty(len(texts))
+        for start in range(0, len(texts), batch_size):
+            batch = self.vectorizer.transform(
+                self.preprocess_texts(texts.iloc[start : start + batch_size])
+            )
+            probability = self.model.predict_proba(batch)
+            negative[start : start + batch_size] = probability[:, negative_col]
+            positive[start : start + batch_size] = probability[:, positive_col]
+        return negative, positive
+
+    def predict_sentiment(self, text, batch_size=10000):
+        """
+        Predict sentiment for new text.
+        A single string returns a dictionary (prediction, confidence, probabilities); a list or Series of texts returns a DataFrame with Prediction, Confidence, Negative and Positive columns, one row per text.
+        """
+        single = isinstance(text, str)
+        negative, positive = self._probabilities([text] if single else text, batch_size)
+        # Ties go to the first class (-1), like LogisticRegression.predict
+        prediction = np.where(positive > negative, 1, -1)
+        confidence = np.maximum(negative, positive)
+        if single:
+            return {
+                'prediction': int(prediction[0]),
+                'confidence': confidence[0],
+                'probabilities': {'negative': negative[0], 'positive': positive[0]}
+            }
+        return pd.DataFrame(
+            {
+                'Prediction': prediction.astype(np.int8),
+                'Confidence': confidence,
+                'Negative': negative,
+                'Positive': positive,
+            },
+            index=text.index if isinstance(text, pd.Series) else None,
+        )
+
+    def generate_recommendations(self, sentiment_summary, top_n=5):
+        """Generate top 5 stock recommendations with specified columns"""
+        if len(sentiment_summary) == 0:
+            return pd.DataFrame()
+
+        # Calculate sentiment score (normalized between 0-1)
+        sentiment_summary['sentiment_score'] = (sentiment_summary['avg_sentiment'] + 1) / 2
+
+        # Calculate confidence based on mention count and sentiment consistency
+        max_mentions = sentiment_summary['mention_count'].max()
+        sentiment_summary['confidence'] = (
+            (sentiment_summary['mention_count'] / max_mentions) * 0.6 +
+            abs(sentiment_summary['avg_sentiment']) * 0.4
+        )
+
+        # Sort by sentiment score (descending) and confidence (descending)
+        recommendations = sentiment_summary.sort_values(
+            ['sentiment_score', 'confidence'],
+            ascending=[False, False]
+        ).head(top_n)
+
+        # Create final output with specified column names
+        counts = self.sentiment_counts.frame().set_index('Ticker')
+        final_recommendations = pd.DataFrame({
+            'Ticker': recommendations['ticker'],
+            'Positive': recommendations['ticker'].map(counts['Positive']).fillna(0).astype(int),
+            'Negative': recommendations['ticker'].map(counts['Negative']).fillna(0).astype(int),
+            'Count': recommendations['mention_count'],
+            'Sentiment Score': recommendations['sentiment_score'].round(3),
+            'Confidence': recommendations['confidence'].round(3)
+        })
+
+        return final_recommendations.reset_index(drop=True)
+
+    def score_stream(self, source, tickers=None, chunk_size=100000):
+        """
+        Score a stream of texts with the model and fold the predictions into running per ticker counts, one chunk_size chunk at a time (see read_chunks for the sources).
+        Only the texts mentioning a ticker (of tickers, or any ticker when None) are vectorized and scored, and a text counts once per ticker however often it repeats the symbol.
+        Returns a SentimentCounts whose Total is the sum of P(positive) - P(negative) over the mentioning texts; counts of separate streams can be merged.
+        """
+        matcher = self.ticker_matcher(tickers)
+        counts = SentimentCounts()
+        for chunk in self.read_chunks(source, chunk_size):
+            texts = chunk['Text'].reset_index(drop=True)
+            mentions = matcher.mentions(texts).drop_duplicates()
+            if len(mentions) == 0:
+                continue
+            rows, position = np.unique(mentions['Row'].to_numpy(), return_inverse=True)
+            negative, positive = self._probabilities(texts.iloc[rows], chunk_size)
+            counts.update(mentions['Ticker'], (positive - negative)[position])
+        return counts
+
+    def ticker_scores(self, texts, tickers, batch_size=10000):
+        """
+        Score the texts that mention one of tickers with the model and aggregate the predictions per ticker (TICKER_ALIASES mentions count for their ticker), batch_size texts at a time.
+        texts is a list or Series of texts, or any other source of read_chunks.
+        Returns a DataFrame with Ticker, Positive and Negative (predicted mentions), Count and Sentiment Score, the mean of P(positive) - P(negative) over the texts mentioning the ticker (-1 to 1); tickers without mentions are left out.
+        """
+        scores = self.score_stream(texts, tickers, batch_size).frame()
+        scores['Sentiment Score'] = scores['Total'] / scores['Count']
+        order = {ticker: k for k, ticker in enumerate(tickers)}
+        scores = scores.sort_values('Ticker', key=lambda column: column.map(order))
+        return scores.drop(columns='Total').reset_index(drop=True)
+
+    def save(self, model_path=None):
+        """Write the fitted vectorizer and model (with their metadata) to model_path"""
+        model_path = model_path or self.default_paths()[1]
+        os.makedirs(os.path.dirname(os.path.abspath(model_path)), exist_ok=True)
+        temporary = f"{model_path}.tmp{os.getpid()}"
+        joblib.dump(
+            {"vectorizer": self.vectorizer, "model": self.model, "metadata": self.metadata},
+            temporary,
+        )
+        os.replace(temporary, model_path)
+
+    @classmethod
+    def load(cls, model_path=None):
+        """Read an analyzer written by save"""
+        state = joblib.load(model_path or cls.default_paths()[1])
+        analyzer = cls()
+        analyzer.vectorizer = state["vectorizer"]
+        analyzer.model = state["model"]
+        analyzer.metadata = state["metadata"]
+        return analyzer
+
+    @staticmethod
+    def _training_data(data_path):
+        """Helper returning what train_model is given for a data file (the whole DataFrame; the TF-IDF vocabulary needs every text)"""
+        return pd.read_csv(data_path)
+
+    @classmethod
+    def load_or_train(cls, data_path=None, model_path=None):
+        """
+        Return the saved analyzer if it was trained on the current data_path file (same path, size and mtime) with this scikit-learn version; otherwise train one on data_path, save it and return it
+        """
+        default_data, default_model = cls.default_paths()
+        data_path = data_path or default_data
+        model_path = model_path or default_model
+        source = ColumnarCache._fingerprint(data_path)
+
+        if os.path.exists(model_path):
+            try:
+                analyzer = cls.load(model_path)
+                if (
+                    analyzer.metadata.get("source") == source
+                    and analyzer.metadata.get("sklearn") == sklearn.__version__
+                ):
+                    return analyzer
+            except Exception:
+                # An unreadable model file is simply retrained
+                pass
+
+        analyzer = cls()
+        analyzer.train_model(cls._training_data(data_path))
+        analyzer.metadata["source"] = source
+        analyzer.save(model_path)
+        return analyzer
+
+
+class StreamingSentimentAnalyzer(StockSentimentAnalyzer):
+    """
+    StreamingSentimentAnalyzer class is the out-of-core variant of StockSentimentAnalyzer, for corpora that do not fit in memory.
+    Class Methods:
+    1. __init__(n_features=2**20): Uses a HashingVectorizer (stateless: no vocabulary, every chunk is transformed on its own) and an SGDClassifier with logistic loss, which can be trained with partial_fit.
+    2. train_model(source, chunk_size=50000, epochs=1, batch_size=1000): Trains on the chunks of any read_chunks source (e.g. a CSV path) with partial_fit, and returns the progressive validation accuracy (each batch is scored before it is trained on).
+    All other methods (predict_sentiment, analyze_stock_sentiments, score_stream, ticker_scores, save/load, load_or_train) are inherited; the model file is Datasets/.models/sentiment_model_streaming.joblib.
+
+    Memory stays flat whatever the corpus size: one chunk of texts, its sparse matrix and the 2**20 model weights.
+    """
+
+    MODEL_FILE = "sentiment_model_streaming.joblib"
+
+    def __init__(self, n_features=2**20):
+        super().__init__()
+        self.vectorizer = HashingVectorizer(
+            n_features=n_features, stop_words='english', ngram_range=(1, 2), alternate_sign=False
+        )
+        self.model = SGDClassifier(loss='log_loss', alpha=1e-5, random_state=42)
+
+    def train_model(self, source, chunk_size=50000, epochs=1, batch_size=1000):
+        """Out-of-core training over the chunks of source, epochs passes, with one partial_fit call per batch_size texts"""
+        print("Training streaming sentiment model...")
+        correct = seen = rows = 0
+        for epoch in range(epochs):
+            for chunk in self.read_chunks(source, chunk_size):
+                X = self.vectorizer.transform(self.preprocess_texts(chunk['Text']))
+                y = chunk['Sentiment'].to_numpy()
+                for start in range(0, len(y), batch_size):
+                    X_batch, y_batch = X[start : start + batch_size], y[start : start + batch_size]
+                    if epoch == 0:
+                        rows += len(y_batch)
+                        # Progressive validation: the first pass scores every batch before learning from it
+                        if hasattr(self.model, 'classes_'):
+                            correct += int((self.model.predict(X_batch) == y_batch).sum())
+                            seen += len(y_batch)
+                    self.model.partial_fit(X_batch, y_batch, classes=[-1, 1])
+
+        accuracy = correct / seen if seen else float('nan')
+        print(f"Progressive Accuracy: {accuracy:.3f} over {rows} texts")
+        self.metadata = {
+            "accuracy": accuracy,
+            "rows": rows,
+            "sklearn": sklearn.__version__,
+            "trained": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        return accuracy
+
+    @staticmethod
+    def _training_data(data_path):
+        """Helper returning the data file itself, so train_model streams it"""
+        return data_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the sentiment model or score tickers with it")
+    parser.add_argument("command", choices=["train", "scores"])
+    parser.add_argument("tickers", nargs="*", help="Tickers to score (default: AAPL AMZN GOOGL META NFLX)")
+    parser.add_argument("--data", default=None, help="Sentiment CSV with Text and Sentiment columns")
+    parser.add_argument("--model", default=None, help="Model file (default: Datasets/.models/sentiment_model.joblib)")
+    parser.add_argument("--streaming", action="store_true", help="Use the out-of-core StreamingSentimentAnalyzer (HashingVectorizer + SGDClassifier)")
+    parser.add_argument("--chunk-size", type=int, default=100000, help="Texts read and scored per chunk")
+    args = parser.parse_args()
+
+    analyzer_class = StreamingSentimentAnalyzer if args.streaming else StockSentimentAnalyzer
+    data_path = args.data or analyzer_class.default_paths()[0]
+    if args.command == "train":
+        start = time.perf_counter()
+        analyzer = analyzer_class()
+        analyzer.train_model(analyzer_class._training_data(data_path))
+        analyzer.metadata["source"] = ColumnarCache._fingerprint(data_path)
+        analyzer.save(args.model)
+        print(f"Trained and saved the model in {time.perf_counter() - start:.2f} s")
+        return
+
+    analyzer = analyzer_class.load_or_train(data_path, args.model)
+    tickers = args.tickers or ["AAPL", "AMZN", "GOOGL", "META", "NFLX"]
+    # The corpus is read chunk by chunk, never as a whole
+    scores = analyzer.ticker_scores(data_path, tickers, args.chunk_size)
+    print(scores.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+import numpy as np
+import pandas as pd
+
+
+class SentimentIndex:
+    """
+    SentimentIndex class keeps exponentially decayed Positive, Negative, Count and Total (sum of sentiment values) per ticker, so the sentiment of a ticker can be read as of a date instead of over a whole corpus.
+    Class Methods:
+    1. __init__(half_life=7.0, prior=1.0): Creates an empty index; a mention loses half its weight every half_life days. prior is the weight of a neutral pseudo mention, so the score of a ticker fades to 0 as its mentions age.
+    2. update(timestamp, ticker, sentiment, weight=1.0): Adds one mention in O(1).
+    3. update_many(timestamps, tickers, sentiments, weights=None): Adds a batch of mentions with array operations (same result as calling update for each).
+    4. scores(as_of, tickers=None) / score(ticker, as_of): Returns the decayed score (Total / (Count + prior), between -1 and 1) of tickers (all by default) / of one ticker as of a date.
+    5. frame(as_of): Returns Ticker, Positive, Negative, Count, Total and Score of every ticker as of a date.
+    6. merge(other): Adds the mentions of another index (e.g. one built by another process over another part of the corpus).
+    7. save(path) / load(path): Writes / reads the index as a compressed .npz file (a few float arrays, 40 bytes per ticker).
+    8. mentions(analyzer, source, tickers=None, chunk_size=100000, use_labels=False): Generator yielding one DataFrame (Date, Ticker, Sentiment) per chunk of a dated corpus (Date and Text columns), scored with a StockSentimentAnalyzer (P(positive) - P(negative)) or taken from its Sentiment labels.
+    9. ingest(frames): Adds the mentions of such DataFrames.
+    10. history(frames, dates, tickers, half_life=7.0, prior=1.0): Class method returning the (dates x tickers) score array as of every date, e.g. the per bar sentiment for RecommendationScorer.score_history / rank_latest, with cumulative sums over the dates instead of one update and score lookup per date.
+
+    Every ticker stores its sums as of its last update; a later mention first decays the sums to its own time, an earlier one is decayed to the last update instead, so mentions can be added in any order and two indices merge by decaying both to the later time and adding.
+    As of a date, a score only counts the mentions stamped at or before it.
+    """
+
+    FIELDS = ["Positive", "Negative", "Count", "Total"]
+    DAY_NS = 86400 * 10**9
+
+    def __init__(self, half_life=7.0, prior=1.0):
+        self.half_life = float(half_life)
+        self.prior = float(prior)
+        self.slots = {}
+        self.values = np.zeros((len(self.FIELDS), 16))
+        self.last = np.full(16, np.nan)
+
+    @classmethod
+    def _days(cls, timestamps):
+        """Helper converting a timestamp or an array of timestamps into days since 1970 (floats)"""
+        if np.ndim(timestamps) == 0:
+            return pd.Timestamp(timestamps).value / cls.DAY_NS
+        return pd.DatetimeIndex(timestamps).asi8 / cls.DAY_NS
+
+    def _decay(self, days):
+        """Helper returning the weight left after days"""
+        return np.exp2(-np.asarray(days, dtype=float) / self.half_life)
+
+    def _slot(self, ticker):
+        """Helper returning the column of ticker, adding it (and growing the arrays) if needed"""
+        slot = self.slots.get(ticker)
+        if slot is None:
+            slot = self.slots[ticker] = len(self.slots)
+            if slot == len(self.last):
+                self.values = np.hstack([self.values, np.zeros_like(self.values)])
+                self.last = np.append(self.last, np.full(len(self.last), np.nan))
+        return slot
+
+    @staticmethod
+    def _fields(sentiments, weights):
+        """Helper returning the weighted (Positive, Negative, Count, Total) contributions of mentions"""
+        return np.array(
+            [weights * (sentiments > 0), weights * (sentiments < 0), weights, weights * sentiments]
+        )
+
+    def update(self, timestamp, ticker, sentiment, weight=1.0):
+        slot = self._slot(ticker)
+        t = self._days(timestamp)
+        last = self.last[slot]
+        if np.isnan(last):
+            self.last[slot] = t
+        elif t > last:
+            self.values[:, slot] *= self._decay(t - last)
+            self.last[slot] = t
+        else:
+            weight = weight * self._decay(last - t)
+        self.values[:, slot] += self._fields(np.float64(sentiment), weight)
+
+    def update_many(self, timestamps, tickers, sentiments, weights=None):
+        if len(sentiments) == 0:
+            return
+        slots = np.array([self._slot(ticker) for ticker in tickers], dtype=np.int64)
+        times = self._days(timestamps)
+        sentiments = np.asarray(sentiments, dtype=float)
+        weights = np.ones(len(sentiments)) if weights is None else np.asarray(weights, dtype=float)
+
+        # New time of every touched ticker: its last update or its latest new mention
+        latest = np.full(len(self.last), -np.inf)
+        np.maximum.at(latest, slots, times)
+        touched = np.isfinite(latest)
+        new_last = np.where(touched, np.fmax(self.last, latest), self.last)
+        known = touched & ~np.isnan(self.last)
+        self.values[:, known] *= self._decay(new_last[known] - self.last[known])
+        self.last = new_last
+
+        contributions = self._fields(sentiments, weights * self._decay(new_last[slots] - times))
+        for field in range(len(self.FIELDS)):
+            self.values[field] += np.bincount(slots, contributions[field], minlength=len(self.last))
+
+    def _columns(self, tickers):
+        """Helper returning the slots of tickers (-1 for tickers never mentioned)"""
+        return np.array([self.slots.get(ticker, -1) for ticker in tickers], dtype=np.int64)
+
+    def _values_as_of(self, as_of, slots):
+        """Helper returning the (fields x tickers) sums decayed to as_of, zero for slots of -1"""
+        t = self._days(as_of)
+        last = np.where(slots >= 0, self.last[slots], t)
+        if (last > t).any():
+            raise ValueError(f"as_of {as_of} is before the last update of the index; use history for past dates")
+        values = np.where(slots >= 0, self.values[:, slots], 0.0)
+        return values * self._decay(np.nan_to_num(t - last))
+
+    def scores(self, as_of, tickers=None):
+        tickers = list(self.slots) if tickers is None else list(tickers)
+        values = self._values_as_of(as_of, self._columns(tickers))
+        return values[3] / (values[2] + self.prior)
+
+    def score(self, ticker, as_of):
+        return float(self.scores(as_of, [ticker])[0])
+
+    def frame(self, as_of):
+        tickers = sorted(self.slots)
+        values = self._values_as_of(as_of, self._columns(tickers))
+        frame = pd.DataFrame(dict(zip(self.FIELDS, values)))
+        frame.insert(0, "Ticker", tickers)
+        frame["Score"] = values[3] / (values[2] + self.prior)
+        return frame
+
+    def merge(self, other):
+        if other.half_life != self.half_life:
+            raise ValueError("Only indices with the same half life can be merged")
+        if not other.slots:
+            return self
+        tickers = list(other.slots)
+        slots = np.array([self._slot(ticker) for ticker in tickers], dtype=np.int64)
+        theirs = other._columns(tickers)
+        other_last = other.last[theirs]
+        own_last = self.last[slots]
+        new_last = np.fmax(own_last, other_last)
+        own = np.where(np.isnan(own_last), 0.0, self.values[:, slots] * self._decay(new_last - own_last))
+        self.values[:, slots] = own + other.values[:, theirs] * self._decay(new_last - other_last)
+        self.last[slots] = new_last
+        return self
+
+    def save(self, path):
+        n = len(self.slots)
+        np.savez_compressed(
+            path,
+            tickers=np.array(list(self.slots), dtype=str),
+            values=self.values[:, :n],
+            last=self.last[:n],
+            settings=np.array([self.half_life, self.prior]),
+        )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            index = cls(*data["settings"])
+            for ticker in data["tickers"]:
+                index._slot(str(ticker))
+            n = len(index.slots)
+            index.values[:, :n] = data["values"]
+            index.last[:n] = data["last"]
+        return index
+
+    @staticmethod
+    def mentions(analyzer, source, tickers=None, chunk_size=100000, use_labels=False):
+        """
+        Yield one DataFrame of mentions (Date, Ticker, Sentiment) per chunk of a dated corpus (see StockSentimentAnalyzer.read_chunks); a text counts once per ticker it mentions
+        """
+        matcher = analyzer.ticker_matcher(tickers)
+        for chunk in analyzer.read_chunks(source, chunk_size):
+            chunk = chunk.reset_index(drop=True)
+            found = matcher.mentions(chunk["Text"]).drop_duplicates()
+            if len(found) == 0:
+                continue
+            rows, position = np.unique(found["Row"].to_numpy(), return_inverse=True)
+            if use_labels:
+                values = chunk["Sentiment"].to_numpy(dtype=float)[rows]
+            else:
+                negative, positive = analyzer._probabilities(chunk["Text"].iloc[rows], chunk_size)
+                values = positive - negative
+            yield pd.DataFrame(
+                {
+                    "Date": pd.to_datetime(chunk["Date"]).to_numpy()[rows][position],
+                    "Ticker": found["Ticker"].to_numpy(),
+                    "Sentiment": values[position],
+                }
+            )
+
+    def ingest(self, frames):
+        if isinstance(frames, pd.DataFrame):
+            frames = [frames]
+        for frame in frames:
+            self.update_many(frame["Date"], frame["Ticker"], frame["Sentiment"])
+        return self
+
+    @classmethod
+    def history(cls, frames, dates, tickers, half_life=7.0, prior=1.0):
+        """
+        Scores of tickers as of every date (mentions stamped at or before it), as a (dates x tickers) array; dates must be sorted.
+        Every mention is added to the first date at or after it with the weight 2 ** ((t - d0) / half_life) relative to a reference date d0, so the decayed Count and Total of every date are a cumulative sum over dates times 2 ** (-(date - d0) / half_life).
+        The dates are cut into blocks of at most 500 half lives, each with its own d0, so those weights stay within float64; the sums at the end of a block are carried into the next one.
+        """
+        if isinstance(frames, pd.DataFrame):
+            frames = [frames]
+        columns = {ticker: j for j, ticker in enumerate(tickers)}
+        result = np.zeros((len(dates), len(tickers)))
+        frames = [frame[frame["Ticker"].isin(columns)] for frame in frames]
+        if not frames or len(dates) == 0:
+            return result
+
+        mentions = pd.concat(frames, ignore_index=True)
+        date_days = cls._days(dates)
+        days = cls._days(mentions["Date"])
+        bucket = np.searchsorted(date_days, days, side="left")
+        keep = bucket < len(dates)
+        bucket, days = bucket[keep], days[keep]
+        slots = mentions["Ticker"].map(columns).to_numpy(dtype=np.int64)[keep]
+        sentiments = mentions["Sentiment"].to_numpy(dtype=float)[keep]
+        cells = bucket * len(tickers) + slots
+
+        count = np.zeros(len(tickers))
+        total = np.zeros(len(tickers))
+        carry_day = date_days[0]
+        start = 0
+        while start < len(dates):
+            stop = int(np.searchsorted(date_days, date_days[start] + 500 * half_life, side="right"))
+            d0 = date_days[start]
+            block = (bucket >= start) & (bucket < stop)
+            weights = np.exp2((days[block] - d0) / half_life)
+            shape = (stop - start, len(tickers))
+            offset = start * len(tickers)
+            block_counts = np.bincount(cells[block] - offset, weights, shape[0] * shape[1]).reshape(shape)
+            block_totals = np.bincount(cells[block] - offset, weights * sentiments[block], shape[0] * shape[1]).reshape(shape)
+
+            decay = np.exp2(-(date_days[start:stop] - d0) / half_life)[:, None]
+            carried = np.exp2(-(date_days[start:stop] - carry_day) / half_life)[:, None]
+            counts = np.cumsum(block_counts, axis=0) * decay + count * carried
+            totals = np.cumsum(block_totals, axis=0) * decay + total * carried
+            result[start:stop] = totals / (counts + prior)
+
+            count, total, carry_day = counts[-1], totals[-1], date_days[stop - 1]
+            start = stop
+        return result
@@ -0,0 +1,145 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from technical_indicators import TechnicalIndicators
+from feature_matrix import FeatureMatrix
+
+
+class SequenceDataset:
+    """
+    SequenceDataset class builds the (samples, backcandles, features) LSTM input of Notebooks/LSTM_prediction.ipynb as a view over one contiguous float32 array instead of lists of slices.
+    Class Methods:
+    1. __init__(values, lengths=None, backcandles=30, train_fraction=0.8): Takes a 2-D array (rows x columns, the target last) holding one or more series back to back (lengths = rows per series) and indexes the windows that stay inside one series.
+    2. prepare(df): Adds the indicators and the notebook's Target (next bar's Close - Open) to a cleaned frame, drops rows with NaN and keeps FEATURES + Target.
+    3. scale(values): Min-max scales every column to [0, 1], as the notebook's MinMaxScaler, into a float32 array.
+    4. from_frame(df, backcandles=30, train_fraction=0.8) / from_frames(frames, ...): Class methods building the FeatureMatrix (FEATURES and the Next_Change target) of one cleaned frame / every frame of {ticker: frame}, re-sorted oldest first when needed, with the min-max scaler of each ticker fitted only on the rows its training windows and targets cover (scalers keeps them, e.g. to map predictions back with inverse_transform).
+    5. windows: Property returning the zero-copy sliding_window_view of every backcandles rows of the features, shape (rows - backcandles + 1, backcandles, features).
+    6. take(starts): Returns (X, y) for window start rows: views when they are consecutive, copies of only those windows otherwise.
+    7. train() / test(): Return (X, y) of the first train_fraction of every series' samples / of the rest (views for a single series).
+    8. batches(batch_size=32, subset="train", shuffle=False, seed=None): Generator yielding (X, y) batches of a subset, materializing one batch at a time.
+
+    Sample k of a series uses its rows k to k + backcandles - 1 as input and the target of row k + backcandles, as the notebook's loop does.
+    """
+
+    FEATURES = [
+        "Open",
+        "High",
+        "Low",
+        "Close",
+        "SMA_50",
+        "SMA_200",
+        "EMA_12",
+        "EMA_26",
+        "MACD",
+        "MACD_Hist",
+        "Stoch_%K",
+        "Stoch_%D",
+        "BB_Upper",
+        "BB_Lower",
+        "ATR",
+    ]
+    TARGET = "Target"
+
+    def __init__(self, values, lengths=None, backcandles=30, train_fraction=0.8):
+        self.values = np.ascontiguousarray(values, dtype=np.float32)
+        self.lengths = [len(self.values)] if lengths is None else list(lengths)
+        self.backcandles = backcandles
+        self.scalers = []
+        if sum(self.lengths) != len(self.values):
+            raise ValueError("lengths must add up to the number of rows")
+
+        train, test = [], []
+        offset = 0
+        for length in self.lengths:
+            starts = offset + np.arange(max(length - backcandles, 0))
+            limit = int(len(starts) * train_fraction)
+            train.append(starts[:limit])
+            test.append(starts[limit:])
+            offset += length
+        self.train_starts = np.concatenate(train)
+        self.test_starts = np.concatenate(test)
+
+    @classmethod
+    def prepare(cls, df):
+        """
+        Notebook dataset: indicators, Target = Close - Open of the next row, rows with NaN dropped, FEATURES and Target kept
+        """
+        df = TechnicalIndicators.calculate_all_indicators(df.copy())
+        df[cls.TARGET] = (df["Close"] - df["Open"]).shift(-1)
+        df = df.dropna().reset_index(drop=True)
+        return df[cls.FEATURES + [cls.TARGET]]
+
+    @staticmethod
+    def scale(values):
+        """
+        Min-max scaling of every column to [0, 1] (constant columns become 0), as MinMaxScaler().fit_transform
+        """
+        values = np.asarray(values, dtype=np.float64)
+        low = values.min(axis=0)
+        span = values.max(axis=0) - low
+        span[span == 0] = 1.0
+        return ((values - low) / span).astype(np.float32)
+
+    @classmethod
+    def _scaled(cls, df, backcandles, train_fraction):
+        """Helper returning the scaled matrix of one frame and its scaler, fitted on the rows of the training samples only"""
+        builder = FeatureMatrix(cls.FEATURES, "Next_Change", train_fraction)
+        # The indicators, the target and the training rows all run forward in time
+        if df["Date"].is_monotonic_increasing:
+            df = df.copy()
+        else:
+            df = df.sort_values("Date", kind="stable", ignore_index=True)
+        matrix, _ = builder.build(TechnicalIndicators.calculate_all_indicators(df))
+        samples = max(len(matrix) - backcandles, 0)
+        scaler = builder.fit(matrix, int(samples * train_fraction) + backcandles)
+        return scaler.transform(matrix), scaler
+
+    @classmethod
+    def from_frame(cls, df, backcandles=30, train_fraction=0.8):
+        return cls.from_frames({None: df}, backcandles, train_fraction)
+
+    @classmethod
+    def from_frames(cls, frames, backcandles=30, train_fraction=0.8):
+        scaled = [cls._scaled(df, backcandles, train_fraction) for df in frames.values()]
+        parts = [values for values, _ in scaled]
+        values = np.concatenate(parts) if parts else np.empty((0, len(cls.FEATURES) + 1), np.float32)
+        dataset = cls(values, [len(part) for part in parts], backcandles, train_fraction)
+        dataset.scalers = [scaler for _, scaler in scaled]
+        return dataset
+
+    @property
+    def windows(self):
+        # sliding_window_view puts the window axis last: (starts, features, backcandles) -> (starts, backcandles, features)
+        return sliding_window_view(self.values[:, :-1], self.backcandles, axis=0).transpose(0, 2, 1)
+
+    def take(self, starts):
+        """
+        (X, y) of the windows starting at the given rows; y has shape (samples, 1) like the notebook's
+        """
+        starts = np.asarray(starts, dtype=np.int64)
+        targets = self.values[:, -1:]
+        if len(starts) and starts[-1] - starts[0] == len(starts) - 1 and (np.diff(starts) == 1).all():
+            first, stop = int(starts[0]), int(starts[-1]) + 1
+            return self.windows[first:stop], targets[first + self.backcandles : stop + self.backcandles]
+        return self.windows[starts], targets[starts + self.backcandles]
+
+    def train(self):
+        return self.take(self.train_starts)
+
+    def test(self):
+        return self.take(self.test_starts)
+
+    def batches(self, batch_size=32, subset="train", shuffle=False, seed=None):
+        """
+        Yield (X, y) batches of the "train" or "test" windows (or "all"), each a float32 copy of only batch_size windows
+        """
+        if subset == "all":
+            starts = np.concatenate([self.train_starts, self.test_starts])
+        else:
+            starts = {"train": self.train_starts, "test": self.test_starts}[subset]
+        if shuffle:
+            starts = np.random.default_rng(seed).permutation(starts)
+        windows = self.windows
+        targets = self.values[:, -1:]
+        for first in range(0, len(starts), batch_size):
+            batch = starts[first : first + batch_size]
+            yield windows[batch], targets[batch + self.backcandles]
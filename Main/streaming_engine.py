@@ -0,0 +1,52 @@
+from incremental_indicators import IndicatorState
+from feature_engineering import FeatureEngineer
+
+
+class StreamingIndicatorEngine:
+    """
+    StreamingIndicatorEngine class turns a live feed of bars for one ticker into indicator values and trading signals, one bar at a time.
+    Class Methods:
+    1. __init__(ticker, state=None): Creates an engine for a ticker, optionally continuing from an IndicatorState built on its history (e.g. TechnicalIndicators.initial_state).
+    2. update(bar): Takes one OHLCV bar (dictionary or Series with Open, High, Low, Close, Volume and optionally Date) and returns a dictionary with the bar, the TechnicalIndicators columns and the FeatureEngineer signals.
+    3. replay(df): Generator that feeds the rows of a DataFrame through update, e.g. to replay a bundled CSV as if it were a live feed.
+    4. latest(): Returns the output of the most recent update (None before the first bar).
+
+    Each update costs O(1) amortized time: the indicators come from the IndicatorState ring buffers and the signals from FeatureEngineer.bar_features.
+    The engine and its state use __slots__, so a dictionary of thousands of engines (one per ticker) stays small.
+    """
+
+    __slots__ = ("ticker", "state", "last")
+
+    def __init__(self, ticker, state=None):
+        self.ticker = ticker
+        self.state = state if state is not None else IndicatorState()
+        self.last = None
+
+    def update(self, bar):
+        """
+        Add one bar and return its indicator values and signals
+        """
+        close = float(bar["Close"])
+        values = {
+            "Date": bar.get("Date"),
+            "Open": float(bar["Open"]),
+            "High": float(bar["High"]),
+            "Low": float(bar["Low"]),
+            "Close": close,
+            "Volume": bar.get("Volume"),
+        }
+        values.update(self.state.update(values["High"], values["Low"], close))
+        values.update(FeatureEngineer.bar_features(values))
+        self.last = values
+        return values
+
+    def replay(self, df):
+        """
+        Feed every row of df (oldest bar first) through update, yielding the output of each bar
+        """
+        for bar in df.to_dict("records"):
+            yield self.update(bar)
+
+    def latest(self):
+        """Output of the most recent update"""
+        return self.last
@@ -0,0 +1,85 @@
+import os
+import numpy as np
+import pandas as pd
+
+
+class SyntheticOHLCVGenerator:
+    """
+    SyntheticOHLCVGenerator class creates random but realistic daily OHLCV histories in the same layout as the bundled Nasdaq exports, so the pipeline can be benchmarked far beyond the 5 bundled tickers.
+    Class Methods:
+    1. __init__(n_tickers=5, n_years=10, seed=42, end_date="2025-06-13"): Sets the size of the universe and the history length (252 trading days per year, ending on end_date).
+    2. generate(): Returns a dictionary of raw DataFrames keyed by ticker, with Date, Close/Last, Volume, Open, High and Low columns formatted like the Nasdaq CSVs (newest bar first, "$" prices, MM/DD/YYYY dates).
+    3. write_csvs(directory): Writes the generated data as HistoricalData_<ticker>.csv files that StockDataCollector can load.
+
+    Prices follow a geometric random walk per ticker (random start price, drift and volatility); the open, high and low are drawn around the close so that Low <= Open, Close <= High holds.
+    """
+
+    TRADING_DAYS_PER_YEAR = 252
+
+    def __init__(self, n_tickers=5, n_years=10, seed=42, end_date="2025-06-13"):
+        self.n_tickers = n_tickers
+        self.n_years = n_years
+        self.seed = seed
+        self.end_date = end_date
+
+    @property
+    def n_rows(self):
+        """Number of bars per ticker"""
+        return int(self.n_years * self.TRADING_DAYS_PER_YEAR)
+
+    def _tickers(self):
+        """Helper returning synthetic ticker names (SYN0000, SYN0001, ...)"""
+        return [f"SYN{i:04d}" for i in range(self.n_tickers)]
+
+    def _arrays(self):
+        """Helper generating (dates, open, high, low, close, volume) arrays, oldest bar first, one column per ticker"""
+        rng = np.random.default_rng(self.seed)
+        rows, cols = self.n_rows, self.n_tickers
+
+        dates = pd.bdate_range(end=self.end_date, periods=rows)
+        start = rng.uniform(10, 500, cols)
+        drift = rng.normal(0.0003, 0.0002, cols)
+        vol = rng.uniform(0.01, 0.03, cols)
+        returns = rng.normal(drift, vol, (rows, cols))
+        close = start * np.exp(np.cumsum(returns, axis=0))
+
+        open_ = close * np.exp(rng.normal(0, vol / 2, (rows, cols)))
+        spread = np.abs(rng.normal(0, vol, (rows, cols))) * close
+        high = np.maximum(open_, close) + spread * rng.uniform(0, 1, (rows, cols))
+        low = np.minimum(open_, close) - spread * rng.uniform(0, 1, (rows, cols))
+        low = np.maximum(low, 0.01)
+        volume = rng.lognormal(17, 0.5, (rows, cols)).astype(np.int64)
+        return dates, open_, high, low, close, volume
+
+    def generate(self):
+        """
+        Return {ticker: raw DataFrame} in the Nasdaq export layout
+        """
+        dates, open_, high, low, close, volume = self._arrays()
+        date_strings = dates.strftime("%m/%d/%Y")[::-1]
+
+        def dollars(values):
+            return np.char.add("$", np.char.mod("%.2f", np.round(values[::-1], 2)))
+
+        data = {}
+        for j, ticker in enumerate(self._tickers()):
+            data[ticker] = pd.DataFrame(
+                {
+                    "Date": date_strings,
+                    "Close/Last": dollars(close[:, j]),
+                    "Volume": volume[::-1, j],
+                    "Open": dollars(open_[:, j]),
+                    "High": dollars(high[:, j]),
+                    "Low": dollars(low[:, j]),
+                }
+            )
+        return data
+
+    def write_csvs(self, directory):
+        """
+        Write HistoricalData_<ticker>.csv files into directory and return the directory
+        """
+        os.makedirs(directory, exist_ok=True)
+        for ticker, df in self.generate().items():
+            df.to_csv(os.path.join(directory, f"HistoricalData_{ticker}.csv"), index=False)
+        return directory
@@ -1,4 +1,7 @@
 import ta
+from incremental_indicators import IndicatorState
+from indicator_kernels import IndicatorKernels
+from instrumentation import metrics
 
 
 class TechnicalIndicators:
@@ -8,13 +11,19 @@ class TechnicalIndicators:
     1. trend_indicators(df): Calculates trend-following indicators, including Simple Moving Averages (SMA) and Exponential Moving Averages (EMA), as well as the Moving Average Convergence Divergence (MACD) indicator.
     2. momentum_indicators(df): Calculates momentum indicators, including the Relative Strength Index (RSI) and the Stochastic Oscillator.
     3. volatility_indicators(df): Calculates volatility indicators, including Bollinger Bands and the Average True Range (ATR).
-    4. calculate_all_indicators(cls, df): Calculates all technical indicators (trend, momentum, and volatility) and returns the resulting dataframe.
+    4. calculate_all_indicators(cls, df, backend="ta", params=None): Calculates all technical indicators (trend, momentum, and volatility) and returns the resulting dataframe. backend selects the ta library ("ta") or the IndicatorKernels "numpy" / "numba" kernels.
+    5. initial_state(df, params=None): Builds the IndicatorState of an existing price history for the windows of params, to be used with update_indicators.
+    6. update_indicators(state, new_rows): Extends the indicators (with the windows of the state) with newly appended bars and returns only the new rows with their indicator columns.
 
     These methods take a pandas dataframe df as input and return the modified dataframe with the calculated indicators added as new columns.
+    The windows come from DEFAULT_PARAMS (SMA 50/200, EMA 12/26, MACD signal 9, RSI 14, Stochastic 14/3, Bollinger Bands 20/2, ATR 14); pass params (e.g. {"sma_fast": 20}) to override some of them. Column names keep the default windows; calculate_all_indicators records the windows used in df.attrs["params"] (SMA_50 is the fast SMA of params["sma_fast"] bars).
+    The incremental methods (5 and 6) make an end of day update O(new bars) instead of O(history); their output matches calculate_all_indicators on the full history up to floating point tolerance.
     """
 
+    DEFAULT_PARAMS = IndicatorState.DEFAULT_PARAMS
+
     @staticmethod
-    def trend_indicators(df):
+    def trend_indicators(df, params=None):
         """
         This function calculates four trend-following indicators for a given stock price dataset (df):
 
@@ -24,15 +33,21 @@ class TechnicalIndicators:
 
         These indicators are added as new columns to the original dataframe (df).
         """
+        params = IndicatorState.parameters(params)
+
         # Moving Averages
-        df["SMA_50"] = df["Close"].rolling(window=50, min_periods=1).mean()
-        df["SMA_200"] = df["Close"].rolling(window=200, min_periods=1).mean()
-        df["EMA_12"] = df["Close"].ewm(span=12, adjust=False).mean()
-        df["EMA_26"] = df["Close"].ewm(span=26, adjust=False).mean()
+        df["SMA_50"] = df["Close"].rolling(window=params["sma_fast"], min_periods=1).mean()
+        df["SMA_200"] = df["Close"].rolling(window=params["sma_slow"], min_periods=1).mean()
+        df["EMA_12"] = df["Close"].ewm(span=params["ema_fast"], adjust=False).mean()
+        df["EMA_26"] = df["Close"].ewm(span=params["ema_slow"], adjust=False).mean()
 
         # MACD
         macd = ta.trend.MACD(
-            df["Close"], window_slow=26, window_fast=12, window_sign=9, fillna=True
+            df["Close"],
+            window_slow=params["ema_slow"],
+            window_fast=params["ema_fast"],
+            window_sign=params["macd_signal"],
+            fillna=True,
         )
         df["MACD"] = macd.macd()
         df["MACD_Signal"] = macd.macd_signal()
@@ -41,7 +56,7 @@ class TechnicalIndicators:
         return df
 
     @staticmethod
-    def momentum_indicators(df):
+    def momentum_indicators(df, params=None):
         """
         This function calculates two momentum indicators for a given stock price dataset (df):
 
@@ -50,16 +65,20 @@ class TechnicalIndicators:
 
         The results are added as new columns to the original dataframe (df): RSI, Stoch_%K, and Stoch_%D.
         """
+        params = IndicatorState.parameters(params)
+
         # RSI
-        df["RSI"] = ta.momentum.RSIIndicator(df["Close"], window=14, fillna=True).rsi()
+        df["RSI"] = ta.momentum.RSIIndicator(
+            df["Close"], window=params["rsi_window"], fillna=True
+        ).rsi()
 
         # Stochastic
         stochastic = ta.momentum.StochasticOscillator(
             high=df["High"],
             low=df["Low"],
             close=df["Close"],
-            window=14,
-            smooth_window=3,
+            window=params["stoch_window"],
+            smooth_window=params["stoch_smooth"],
             fillna=True,
         )
         df["Stoch_%K"] = stochastic.stoch()
@@ -68,7 +87,7 @@ class TechnicalIndicators:
         return df
 
     @staticmethod
-    def volatility_indicators(df):
+    def volatility_indicators(df, params=None):
         """
         This function calculates two volatility indicators for a given stock price dataset (df):
 
@@ -77,27 +96,63 @@ class TechnicalIndicators:
 
         Both indicators are added as new columns to the original dataframe (df).
         """
+        params = IndicatorState.parameters(params)
+
         # Bollinger Bands
         bb = ta.volatility.BollingerBands(
-            df["Close"], window=20, window_dev=2, fillna=True
+            df["Close"],
+            window=params["bb_window"],
+            window_dev=params["bb_dev"],
+            fillna=True,
         )
         df["BB_Upper"] = bb.bollinger_hband()
         df["BB_Lower"] = bb.bollinger_lband()
 
         # ATR
         df["ATR"] = ta.volatility.AverageTrueRange(
-            high=df["High"], low=df["Low"], close=df["Close"], window=14, fillna=True
+            high=df["High"],
+            low=df["Low"],
+            close=df["Close"],
+            window=params["atr_window"],
+            fillna=True,
         ).average_true_range()
 
         return df
 
     @classmethod
-    def calculate_all_indicators(cls, df):
+    def calculate_all_indicators(cls, df, backend="ta", params=None):
         """
         This function defines calculates and returns all technical indicators for a given pandas dataframe df.
         The function calls the earlier three created methods: trend_indicators, momentum_indicators, and volatility_indicators, each of which adds new columns to the dataframe with the corresponding indicators.
+
+        With backend="numpy" or backend="numba" the same columns are computed by IndicatorKernels instead of the ta library: the PanelIndicators array kernels, one pass per indicator (numpy), or a single fused pass compiled with Numba (numba). The fused pass only has the default windows; without Numba or with non default windows in params, backend="numba" warns (RuntimeWarning) and uses the numpy kernels.
+        The column names keep the default windows, so the windows actually used (IndicatorState.parameters(params)) are recorded in df.attrs["params"].
+        Each call is recorded as an "indicators" stage of the shared PipelineMetrics (instrumentation.py), for the ticker set with metrics.ticker().
         """
-        df = cls.trend_indicators(df)
-        df = cls.momentum_indicators(df)
-        df = cls.volatility_indicators(df)
-        return df
+        with metrics.stage("indicators") as record:
+            if backend != "ta":
+                for col, values in IndicatorKernels.compute(df, backend, params).items():
+                    df[col] = values
+            else:
+                df = cls.trend_indicators(df, params)
+                df = cls.momentum_indicators(df, params)
+                df = cls.volatility_indicators(df, params)
+            df.attrs["params"] = {**df.attrs.get("params", {}), **IndicatorState.parameters(params)}
+            return record.output(df)
+
+    @staticmethod
+    def initial_state(df, params=None):
+        """
+        This function builds the running indicator state (rolling sums, EMA seeds, Wilder averages and min/max deques) of a price history df with High, Low and Close columns.
+        params are the indicator windows df was (or will be) calculated with, as for calculate_all_indicators.
+        The returned IndicatorState can be stored (e.g. pickled) and passed to update_indicators when new bars arrive.
+        """
+        return IndicatorState.from_history(df, params)
+
+    @staticmethod
+    def update_indicators(state, new_rows):
+        """
+        This function takes the IndicatorState of the history so far and a dataframe of new bars (appended after the last row of that history).
+        It updates the state in place and returns new_rows with the SMA, EMA, MACD, RSI, Stochastic, Bollinger Band and ATR columns added, without touching the older rows.
+        """
+        return state.append(new_rows)
@@ -0,0 +1,75 @@
+"""
+This code provides a simple check of the indicator kernel backends, using the ta library as the reference oracle.
+
+1. It collects and cleans the historical data with StockDataCollector and StockDataCleaner.
+
+2. For every ticker it calculates all indicators with TechnicalIndicators.calculate_all_indicators using the "ta" backend, and again with every other available backend ("numpy", and "numba" if Numba is installed).
+
+3. It prints the timing of each backend and the largest relative difference per indicator against the ta results.
+
+4. It checks that backend="numba" only warns (RuntimeWarning) when it falls back to the numpy kernels: with non default windows (or without Numba), and not with the default windows.
+"""
+
+import time
+import warnings
+import numpy as np
+from technical_indicators import TechnicalIndicators
+from data_cleaning import StockDataCleaner
+from data_collection import StockDataCollector
+from incremental_indicators import IndicatorState
+from indicator_kernels import IndicatorKernels
+
+
+def timed(df, backend):
+    """Calculate the indicators of a copy of df with backend and return (result, milliseconds)"""
+    start = time.perf_counter()
+    result = TechnicalIndicators.calculate_all_indicators(df.copy(), backend=backend)
+    return result, (time.perf_counter() - start) * 1000
+
+
+collector = StockDataCollector()
+collector.collect_data()
+cleaned_data = StockDataCleaner.clean_all(collector)
+
+backends = [b for b in IndicatorKernels.available_backends() if b != "ta"]
+print(f"Backends: {backends}")
+
+# Warm up (Numba compiles on first use)
+for backend in backends:
+    timed(cleaned_data["AAPL"], backend)
+
+for ticker, df in cleaned_data.items():
+    oracle, oracle_ms = timed(df, "ta")
+    print(f"\n=== {ticker}: ta {oracle_ms:.1f} ms ===")
+    for backend in backends:
+        result, backend_ms = timed(df, backend)
+        worst_col, worst = None, 0.0
+        for col in IndicatorState.COLUMNS:
+            diff = ((result[col] - oracle[col]).abs() / oracle[col].abs().clip(lower=1)).max()
+            if diff >= worst:
+                worst_col, worst = col, diff
+        status = "OK" if worst < 1e-8 else "MISMATCH"
+        print(
+            f"{backend:<6} {backend_ms:7.1f} ms  max rel diff: {worst:.2e} ({worst_col})  {status}"
+        )
+
+
+def fallback_warnings(df, params):
+    """Calculate the indicators of a copy of df with backend="numba" and return the RuntimeWarnings raised"""
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        result = TechnicalIndicators.calculate_all_indicators(df.copy(), backend="numba", params=params)
+    return result, [w for w in caught if issubclass(w.category, RuntimeWarning)]
+
+
+print()
+df = cleaned_data["AAPL"]
+params = {"sma_fast": 20, "rsi_window": 10}
+_, caught = fallback_warnings(df, None)
+fused = "numba" in backends
+print(f"backend=\"numba\" with the default windows {'runs the fused kernel' if fused else 'falls back (Numba not installed)'}: "
+      f"{'OK' if len(caught) == (0 if fused else 1) else 'MISMATCH'}")
+result, caught = fallback_warnings(df, params)
+expected = TechnicalIndicators.calculate_all_indicators(df.copy(), backend="numpy", params=params)
+print(f"backend=\"numba\" with non default windows warns and uses the numpy kernels: "
+      f"{'OK' if len(caught) == 1 and all(np.array_equal(result[col], expected[col], equal_nan=True) for col in IndicatorState.COLUMNS) else 'MISMATCH'}")
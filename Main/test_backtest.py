@@ -0,0 +1,138 @@
+"""
+This code provides a simple check of the vectorized recommendation backtest.
+
+1. It collects and cleans the historical data, calculates all indicators and features per ticker (oldest bar first), and builds the backtest panel with RecommendationBacktester.prepare.
+
+2. For every ticker it replays the same trading rules bar by bar, with RecommendationScorer.get_recommendation on each row and an ATR threshold computed from the earlier bars only (np.quantile of the ATR before the bar), and compares the trades, wins and total return with RecommendationBacktester.run. It also compares the ATR threshold of every bar with that reference threshold.
+
+3. It repeats the comparison on a panel prepared with non default RSI/Stochastic thresholds, passing the same params to run and to get_recommendation, and checks that sweep with those params (on a process pool) reports the trades of run, unlike sweep with the default thresholds.
+
+4. It times a parallel sweep over the default weight grid and prints the best combinations.
+"""
+
+import time
+import numpy as np
+from data_collection import StockDataCollector
+from data_cleaning import StockDataCleaner
+from technical_indicators import TechnicalIndicators
+from feature_engineering import FeatureEngineer
+from recommendation_engine import RecommendationScorer
+from backtest import RecommendationBacktester
+
+
+def trailing_threshold(atr, i):
+    """75% quantile of the ATR values before bar i, NaN until ATR_MIN_BARS of them exist"""
+    earlier = atr[:i][~np.isnan(atr[:i])]
+    return np.quantile(earlier, 0.75) if len(earlier) >= RecommendationBacktester.ATR_MIN_BARS else np.nan
+
+
+def reference_backtest(df, params=None):
+    """Bar by bar version of RecommendationBacktester.run for one ticker (no trailing stop, zero sentiment)"""
+    position, entry, stop, prev_close, value = 0, 0.0, 0.0, 0.0, 1.0
+    trades, wins = 0, 0
+    atr = df["ATR"].to_numpy()
+    for i, (_, bar) in enumerate(df.iterrows()):
+        atr_threshold = trailing_threshold(atr, i)
+        if position != 0:
+            if position == 1 and bar["Low"] <= stop:
+                exit_price = min(bar["Open"], stop)
+            elif position == -1 and bar["High"] >= stop:
+                exit_price = max(bar["Open"], stop)
+            else:
+                exit_price = None
+            price = bar["Close"] if exit_price is None else exit_price
+            value *= 1 + position * (price / prev_close - 1)
+            if exit_price is not None:
+                trades += 1
+                wins += position * (exit_price / entry - 1) > 0
+                position = 0
+
+        recommendation = RecommendationScorer.get_recommendation(bar, 0.0, atr_threshold, params=params)[0]
+        signal = 1 if recommendation in ("Strong Buy", "Buy") else -1 if recommendation in ("Strong Sell", "Sell") else 0
+        if position != 0 and signal == -position:
+            trades += 1
+            wins += position * (bar["Close"] / entry - 1) > 0
+            position = 0
+        if position == 0 and signal != 0:
+            position, entry = signal, bar["Close"]
+            stop = bar["Stop_Loss_Long"] if signal == 1 else bar["Stop_Loss_Short"]
+        prev_close = bar["Close"]
+
+    if position != 0:
+        trades += 1
+        wins += position * (prev_close / entry - 1) > 0
+    return trades, wins, value - 1
+
+
+collector = StockDataCollector()
+collector.collect_data()
+cleaned_data = StockDataCleaner.clean_all(collector, sort_descending=False)
+featured = {
+    ticker: FeatureEngineer.create_all_features(
+        TechnicalIndicators.calculate_all_indicators(df.copy())
+    )
+    for ticker, df in cleaned_data.items()
+}
+
+panel = RecommendationBacktester.prepare(cleaned_data)
+start = time.perf_counter()
+results = RecommendationBacktester.run(panel)
+print(f"Vectorized backtest: {(time.perf_counter() - start) * 1000:.1f} ms")
+print(results.round(3).to_string(index=False))
+
+for ticker, df in featured.items():
+    row = results[results["Ticker"] == ticker].iloc[0]
+    trades, wins, total_return = reference_backtest(df)
+    same = (
+        trades == row["Trades"]
+        and wins == row["Wins"]
+        and np.isclose(total_return, row["Total Return"], rtol=1e-9)
+    )
+    print(
+        f"{ticker}: reference trades={trades} wins={wins} return={total_return:.4f}  {'OK' if same else 'MISMATCH'}"
+    )
+
+thresholds = RecommendationBacktester._atr_threshold(panel)
+for ticker, df in featured.items():
+    rows = panel.dates.get_indexer(df["Date"])
+    atr = df["ATR"].to_numpy()
+    expected = np.array([trailing_threshold(atr, i) for i in range(len(df))])
+    result = thresholds[rows, panel.tickers.index(ticker)]
+    print(f"{ticker}: ATR threshold from the earlier bars only  {'OK' if np.allclose(result, expected, equal_nan=True) else 'MISMATCH'}")
+
+params = {"rsi_oversold": 40, "rsi_overbought": 60, "stoch_oversold": 30, "stoch_overbought": 70}
+custom_panel = RecommendationBacktester.prepare(cleaned_data, params)
+custom = RecommendationBacktester.run(custom_panel, params=params)
+for ticker, df in cleaned_data.items():
+    custom_df = FeatureEngineer.create_all_features(TechnicalIndicators.calculate_all_indicators(df.copy()), params)
+    row = custom[custom["Ticker"] == ticker].iloc[0]
+    trades, wins, total_return = reference_backtest(custom_df, params)
+    same = (
+        trades == row["Trades"]
+        and wins == row["Wins"]
+        and np.isclose(total_return, row["Total Return"], rtol=1e-9)
+    )
+    print(
+        f"{ticker}, thresholds {params}: reference trades={trades} wins={wins} return={total_return:.4f}  {'OK' if same else 'MISMATCH'}"
+    )
+# Two combinations in chunks of one, so the thresholds also go through the process pool
+weights = {name: [value] for name, value in RecommendationScorer.DEFAULT_WEIGHTS.items()}
+weights["tech"] = [RecommendationScorer.DEFAULT_WEIGHTS["tech"], 0.7]
+custom_sweep = RecommendationBacktester.sweep(custom_panel, weights, max_workers=2, chunk_size=1, params=params)
+default_sweep = RecommendationBacktester.sweep(custom_panel, weights, max_workers=1)
+default_tech = RecommendationScorer.DEFAULT_WEIGHTS["tech"]
+custom_trades = custom_sweep.loc[custom_sweep["tech"] == default_tech, "Trades"].iloc[0]
+default_trades = default_sweep.loc[default_sweep["tech"] == default_tech, "Trades"].iloc[0]
+status = custom_trades == custom["Trades"].sum() and default_trades != custom_trades
+print(f"sweep with the thresholds vs run: {'OK' if status else 'MISMATCH'}")
+
+composite = RecommendationBacktester.run(panel, signal="composite")
+print("\nComposite_Signal backtest:")
+print(composite.round(3).to_string(index=False))
+
+start = time.perf_counter()
+sweep = RecommendationBacktester.sweep(panel)
+print(
+    f"\nSweep of {len(sweep)} weight combinations: {time.perf_counter() - start:.2f} s"
+)
+print(sweep.head(10).round(3).to_string(index=False))
@@ -0,0 +1,92 @@
+"""
+This code provides a simple check of the chart downsampling used by the dashboard.
+
+1. It compares ChartDownsampler.lttb with a plain Python Largest-Triangle-Three-Buckets on a random walk.
+
+2. It generates a 40 year synthetic history, cleans it and compares ChartDownsampler.ohlc with a pandas groupby aggregation for every resolution.
+
+3. It reports the number of points and the JSON size of the data behind the price line and the candlestick chart before and after downsampling.
+"""
+
+import json
+import time
+import numpy as np
+import pandas as pd
+from data_cleaning import StockDataCleaner
+from synthetic_data import SyntheticOHLCVGenerator
+from chart_downsampling import ChartDownsampler
+
+
+def reference_lttb(x, y, threshold):
+    n = len(y)
+    bucket_size = (n - 2) / (threshold - 2)
+    selected = [0]
+    a = 0
+    for i in range(threshold - 2):
+        lo = int(np.floor(i * bucket_size)) + 1
+        hi = int(np.floor((i + 1) * bucket_size)) + 1
+        next_lo = hi
+        next_hi = min(int(np.floor((i + 2) * bucket_size)) + 1, n) if i < threshold - 3 else n
+        if i == threshold - 3:
+            next_lo = n - 1
+        avg_x = sum(x[next_lo:next_hi]) / (next_hi - next_lo)
+        avg_y = sum(y[next_lo:next_hi]) / (next_hi - next_lo)
+        best, best_area = lo, -1.0
+        for j in range(lo, hi):
+            area = abs((x[a] - avg_x) * (y[j] - y[a]) - (x[a] - x[j]) * (avg_y - y[a]))
+            if area > best_area:
+                best, best_area = j, area
+        selected.append(best)
+        a = best
+    selected.append(n - 1)
+    return np.array(selected)
+
+
+rng = np.random.default_rng(1)
+for n, threshold in [(1000, 100), (5000, 1500), (10007, 333)]:
+    x = np.sort(rng.uniform(0, n, n))
+    y = np.cumsum(rng.normal(size=n))
+    result = ChartDownsampler.lttb(x, y, threshold)
+    expected = reference_lttb(list(x), list(y), threshold)
+    status = "OK" if np.array_equal(result, expected) else "MISMATCH"
+    print(f"lttb {n} -> {threshold} points: {status}")
+
+raw = SyntheticOHLCVGenerator(n_tickers=1, n_years=40).generate()
+df = StockDataCleaner.clean_data(next(iter(raw.values())), sort_descending=False)
+print(f"Synthetic history: {len(df)} bars from {df['Date'].iloc[0].date()} to {df['Date'].iloc[-1].date()}")
+
+for threshold in [20000, 2000, 500, 150, 40]:
+    bars, resolution = ChartDownsampler.ohlc(df, threshold)
+    if resolution == "Daily":
+        status = "OK" if len(bars) == len(df) else "MISMATCH"
+    else:
+        period = dict((name, freq) for name, freq, _ in ChartDownsampler.RESOLUTIONS)[resolution]
+        expected = (
+            df.groupby(df["Date"].dt.to_period(period))
+            .agg(Date=("Date", "first"), Open=("Open", "first"), High=("High", "max"), Low=("Low", "min"), Close=("Close", "last"), Volume=("Volume", "sum"))
+            .reset_index(drop=True)
+        )
+        try:
+            pd.testing.assert_frame_equal(bars.reset_index(drop=True), expected, check_dtype=False)
+            status = "OK"
+        except AssertionError as e:
+            status = f"MISMATCH {e}"
+    print(f"ohlc budget {threshold}: {resolution}, {len(bars)} bars  {status}")
+
+
+def payload_bytes(frame, columns):
+    """Size of the JSON a chart of these columns ships to the browser (dates as ISO strings, values as floats)"""
+    payload = {"Date": frame["Date"].dt.strftime("%Y-%m-%d").tolist()}
+    payload.update({col: frame[col].astype(float).tolist() for col in columns})
+    return len(json.dumps(payload))
+
+
+start = time.perf_counter()
+line = ChartDownsampler.line(df, "Close")
+bars, resolution = ChartDownsampler.ohlc(df)
+downsample_ms = (time.perf_counter() - start) * 1000
+
+ohlcv = ["Open", "High", "Low", "Close", "Volume"]
+print(f"Downsampling took {downsample_ms:.2f} ms")
+print(f"Price line: {len(df)} -> {len(line)} points, {payload_bytes(df, ['Close']) / 1024:.0f} KB -> {payload_bytes(line, ['Close']) / 1024:.0f} KB")
+print(f"Candlestick: {len(df)} -> {len(bars)} {resolution} bars, {payload_bytes(df, ohlcv) / 1024:.0f} KB -> {payload_bytes(bars, ohlcv) / 1024:.0f} KB")
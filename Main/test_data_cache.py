@@ -0,0 +1,141 @@
+"""
+This code provides a simple check of the columnar on-disk cache of cleaned ticker frames.
+
+1. It copies the bundled CSV files into a temporary folder and collects them twice with use_cache=True into a temporary cache: the first pass must write one entry per file (misses), the second must serve every file from its entry (hits) with frames equal to clean_data of the CSV, and is timed against the first.
+
+2. It checks that an entry is invalidated when its CSV changes mtime only (touch) or content and size (one price edited), that the next collect rewrites it with the new values, and that invalidate removes it.
+
+3. It corrupts entries (a truncated column file, a garbage manifest) and checks that load treats them as misses and that collect recovers by rewriting them.
+
+4. It checks that Categorical and string columns round trip through write_frame/read_frame, that mmap_mode="r" memory-maps the numeric columns, that a column of other objects is refused and that an entry holding a pickled column is a miss (nothing is loaded with allow_pickle).
+
+5. It checks that the row order of collect_data does not depend on which path (collect_data or collect_parallel oldest first) wrote the cache entries, and that get_raw_data still returns the unmodified CSV frames when the cache is enabled.
+"""
+
+import glob
+import json
+import os
+import shutil
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from data_cache import ColumnarCache
+from data_cleaning import StockDataCleaner
+from data_collection import StockDataCollector
+
+
+def report(name, ok):
+    print(f"{name}: {'OK' if ok else 'MISMATCH'}")
+
+
+def collect(data_dir, cache_dir):
+    """Collect data_dir through the cache and return (collector, milliseconds)"""
+    collector = StockDataCollector(data_dir, use_cache=True, cache_dir=cache_dir)
+    start = time.perf_counter()
+    collector.collect_data()
+    return collector, (time.perf_counter() - start) * 1000
+
+
+def same(left, right):
+    try:
+        pd.testing.assert_frame_equal(left.reset_index(drop=True), right.reset_index(drop=True))
+        return True
+    except AssertionError:
+        return False
+
+
+work_dir = tempfile.mkdtemp(prefix="data_cache_")
+data_dir = os.path.join(work_dir, "Historical Data")
+cache_dir = os.path.join(work_dir, ".cache")
+shutil.copytree(StockDataCollector().historical_data_path, data_dir)
+paths = {os.path.basename(path).split("_")[1][:-4]: path for path in sorted(glob.glob(os.path.join(data_dir, "HistoricalData_*.csv")))}
+cache = ColumnarCache(cache_dir)
+
+report("Empty cache misses every file", all(cache.load(path) is None for path in paths.values()))
+first, miss_ms = collect(data_dir, cache_dir)
+report("First collect writes one entry per file", len(os.listdir(cache_dir)) == len(paths) and all(cache.load(path) is not None for path in paths.values()))
+second, hit_ms = collect(data_dir, cache_dir)
+expected = {ticker: StockDataCleaner.clean_data(pd.read_csv(path)) for ticker, path in paths.items()}
+report("Second collect serves cleaned frames equal to clean_data of the CSV", all(same(second.get_stock_data(t), expected[t]) for t in paths))
+print(f"{len(paths)} files: {miss_ms:.1f} ms parsing and storing, {hit_ms:.1f} ms from the cache")
+
+ticker, path = next(iter(paths.items()))
+stat = os.stat(path)
+os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+report("Touched CSV (same size, new mtime) invalidates its entry", cache.load(path) is None)
+collect(data_dir, cache_dir)
+report("Next collect rewrites the entry", cache.load(path) is not None)
+
+raw = pd.read_csv(path)
+raw.loc[0, "Close/Last"] = "$12345.67"
+raw.to_csv(path, index=False)
+report("Edited CSV (new size) invalidates its entry", os.stat(path).st_size != stat.st_size and cache.load(path) is None)
+collector, _ = collect(data_dir, cache_dir)
+latest = collector.get_stock_data(ticker)
+report("Next collect picks up the edited price", latest.loc[latest["Date"].idxmax(), "Close"] == 12345.67)
+cache.invalidate(path)
+report("invalidate removes the entry", cache.load(path) is None and len(os.listdir(cache_dir)) == len(paths) - 1)
+
+entries = {t: cache._entry_dir(p) for t, p in paths.items()}
+other = [t for t in paths if t != ticker]
+column_file = os.path.join(entries[other[0]], "col_1.npy")
+with open(column_file, "r+b") as f:
+    f.truncate(os.path.getsize(column_file) // 2)
+with open(os.path.join(entries[other[1]], ColumnarCache.MANIFEST), "w") as f:
+    f.write("{not json")
+report("Truncated column file and garbage manifest are misses", cache.load(paths[other[0]]) is None and cache.load(paths[other[1]]) is None)
+collector, _ = collect(data_dir, cache_dir)
+report(
+    "Collect recovers from the corrupt entries",
+    all(cache.load(paths[t]) is not None for t in paths) and all(same(collector.get_stock_data(t), expected[t]) for t in other),
+)
+
+frame = pd.DataFrame(
+    {
+        "Close": np.arange(5.0),
+        "Signal": pd.Categorical(["Buy", "Sell", "Hold", "Buy", "Hold"], categories=["Sell", "Hold", "Buy"], ordered=True),
+        "Label": ["a", "b", "c", "d", "e"],
+    }
+)
+ColumnarCache.write_frame(os.path.join(work_dir, "frame"), frame)
+loaded, _ = ColumnarCache.read_frame(os.path.join(work_dir, "frame"))
+report("Categorical and object columns round trip", same(loaded, frame))
+mapped, _ = ColumnarCache.read_frame(os.path.join(work_dir, "frame"), mmap_mode="r", columns=["Close"])
+report("mmap_mode='r' memory-maps numeric columns", isinstance(mapped["Close"].values.base, np.memmap) or isinstance(mapped["Close"].values, np.memmap))
+
+try:
+    ColumnarCache.write_frame(os.path.join(work_dir, "objects"), pd.DataFrame({"Mixed": ["a", 1, None]}))
+    refused = False
+except TypeError:
+    refused = True
+report("A column of non string objects is refused", refused and not os.path.exists(os.path.join(work_dir, "objects")))
+entry = entries[ticker]
+collect(data_dir, cache_dir)
+manifest_path = os.path.join(entry, ColumnarCache.MANIFEST)
+with open(manifest_path) as f:
+    manifest = json.load(f)
+np.save(os.path.join(entry, "col_0.npy"), np.array([{"payload": 1}] * manifest["rows"], dtype=object), allow_pickle=True)
+manifest["columns"][0]["dtype"] = "object"
+with open(manifest_path, "w") as f:
+    json.dump(manifest, f)
+report("An entry with a pickled column is a miss", cache.load(paths[ticker]) is None)
+
+current = {ticker: StockDataCleaner.clean_data(pd.read_csv(path)) for ticker, path in paths.items()}
+cache.clear()
+StockDataCollector(data_dir, use_cache=True, cache_dir=cache_dir).collect_parallel(max_workers=1, use_processes=False, sort_descending=False)
+after_parallel, _ = collect(data_dir, cache_dir)
+cache.clear()
+after_collect, _ = collect(data_dir, cache_dir)
+report(
+    "collect_data order does not depend on the path that wrote the cache",
+    all(same(after_parallel.get_stock_data(t), current[t]) and same(after_collect.get_stock_data(t), current[t]) for t in paths),
+)
+raw = after_collect.get_raw_data()
+report(
+    "get_raw_data returns the raw CSV frames with the cache enabled",
+    sorted(raw) == sorted(os.path.basename(path) for path in paths.values())
+    and all(raw[os.path.basename(path)].equals(pd.read_csv(path)) for path in paths.values()),
+)
+
+shutil.rmtree(work_dir)
@@ -0,0 +1,86 @@
+"""
+This code provides a simple check of the fast Nasdaq cleaning path of StockDataCleaner against the generic regex/to_datetime path.
+
+1. For every bundled HistoricalData_ file it checks that the raw frame is in the Nasdaq layout (with a Close/Last or a Close column), that _clean_nasdaq gives the same frame as _clean_generic, and that clean_data gives the same frame as the generic path followed by the same sort (both sort orders).
+
+2. It checks the fallbacks of clean_data on a copy of one file:
+    - a price without the "$" prefix and a price with a thousands separator: parse_nasdaq_prices raises ValueError and clean_data falls back to the generic path (same frame as _clean_generic).
+    - invalid calendar dates (02/30/2024, 04/31/2023) and a date that is not MM/DD/YYYY: parse_nasdaq_dates raises ValueError instead of rolling over into the next month, and clean_data raises ValueError as well (the generic path's to_datetime rejects them too).
+    - non Nasdaq headers (columns reordered, an extra column, a lower case name): is_nasdaq_layout is False and clean_data equals the generic path.
+"""
+
+import os
+import pandas as pd
+from data_collection import StockDataCollector
+from data_cleaning import StockDataCleaner
+
+
+def report(name, ok):
+    print(f"{name}: {'OK' if ok else 'MISMATCH'}")
+
+
+def same(left, right):
+    try:
+        pd.testing.assert_frame_equal(left, right)
+        return True
+    except AssertionError:
+        return False
+
+
+def generic(df, sort_descending=True):
+    """The generic path followed by the sort of clean_data"""
+    df = StockDataCleaner._clean_generic(df)
+    return df.sort_values("Date", ascending=not sort_descending).reset_index(drop=True)
+
+
+def raises(function, *args):
+    try:
+        function(*args)
+    except ValueError:
+        return True
+    return False
+
+
+data_dir = StockDataCollector().historical_data_path
+raw_frames = {
+    filename: pd.read_csv(os.path.join(data_dir, filename))
+    for filename in sorted(os.listdir(data_dir))
+    if filename.startswith("HistoricalData_") and filename.endswith(".csv")
+}
+
+for filename, raw in raw_frames.items():
+    report(f"{filename}: Nasdaq layout", StockDataCleaner.is_nasdaq_layout(raw))
+    report(f"{filename}: _clean_nasdaq vs _clean_generic", same(StockDataCleaner._clean_nasdaq(raw), StockDataCleaner._clean_generic(raw)))
+    report(
+        f"{filename}: clean_data vs generic path, both sort orders",
+        all(same(StockDataCleaner.clean_data(raw, order), generic(raw, order)) for order in [True, False]),
+    )
+
+raw = next(iter(raw_frames.values()))
+
+for name, value in [("missing $", "123.45"), ("thousands separator", "$1,234.50")]:
+    edited = raw.copy()
+    edited.loc[3, "Open"] = value
+    report(f"{name}: parse_nasdaq_prices raises ValueError", raises(StockDataCleaner.parse_nasdaq_prices, edited["Open"]))
+    cleaned = StockDataCleaner.clean_data(edited)
+    report(
+        f"{name}: clean_data falls back to the generic path",
+        same(cleaned, generic(edited)) and float(cleaned.loc[cleaned["Date"] == pd.Timestamp(edited.loc[3, "Date"]), "Open"].iloc[0]) == float(value.strip("$").replace(",", "")),
+    )
+
+for value in ["02/30/2024", "04/31/2023", "2024-01-02"]:
+    edited = raw.copy()
+    edited.loc[3, "Date"] = value
+    report(f"date {value}: parse_nasdaq_dates raises ValueError", raises(StockDataCleaner.parse_nasdaq_dates, edited["Date"]))
+    report(f"date {value}: clean_data raises ValueError", raises(StockDataCleaner.clean_data, edited))
+
+renamed = {
+    "columns reordered": raw[["Date", "Open", "High", "Low", "Close/Last", "Volume"]],
+    "extra column": raw.assign(Ticker="AAPL"),
+    "lower case name": raw.rename(columns={"Volume": "volume"}),
+}
+for name, edited in renamed.items():
+    report(
+        f"{name}: not the Nasdaq layout, clean_data equals the generic path",
+        not StockDataCleaner.is_nasdaq_layout(edited) and same(StockDataCleaner.clean_data(edited), generic(edited)),
+    )
@@ -0,0 +1,88 @@
+"""
+This code provides a simple check of the DateIndex date range lookups.
+
+1. It loads and cleans the historical data newest bar first (clean_data's default) and oldest bar first.
+
+2. It checks that set_index leaves the frame it is given unchanged (index and row order) for both orders, including a frame that is already in date order, and returns the rows sorted oldest first with a DatetimeIndex.
+
+3. For a set of date ranges (unbounded, one side open, one year, a single day, a day without a bar, ranges before the first and after the last bar, and an empty range with start after end) it compares rows on the Date column and slice on the raw frame and on the set_index frame with a boolean mask of Date between start and end, for both orders.
+"""
+
+import numpy as np
+import pandas as pd
+from data_collection import StockDataCollector
+from data_cleaning import StockDataCleaner
+from date_index import DateIndex
+
+
+def report(name, ok):
+    print(f"{name}: {'OK' if ok else 'MISMATCH'}")
+
+
+collector = StockDataCollector()
+collector.collect_data()
+orders = {
+    "newest first": StockDataCleaner.clean_all(collector),
+    "oldest first": StockDataCleaner.clean_all(collector, sort_descending=False),
+}
+
+first_date = min(df["Date"].min() for df in orders["oldest first"].values())
+last_date = max(df["Date"].max() for df in orders["oldest first"].values())
+ranges = [
+    (None, None),
+    ("2022-01-01", None),
+    (None, "2021-06-30"),
+    ("2021-01-01", "2021-12-31"),
+    ("2023-03-15", "2023-03-15"),
+    ("2023-03-18", "2023-03-18"),  # a Saturday
+    (first_date - pd.Timedelta(days=400), first_date - pd.Timedelta(days=1)),
+    (last_date + pd.Timedelta(days=1), last_date + pd.Timedelta(days=400)),
+    (first_date - pd.Timedelta(days=30), first_date + pd.Timedelta(days=30)),
+    (last_date - pd.Timedelta(days=30), last_date + pd.Timedelta(days=30)),
+    ("2022-06-30", "2022-01-01"),
+]
+
+
+def label(value):
+    return "..." if value is None else f"{pd.Timestamp(value):%Y-%m-%d}"
+
+
+def mask(df, start, end):
+    selected = pd.Series(True, index=df.index)
+    if start is not None:
+        selected &= df["Date"] >= pd.Timestamp(start)
+    if end is not None:
+        selected &= df["Date"] <= pd.Timestamp(end)
+    return df[selected]
+
+
+for order, data in orders.items():
+    unchanged, sorted_ok = True, True
+    for ticker, df in data.items():
+        for frame in [df, df.sort_values("Date").reset_index(drop=True)]:
+            before = frame.copy()
+            indexed = DateIndex.set_index(frame)
+            unchanged &= frame.index.equals(before.index) and frame.equals(before)
+            sorted_ok &= (
+                isinstance(indexed.index, pd.DatetimeIndex)
+                and indexed.index.is_monotonic_increasing
+                and (indexed.index == indexed["Date"]).all()
+                and len(indexed) == len(frame)
+            )
+    report(f"{order}: set_index leaves the input frame unchanged", unchanged)
+    report(f"{order}: set_index returns the rows oldest first with a DatetimeIndex", sorted_ok)
+
+    for start, end in ranges:
+        ok, total = True, 0
+        for ticker, df in data.items():
+            expected = mask(df, start, end)
+            total += len(expected)
+            indexed = DateIndex.set_index(df)
+            expected_sorted = mask(indexed, start, end)
+            rows = DateIndex.rows(df["Date"].to_numpy(), start, end)
+            ok &= (
+                np.array_equal(df["Date"].to_numpy()[rows], expected["Date"].to_numpy())
+                and DateIndex.slice(df, start, end).equals(expected)
+                and DateIndex.slice(indexed, start, end).equals(expected_sorted)
+            )
+        report(f"{order}: rows and slice vs boolean mask, {label(start)} to {label(end)} ({total} rows)", ok)
@@ -0,0 +1,152 @@
+"""
+This code provides a simple check of the int8 Categorical trading signals of FeatureEngineer.
+
+1. It calculates the indicators of every ticker and rebuilds the signals with the original string implementation (np.where / np.select on labels), the reference.
+
+2. It checks that every signal column of create_all_features is a Categorical of SIGNAL_DTYPE with int8 codes whose labels equal the reference on every bar, that it still compares equal to the labels, and that the stop-loss levels are unchanged.
+
+3. It checks that the raw codes of the panel (PanelIndicators.create_all_features) decode with decode_signals to the same labels, and that bar_features gives the same labels on a sample of bars.
+
+4. It checks that signal_codes gives the same codes for signal columns stored as strings (older code, a CSV file), as string arrays and as Categoricals with other categories or another order, and that composite_signal, RecommendationScorer.score and Panel.from_frames accept them.
+
+5. It prints the memory of the signal columns as labels and as Categoricals.
+"""
+
+import numpy as np
+from data_collection import StockDataCollector
+from data_cleaning import StockDataCleaner
+from technical_indicators import TechnicalIndicators
+from feature_engineering import FeatureEngineer
+from panel_indicators import Panel, PanelIndicators
+from recommendation_engine import RecommendationScorer
+
+
+def report(name, ok):
+    print(f"{name}: {'OK' if ok else 'MISMATCH'}")
+
+
+def reference_features(df):
+    """The original string signals of generate_signals and composite_signal"""
+    df = df.copy()
+    df["MA_Signal"] = np.where(
+        df["SMA_50"] > df["SMA_200"],
+        "Golden Cross",
+        np.where(df["SMA_50"] < df["SMA_200"], "Death Cross", "Neutral"),
+    )
+    df["MACD_Cross"] = np.where(df["MACD"] > df["MACD_Signal"], "Bullish", "Bearish")
+    df["RSI_Signal"] = np.select(
+        [df["RSI"] < 30, df["RSI"] > 70], ["Oversold", "Overbought"], default="Neutral"
+    )
+    df["Stoch_Signal"] = np.select(
+        [
+            (df["Stoch_%K"] < 20) & (df["Stoch_%K"] > df["Stoch_%D"]),
+            (df["Stoch_%K"] > 80) & (df["Stoch_%K"] < df["Stoch_%D"]),
+        ],
+        ["Oversold", "Overbought"],
+        default="Neutral",
+    )
+    df["BB_Signal"] = np.select(
+        [df["Close"] <= df["BB_Lower"], df["Close"] >= df["BB_Upper"]],
+        ["Lower Band", "Upper Band"],
+        default="Within Bands",
+    )
+    df["Composite_Signal"] = np.where(
+        (df["RSI_Signal"] == "Oversold")
+        & (df["Stoch_Signal"] == "Oversold")
+        & (df["BB_Signal"] == "Lower Band"),
+        "Strong Buy",
+        np.where(
+            (df["RSI_Signal"] == "Overbought")
+            & (df["Stoch_Signal"] == "Overbought")
+            & (df["BB_Signal"] == "Upper Band"),
+            "Strong Sell",
+            "Neutral",
+        ),
+    )
+    df["Stop_Loss_Long"] = df["Close"] - 2 * df["ATR"]
+    df["Stop_Loss_Short"] = df["Close"] + 2 * df["ATR"]
+    return df
+
+
+collector = StockDataCollector()
+collector.collect_data()
+cleaned_data = StockDataCleaner.clean_all(collector, sort_descending=False)
+columns = FeatureEngineer.SIGNAL_COLUMNS
+
+panel = Panel.from_frames(cleaned_data)
+PanelIndicators.calculate_all_indicators(panel)
+PanelIndicators.create_all_features(panel)
+
+label_bytes, categorical_bytes = 0, 0
+for j, (ticker, df) in enumerate(sorted(cleaned_data.items())):
+    indicators = TechnicalIndicators.calculate_all_indicators(df.copy())
+    expected = reference_features(indicators)
+    featured = FeatureEngineer.create_all_features(indicators.copy())
+
+    report(
+        f"{ticker}: signal columns are int8 Categoricals of SIGNAL_DTYPE",
+        all(
+            featured[col].dtype == FeatureEngineer.SIGNAL_DTYPE
+            and featured[col].cat.codes.dtype == np.int8
+            for col in columns
+        ),
+    )
+    report(
+        f"{ticker}: decoded labels equal the string signals on every bar",
+        all((featured[col].astype(str) == expected[col]).all() for col in columns)
+        and all((featured[col] == expected[col]).all() for col in columns),
+    )
+    report(
+        f"{ticker}: stop-loss levels unchanged",
+        np.allclose(featured["Stop_Loss_Long"], expected["Stop_Loss_Long"], equal_nan=True)
+        and np.allclose(featured["Stop_Loss_Short"], expected["Stop_Loss_Short"], equal_nan=True),
+    )
+
+    rows = panel.dates.get_indexer(df["Date"])
+    report(
+        f"{ticker}: panel codes decode to the same labels",
+        all(
+            (np.asarray(FeatureEngineer.decode_signals(panel[col][rows, j])) == expected[col].to_numpy()).all()
+            for col in columns
+        ),
+    )
+    sample = expected.iloc[np.linspace(0, len(expected) - 1, 50).astype(int)]
+    report(
+        f"{ticker}: bar_features gives the same labels",
+        all(
+            all(FeatureEngineer.bar_features(bar)[col] == bar[col] for col in columns)
+            for _, bar in sample.iterrows()
+        ),
+    )
+
+    label_bytes += int(expected[columns].memory_usage(deep=True).sum())
+    categorical_bytes += int(featured[columns].memory_usage(deep=True).sum())
+
+expected_codes = {col: featured[col].cat.codes.to_numpy() for col in columns}
+variants = {
+    "strings": lambda series: series.astype(str),
+    "string arrays": lambda series: series.astype(str).to_numpy(),
+    "reordered categories": lambda series: series.cat.reorder_categories(series.cat.categories[::-1]),
+    "used categories only": lambda series: series.astype(str).astype("category"),
+}
+for name, convert in variants.items():
+    report(
+        f"signal_codes of {name}",
+        all(np.array_equal(FeatureEngineer.signal_codes(convert(featured[col])), expected_codes[col]) for col in columns),
+    )
+report(
+    "signal_codes of codes returns them unchanged",
+    np.array_equal(FeatureEngineer.signal_codes(expected_codes["RSI_Signal"]), expected_codes["RSI_Signal"]),
+)
+
+as_strings = featured.copy()
+for col in columns:
+    as_strings[col] = featured[col].astype(str)
+composite = FeatureEngineer.composite_signal(as_strings.drop(columns="Composite_Signal"))
+report("composite_signal on string columns", (composite["Composite_Signal"] == featured["Composite_Signal"]).all())
+scored, reference = (RecommendationScorer.score(frame, 0.5, frame["ATR"].median()) for frame in [as_strings, featured])
+report("RecommendationScorer.score on string columns", all(np.array_equal(scored[key], reference[key]) for key in reference))
+mixed = Panel.from_frames({"A": as_strings, "B": featured}, ["Close"] + columns)
+report("Panel.from_frames on string and Categorical columns", all(np.array_equal(mixed[col][:, 0], mixed[col][:, 1]) for col in columns))
+
+print(f"Signal columns of all tickers: {label_bytes} bytes as labels, {categorical_bytes} bytes as Categoricals")
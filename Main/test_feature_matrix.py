@@ -0,0 +1,109 @@
+"""
+This code provides a simple check of the leakage-safe feature matrix and scaling stage.
+
+1. It checks StreamingScaler against MinMaxScaler and StandardScaler fitted on the same rows, when fed in blocks of 100 rows, one row at a time and as two merged halves, and that its state round trips through JSON.
+
+2. It builds the AAPL matrix (walk-forward features, Next_Close target) from the indicator frame, fits the scaler on the training rows, and checks that changing every test row leaves the scaled training rows unchanged; the expanding walk-forward scalers must match a fit on every prefix.
+
+3. It checks that SequenceDataset.from_frame scales with the training rows only (the notebook's MinMaxScaler saw the test period and the target), that a newest first cleaned frame gives the same dataset, and that build refuses a newest first frame.
+
+4. It builds every ticker through load_or_build into a temporary cache and loads it again, checking that the second pass neither recomputes the indicators nor refits, and times both.
+"""
+
+import json
+import shutil
+import tempfile
+import time
+import numpy as np
+from sklearn.preprocessing import MinMaxScaler, StandardScaler
+from data_collection import StockDataCollector
+from data_cleaning import StockDataCleaner
+from technical_indicators import TechnicalIndicators
+from feature_matrix import FeatureMatrix, StreamingScaler
+from sequence_dataset import SequenceDataset
+from walk_forward import WalkForwardRegression
+
+
+def report(name, ok):
+    print(f"{name}: {'OK' if ok else 'MISMATCH'}")
+
+
+collector = StockDataCollector()
+collector.collect_data()
+cleaned = StockDataCleaner.clean_all(collector, sort_descending=False)
+indicators = TechnicalIndicators.calculate_all_indicators(cleaned["AAPL"].copy())
+indicators["Previous_Close"] = indicators["Close"].shift(1)
+builder = FeatureMatrix(WalkForwardRegression.FEATURES, "Next_Close")
+matrix, dates = builder.build(indicators)
+print(f"AAPL matrix: {matrix.shape} {matrix.dtype}, {str(dates[0])[:10]} to {str(dates[-1])[:10]}, contiguous {matrix.flags['C_CONTIGUOUS']}")
+
+rows = builder.train_rows(len(matrix))
+train = matrix[:rows].astype(np.float64)
+for method, reference in [("minmax", MinMaxScaler()), ("standard", StandardScaler())]:
+    expected = reference.fit(train).transform(matrix)
+    blocks = StreamingScaler(method)
+    for start in range(0, rows, 100):
+        blocks.partial_fit(train[start : start + 100])
+    single = StreamingScaler(method)
+    for row in train:
+        single.partial_fit(row)
+    merged = StreamingScaler(method).partial_fit(train[: rows // 3]).merge(StreamingScaler(method).partial_fit(train[rows // 3 :]))
+    restored = StreamingScaler.from_state(json.loads(json.dumps(blocks.state())))
+    ok = all(np.allclose(scaler.transform(matrix), expected, rtol=1e-5, atol=1e-5) for scaler in [blocks, single, merged, restored])
+    report(f"StreamingScaler {method} (blocks, single rows, merged halves, JSON state) vs scikit-learn", ok)
+    report(f"inverse_transform of the {method} target", np.allclose(blocks.inverse_transform(blocks.transform(matrix)[:, -1], -1), matrix[:, -1], rtol=1e-5))
+
+scaler = builder.fit(matrix)
+changed = matrix.copy()
+changed[rows:] *= 3.0
+report("Scaled training rows do not depend on the test rows", np.array_equal(builder.fit(changed).transform(changed[:rows]), scaler.transform(matrix[:rows])))
+print(f"Test rows outside the training range: {(scaler.transform(matrix[rows:]) > 1).any(axis=0).sum()} of {matrix.shape[1]} columns (MinMaxScaler on every row would hide this)")
+
+starts = list(range(252, len(matrix), 20))
+ok = all(
+    np.allclose(expanding.transform(matrix), StreamingScaler().partial_fit(matrix[:start]).transform(matrix), atol=1e-6)
+    for start, expanding in builder.expanding(matrix, starts)
+)
+report(f"Expanding scalers of {len(starts)} walk-forward steps vs a fit per prefix", ok)
+
+dataset = SequenceDataset.from_frame(cleaned["META"])
+fit_rows = len(dataset.train_starts) + dataset.backcandles
+meta = FeatureMatrix(SequenceDataset.FEATURES, "Next_Change").build(TechnicalIndicators.calculate_all_indicators(cleaned["META"].copy()))[0]
+expected = MinMaxScaler().fit(meta[:fit_rows].astype(np.float64)).transform(meta)
+report(f"SequenceDataset.from_frame scaled on its {fit_rows} training rows only", np.allclose(dataset.values, expected, atol=1e-6))
+newest_first = StockDataCleaner.clean_all(collector)["META"]
+report("SequenceDataset.from_frame of the newest first frame", np.array_equal(SequenceDataset.from_frame(newest_first).values, dataset.values))
+try:
+    FeatureMatrix(SequenceDataset.FEATURES, "Next_Change").build(TechnicalIndicators.calculate_all_indicators(newest_first.copy()))
+    refused = False
+except ValueError:
+    refused = True
+report("build refuses a newest first frame", refused)
+
+cache_dir = tempfile.mkdtemp(prefix="matrices_")
+cached = FeatureMatrix(WalkForwardRegression.FEATURES, "Next_Close", cache_dir=cache_dir)
+calls = []
+
+
+def compute(ticker):
+    def run():
+        calls.append(ticker)
+        df = TechnicalIndicators.calculate_all_indicators(cleaned[ticker].copy())
+        df["Previous_Close"] = df["Close"].shift(1)
+        return df
+
+    return run
+
+
+timings = []
+for attempt in range(2):
+    start = time.perf_counter()
+    results = {ticker: cached.load_or_build(ticker, {"data": "bundled"}, compute(ticker)) for ticker in cleaned}
+    timings.append((time.perf_counter() - start) * 1000)
+report("Second pass loads every ticker without recomputing", len(calls) == len(cleaned))
+loaded_matrix, loaded_dates, loaded_scaler = results["AAPL"]
+report("Cached AAPL matrix, dates and scaler", np.array_equal(loaded_matrix, matrix) and np.array_equal(loaded_dates, dates) and np.allclose(loaded_scaler.transform(matrix), scaler.transform(matrix)))
+cached.load_or_build("AAPL", {"data": "changed"}, compute("AAPL"))
+report("Another source rebuilds", calls[-1] == "AAPL" and len(calls) == len(cleaned) + 1)
+print(f"{len(cleaned)} tickers: built {timings[0]:.1f} ms, loaded {timings[1]:.1f} ms")
+shutil.rmtree(cache_dir)
@@ -0,0 +1,79 @@
+"""
+This code provides a simple check of the precomputed feature store.
+
+1. It copies the historical data into a temporary folder and builds a feature store from it with FeatureStore.build.
+
+2. For every ticker it compares the stored frame with the pipeline result (clean, calculate_all_indicators, create_all_features, indexed by date) and times a memory-mapped one year read against the full pipeline.
+
+3. It touches one source file and checks that the store reports itself as stale, then rebuilds it and checks that only the newest versions are kept.
+
+4. It adds a broken source file (empty, like a failed download) and checks that the failed ticker is listed under errors without making the store stale forever, and that a store built with custom thresholds is only fresh for its own parameters.
+"""
+
+import os
+import shutil
+import tempfile
+import time
+import pandas as pd
+from data_collection import StockDataCollector
+from data_cleaning import StockDataCleaner
+from technical_indicators import TechnicalIndicators
+from feature_engineering import FeatureEngineer
+from feature_store import FeatureStore
+from date_index import DateIndex
+
+work_dir = tempfile.mkdtemp(prefix="feature_store_")
+data_dir = os.path.join(work_dir, "Historical Data")
+shutil.copytree(StockDataCollector().historical_data_path, data_dir)
+store = FeatureStore(os.path.join(work_dir, "store"))
+
+start = time.perf_counter()
+manifest = store.build(data_dir)
+print(f"Built version {manifest['version']} in {time.perf_counter() - start:.2f} s")
+
+collector = StockDataCollector(historical_data_path=data_dir)
+collector.collect_data()
+start = time.perf_counter()
+cleaned_data = StockDataCleaner.clean_all(collector, sort_descending=False)
+expected = {
+    ticker: FeatureEngineer.create_all_features(
+        TechnicalIndicators.calculate_all_indicators(df)
+    )
+    for ticker, df in cleaned_data.items()
+}
+pipeline_ms = (time.perf_counter() - start) * 1000
+
+for ticker, df in expected.items():
+    try:
+        # The store indexes its frames by date, like DateIndex.set_index
+        pd.testing.assert_frame_equal(store.read(ticker, mmap_mode=None), DateIndex.set_index(df))
+        status = "OK"
+    except AssertionError as e:
+        status = f"MISMATCH {e}"
+    start = time.perf_counter()
+    year = store.read(ticker, "2024-01-01", "2024-12-31")
+    read_ms = (time.perf_counter() - start) * 1000
+    print(f"{ticker}: {len(year)} rows of 2024 in {read_ms:.2f} ms  {status}")
+print(f"Full pipeline for all tickers: {pipeline_ms:.1f} ms")
+
+print(f"Stale after build: {store.is_stale(data_dir)}")
+source = os.path.join(data_dir, sorted(os.listdir(data_dir))[0])
+os.utime(source, ns=(time.time_ns(), time.time_ns()))
+print(f"Stale after touching {os.path.basename(source)}: {store.is_stale(data_dir)}")
+
+store.build(data_dir, keep=1)
+print(f"Stale after rebuild: {store.is_stale(data_dir)}, versions on disk: {store.versions()}")
+
+open(os.path.join(data_dir, "HistoricalData_BROKEN.csv"), "w").close()
+manifest = store.build(data_dir, keep=1)
+print(
+    f"Broken source file: errors {list(manifest['errors'])}, stale after build {store.is_stale(data_dir)}  "
+    f"{'OK' if list(manifest['errors']) == ['BROKEN'] and not store.is_stale(data_dir) else 'MISMATCH'}"
+)
+
+params = {"rsi_oversold": 25, "rsi_overbought": 75}
+manifest = store.build(data_dir, params=params, keep=1)
+status = not store.is_stale(data_dir, manifest["params"]) and store.is_stale(data_dir) and manifest["params"]["rsi_oversold"] == 25
+print(f"Custom thresholds: fresh for the stored params, stale for the defaults  {'OK' if status else 'MISMATCH'}")
+
+shutil.rmtree(work_dir, ignore_errors=True)
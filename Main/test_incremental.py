@@ -0,0 +1,51 @@
+"""
+This code provides a simple check of the incremental indicator API against a full recompute.
+
+1. It collects and cleans the historical data with StockDataCollector and StockDataCleaner, oldest bar first.
+
+2. For every ticker it calculates all indicators over the full history with TechnicalIndicators.calculate_all_indicators.
+
+3. It builds the indicator state from all but the last 30 bars with TechnicalIndicators.initial_state, then appends those 30 bars with TechnicalIndicators.update_indicators.
+
+4. It prints the largest absolute difference per indicator between the appended rows and the full recompute.
+
+5. It repeats the comparison with non default windows passed as params to calculate_all_indicators and initial_state.
+"""
+
+from technical_indicators import TechnicalIndicators
+from data_cleaning import StockDataCleaner
+from data_collection import StockDataCollector
+from incremental_indicators import IndicatorState
+
+NEW_BARS = 30
+PARAMS = {
+    "sma_fast": 20,
+    "sma_slow": 100,
+    "ema_fast": 8,
+    "ema_slow": 21,
+    "macd_signal": 5,
+    "rsi_window": 9,
+    "stoch_window": 10,
+    "stoch_smooth": 4,
+    "bb_window": 30,
+    "bb_dev": 2.5,
+    "atr_window": 10,
+}
+
+collector = StockDataCollector()
+collector.collect_data()
+cleaned_data = StockDataCleaner.clean_all(collector, sort_descending=False)
+
+for params in [None, PARAMS]:
+    for ticker, df in cleaned_data.items():
+        full = TechnicalIndicators.calculate_all_indicators(df.copy(), params=params)
+
+        state = TechnicalIndicators.initial_state(df.iloc[:-NEW_BARS], params)
+        new_rows = TechnicalIndicators.update_indicators(state, df.iloc[-NEW_BARS:])
+
+        label = "default windows" if params is None else "custom windows"
+        print(f"\n=== {ticker}: last {NEW_BARS} bars, incremental vs full, {label} ===")
+        for col in IndicatorState.COLUMNS:
+            diff = (new_rows[col] - full[col].iloc[-NEW_BARS:]).abs().max()
+            status = "OK" if diff < 1e-8 else "MISMATCH"
+            print(f"{col:<12} max diff: {diff:.2e}  {status}")
@@ -0,0 +1,100 @@
+"""
+This code provides a simple check of the pipeline instrumentation (instrumentation.py).
+
+1. It checks that a stage records its time, rows and bytes, that the ticker set with metrics.ticker() is used, and that an exception is recorded as an error and raised again.
+
+2. It runs the pipeline once and compares the rows recorded per ticker for the collect, clean, indicators and features stages with the lengths of the frames, then checks the Prometheus text export, the JSON log lines and the /metrics endpoint.
+
+3. It runs the pipeline in profile mode and checks the profile files, then times the cost of an empty stage and the pipeline with and without the profiler.
+"""
+
+import json
+import os
+import tempfile
+import time
+import urllib.request
+import numpy as np
+import pandas as pd
+from instrumentation import PipelineMetrics, metrics, run_pipeline
+
+collector = PipelineMetrics()
+with collector.stage("build", "AAA") as record:
+    record.output(pd.DataFrame({"Close": np.arange(10.0)}))
+with collector.ticker("BBB"):
+    with collector.stage("build") as record:
+        record.output(np.zeros((4, 3)))
+try:
+    with collector.stage("build", "CCC"):
+        raise ValueError("bad bar")
+except ValueError:
+    raised = True
+else:
+    raised = False
+frame = collector.frame().set_index("Ticker")
+status = (
+    frame.at["AAA", "Rows"] == 10
+    and frame.at["BBB", "Rows"] == 4
+    and frame.at["BBB", "Bytes"] == 96
+    and frame.at["CCC", "Errors"] == 1
+    and raised
+    and collector.records[-1].error == "ValueError: bad bar"
+)
+print(f"Stage records, ticker context and errors: {'OK' if status else 'MISMATCH'}")
+print(frame.to_string())
+
+log_path = os.path.join(tempfile.mkdtemp(), "metrics.jsonl")
+metrics.reset()
+metrics.log_path = log_path
+start = time.perf_counter()
+featured = run_pipeline()
+pipeline_s = time.perf_counter() - start
+metrics.log_path = None
+
+frame = metrics.frame()
+mismatches = []
+for stage in ["collect", "clean", "indicators", "features"]:
+    rows = frame[frame["Stage"] == stage].set_index("Ticker")["Rows"]
+    for ticker, df in featured.items():
+        if rows.get(ticker) != len(df):
+            mismatches.append((stage, ticker, rows.get(ticker), len(df)))
+print(f"\nRows per stage and ticker vs frame lengths ({len(featured)} tickers): {'OK' if not mismatches else f'MISMATCH {mismatches[:5]}'}")
+print(frame.groupby("Stage")[["Calls", "Seconds", "Rows", "Bytes", "Errors"]].sum().round(4).to_string())
+
+text = metrics.prometheus()
+samples = [line for line in text.splitlines() if line and not line.startswith("#")]
+expected = len(metrics.totals) * len(PipelineMetrics.TOTALS)
+status = len(samples) == expected and all(line.startswith(PipelineMetrics.PREFIX) for line in samples)
+print(f"\nPrometheus export: {'OK' if status else 'MISMATCH'} ({len(samples)} samples, expected {expected})")
+print("\n".join(text.splitlines()[:4]))
+
+with open(log_path) as f:
+    lines = [json.loads(line) for line in f]
+status = len(lines) == int(frame["Calls"].sum()) and set(lines[0]) == set(metrics.records[0].__slots__)
+print(f"JSON log lines: {'OK' if status else 'MISMATCH'} ({len(lines)} lines)")
+
+server = metrics.serve(port=0)
+with urllib.request.urlopen(f"http://127.0.0.1:{server.server_address[1]}/metrics") as response:
+    body = response.read().decode("utf-8")
+server.shutdown()
+print(f"/metrics endpoint: {'OK' if body == metrics.prometheus() else 'MISMATCH'}")
+
+profile_dir = tempfile.mkdtemp()
+metrics.reset()
+start = time.perf_counter()
+with metrics.profile(profile_dir):
+    run_pipeline()
+profiled_s = time.perf_counter() - start
+files = sorted(os.listdir(profile_dir))
+allocated = metrics.frame().query("Stage == 'indicators'")["Allocated"]
+status = files == ["profile.prof", "profile.txt", "tracemalloc.txt"] and (allocated != 0).all()
+print(f"\nProfile mode files and allocated bytes per stage: {'OK' if status else 'MISMATCH'} ({', '.join(files)})")
+
+empty = PipelineMetrics()
+count = 100000
+start = time.perf_counter()
+for _ in range(count):
+    with empty.stage("noop", "AAA"):
+        pass
+stage_us = (time.perf_counter() - start) / count * 1e6
+print(f"Empty stage: {stage_us:.2f} us per run")
+print(f"Pipeline: {pipeline_s:.2f} s instrumented, {profiled_s:.2f} s with cProfile and tracemalloc")
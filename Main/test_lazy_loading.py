@@ -0,0 +1,61 @@
+"""
+This code provides a simple check of the lazy (on demand) ticker loading and its LRU memory budget.
+
+1. It checks that collect_data in lazy mode only indexes the files (nothing parsed), and that a ticker loaded on first access equals the eagerly collected one (unknown tickers give None).
+
+2. With a memory_budget of two tickers it requests tickers in a fixed order and checks the least recently used one is evicted each time, that a hit moves a ticker to the most recent end, and that the loaded bytes stay within the budget.
+
+3. It checks that a budget smaller than one ticker still keeps the most recently requested one, and that asking for all tickers returns every frame while keeping only the budget in memory.
+"""
+
+from data_collection import StockDataCollector
+
+
+def report(name, ok):
+    print(f"{name}: {'OK' if ok else 'MISMATCH'}")
+
+
+eager = StockDataCollector()
+eager.collect_data()
+tickers = eager.get_tickers()
+sizes = {ticker: int(df.memory_usage(deep=True).sum()) for ticker, df in eager.get_stock_data().items()}
+
+lazy = StockDataCollector(lazy=True)
+lazy.collect_data()
+report("Lazy collect_data only indexes the files", lazy.get_tickers() == tickers and len(lazy.stock_data) == 0)
+report("Ticker loaded on first access equals the eager one", lazy.get_stock_data(tickers[0]).equals(eager.get_stock_data(tickers[0])))
+report("Unknown ticker gives None", lazy.get_stock_data("XYZQ") is None)
+
+budget = sizes[tickers[0]] + sizes[tickers[1]]
+lru = StockDataCollector(lazy=True, memory_budget=budget)
+lru.collect_data()
+steps = [
+    (tickers[0], [tickers[0]]),
+    (tickers[1], [tickers[0], tickers[1]]),
+    (tickers[0], [tickers[1], tickers[0]]),
+    (tickers[2], [tickers[0], tickers[2]]),
+    (tickers[3], [tickers[2], tickers[3]]),
+    (tickers[2], [tickers[3], tickers[2]]),
+]
+ok = True
+for ticker, expected in steps:
+    lru.get_stock_data(ticker)
+    resident = list(lru.stock_data)
+    within = sum(lru._loaded_bytes.values()) <= budget
+    print(f"  get {ticker}: resident {resident} (expected {expected}), {sum(lru._loaded_bytes.values())} of {budget} bytes")
+    ok = ok and resident == expected and within
+report("LRU eviction order and memory budget of two tickers", ok)
+
+tiny = StockDataCollector(lazy=True, memory_budget=1)
+tiny.collect_data()
+for ticker in tickers:
+    tiny.get_stock_data(ticker)
+report("A budget below one ticker keeps the most recent one", list(tiny.stock_data) == [tickers[-1]])
+
+everything = lru.get_stock_data()
+report(
+    "get_stock_data() returns every ticker and keeps only the budget",
+    sorted(everything) == tickers
+    and all(everything[t].equals(eager.get_stock_data(t)) for t in tickers)
+    and sum(lru._loaded_bytes.values()) <= budget,
+)
@@ -0,0 +1,68 @@
+"""
+This code provides a simple check of the panel (all tickers at once) indicators.
+
+1. It builds a Panel of the cleaned tickers, where one ticker misses about 3% of its bars at random mid-series dates (trading halts) and another only trades on Mondays to Thursdays (another exchange calendar), so the panel holds dates without a bar inside their history.
+
+2. It compares every PanelIndicators column of every ticker with TechnicalIndicators (the ta library) applied to that ticker's own rows, and does the same for SharedIndicators (the parameter sweep) with non default windows.
+
+3. It times PanelIndicators on the gapped panel against the same panel without gaps.
+"""
+
+import time
+import numpy as np
+from data_collection import StockDataCollector
+from data_cleaning import StockDataCleaner
+from technical_indicators import TechnicalIndicators
+from incremental_indicators import IndicatorState
+from panel_indicators import Panel, PanelIndicators
+from parameter_sweep import SharedIndicators
+
+
+def compare(panel, data, params=None, indicators=None):
+    """Largest relative difference per ticker between the panel indicators and TechnicalIndicators on the ticker's rows"""
+    frame = panel.to_frame(IndicatorState.COLUMNS) if indicators is None else None
+    worst = {}
+    for j, ticker in enumerate(panel.tickers):
+        expected = TechnicalIndicators.calculate_all_indicators(data[ticker].copy(), params=params)
+        rows = panel.dates.get_indexer(expected["Date"])
+        diffs = []
+        for col in IndicatorState.COLUMNS:
+            result = frame.xs(ticker, level="Ticker")[col].to_numpy() if indicators is None else indicators[col][rows, j]
+            reference = expected[col].to_numpy()
+            diffs.append((np.abs(result - reference) / np.maximum(np.abs(reference), 1)).max())
+        worst[ticker] = (max(diffs), IndicatorState.COLUMNS[int(np.argmax(diffs))])
+    return worst
+
+
+collector = StockDataCollector()
+collector.collect_data()
+data = StockDataCleaner.clean_all(collector, sort_descending=False)
+tickers = sorted(data)
+rng = np.random.default_rng(0)
+gapped = dict(data)
+halted = data[tickers[0]]
+keep = rng.random(len(halted)) > 0.03
+keep[:300] = True
+gapped[tickers[0]] = halted[keep].reset_index(drop=True)
+calendar = data[tickers[1]]
+gapped[tickers[1]] = calendar[calendar["Date"].dt.dayofweek < 4].reset_index(drop=True)
+print(f"{tickers[0]}: {(~keep).sum()} halted bars, {tickers[1]}: {len(calendar) - len(gapped[tickers[1]])} Fridays missing")
+
+panel = Panel.from_frames(gapped)
+start = time.perf_counter()
+PanelIndicators.calculate_all_indicators(panel)
+gapped_ms = (time.perf_counter() - start) * 1000
+for ticker, (worst, col) in compare(panel, gapped).items():
+    print(f"PanelIndicators vs TechnicalIndicators, {ticker}: max rel diff {worst:.2e} ({col})  {'OK' if worst < 1e-8 else 'MISMATCH'}")
+
+params = {"sma_fast": 20, "sma_slow": 100, "stoch_window": 21, "stoch_smooth": 5, "bb_window": 30}
+shared = SharedIndicators(Panel.from_frames(gapped))
+shared.indicators({"stoch_window": 10})
+for ticker, (worst, col) in compare(panel, gapped, params, shared.indicators(params)).items():
+    print(f"SharedIndicators {params} vs TechnicalIndicators, {ticker}: max rel diff {worst:.2e} ({col})  {'OK' if worst < 1e-8 else 'MISMATCH'}")
+
+full = Panel.from_frames(data)
+start = time.perf_counter()
+PanelIndicators.calculate_all_indicators(full)
+full_ms = (time.perf_counter() - start) * 1000
+print(f"PanelIndicators: {gapped_ms:.1f} ms with gaps vs {full_ms:.1f} ms without")
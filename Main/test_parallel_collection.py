@@ -0,0 +1,98 @@
+"""
+This code provides a simple check of the parallel read+clean ingestion (collect_parallel) and of clean_all with max_workers.
+
+1. It copies the bundled CSV files into a temporary folder together with a broken HistoricalData_ file (empty, like a failed download), and checks that collect_parallel on processes and on threads loads every good ticker, records the broken file in errors instead of aborting, and returns frames equal to the serial collect_data + clean_all path (both sort orders). It also checks that the collector state is filled like collect_data: get_tickers lists the loaded tickers and get_raw_data returns the raw CSV of every file.
+
+2. It checks that clean_all with max_workers equals the serial clean_all, and that collect_parallel through a ColumnarCache gives the same frames on a cold and a warm cache.
+
+3. It writes a universe of 200 tickers x 10 years (copies of the bundled files under new ticker names) and times the serial path against collect_parallel with processes and threads, printing the worker count. The speedup is only reported when more than one CPU is available.
+"""
+
+import os
+import shutil
+import tempfile
+import time
+import pandas as pd
+from data_collection import StockDataCollector
+from data_cleaning import StockDataCleaner
+
+
+def report(name, ok):
+    print(f"{name}: {'OK' if ok else 'MISMATCH'}")
+
+
+def same(left, right):
+    if sorted(left) != sorted(right):
+        return False
+    try:
+        for ticker in left:
+            pd.testing.assert_frame_equal(left[ticker], right[ticker])
+        return True
+    except AssertionError:
+        return False
+
+
+def serial(data_dir, sort_descending=True):
+    collector = StockDataCollector(data_dir)
+    collector.collect_data()
+    return StockDataCleaner.clean_all(collector, sort_descending)
+
+
+work_dir = tempfile.mkdtemp(prefix="parallel_")
+data_dir = os.path.join(work_dir, "Historical Data")
+shutil.copytree(StockDataCollector().historical_data_path, data_dir)
+expected = serial(data_dir)
+raw_files = {name: pd.read_csv(os.path.join(data_dir, name)) for name in sorted(os.listdir(data_dir)) if name.endswith(".csv")}
+open(os.path.join(data_dir, "HistoricalData_BROKEN.csv"), "w").close()
+
+for use_processes in [True, False]:
+    collector = StockDataCollector(data_dir)
+    result = collector.collect_parallel(max_workers=2, use_processes=use_processes)
+    kind = "processes" if use_processes else "threads"
+    report(f"collect_parallel on {kind} records the broken file in errors", list(collector.errors) == ["HistoricalData_BROKEN.csv"])
+    report(f"collect_parallel on {kind} vs serial collect_data + clean_all", same(result, expected) and collector.get_stock_data() is result)
+    report(f"collect_parallel on {kind}: get_tickers lists the loaded tickers", collector.get_tickers() == sorted(expected))
+    report(
+        f"collect_parallel on {kind}: get_raw_data returns the raw CSVs",
+        same({name: collector.get_raw_data(name) for name in raw_files}, raw_files)
+        and same({name: df for name, df in collector.get_raw_data().items() if name in raw_files}, raw_files),
+    )
+os.remove(os.path.join(data_dir, "HistoricalData_BROKEN.csv"))
+
+oldest_first = StockDataCollector(data_dir).collect_parallel(max_workers=2, sort_descending=False)
+report("collect_parallel oldest first vs serial", same(oldest_first, serial(data_dir, sort_descending=False)))
+
+collector = StockDataCollector(data_dir)
+collector.collect_data()
+report("clean_all with max_workers vs serial clean_all", same(StockDataCleaner.clean_all(collector, max_workers=2), expected))
+
+cache_dir = os.path.join(work_dir, ".cache")
+cold = StockDataCollector(data_dir, use_cache=True, cache_dir=cache_dir).collect_parallel(max_workers=2)
+warm = StockDataCollector(data_dir, use_cache=True, cache_dir=cache_dir).collect_parallel(max_workers=2)
+report("collect_parallel through the cache, cold and warm", same(cold, expected) and same(warm, expected) and len(os.listdir(cache_dir)) == len(expected))
+
+universe_dir = os.path.join(work_dir, "Universe")
+os.makedirs(universe_dir)
+sources = sorted(name for name in os.listdir(data_dir) if name.startswith("HistoricalData_"))
+for i in range(200):
+    shutil.copy(os.path.join(data_dir, sources[i % len(sources)]), os.path.join(universe_dir, f"HistoricalData_T{i:03d}.csv"))
+workers = os.cpu_count() or 1
+timings = {}
+start = time.perf_counter()
+reference = serial(universe_dir)
+timings["serial"] = time.perf_counter() - start
+for use_processes in [True, False]:
+    start = time.perf_counter()
+    result = StockDataCollector(universe_dir).collect_parallel(use_processes=use_processes)
+    timings["processes" if use_processes else "threads"] = time.perf_counter() - start
+    report(f"200 tickers, collect_parallel on {'processes' if use_processes else 'threads'} vs serial", same(result, reference))
+print(
+    f"200 tickers x 10 years, {workers} workers (default max_workers on {workers} CPUs): serial {timings['serial']:.2f} s, "
+    f"processes {timings['processes']:.2f} s, threads {timings['threads']:.2f} s"
+)
+if workers > 1:
+    print(f"  speedup: processes {timings['serial'] / timings['processes']:.1f}x, threads {timings['serial'] / timings['threads']:.1f}x")
+else:
+    print("  speedup not measured: only one CPU is available, so the pool cannot run files concurrently")
+
+shutil.rmtree(work_dir)
@@ -0,0 +1,116 @@
+"""
+This code provides a simple check of the parameterized indicators and of the parameter sweep.
+
+1. It collects and cleans the historical data (oldest bar first) and picks a set of non default windows and thresholds.
+
+2. For every ticker it compares TechnicalIndicators.calculate_all_indicators and FeatureEngineer.create_all_features with those parameters (ta library, the reference) against the "numpy" backend and against the shared intermediates of SharedIndicators used by the sweep.
+
+3. With the same non default thresholds, it checks that the RSI and Stochastic contributions of RecommendationScorer.score_history agree with the RSI_Signal and Stoch_Signal of the panel on every bar, and that the default thresholds would not.
+
+4. It checks that the outputs record the parameters behind the default column names: df.attrs["params"] of the indicator/feature frames, every parameter in the sweep CSV header and rows, and the parameters not in the grid in results.attrs["params"].
+
+5. It runs ParameterSweep over the default grid on a process pool, streaming the rows to a CSV file, and prints the timing and the best configurations.
+"""
+
+import os
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from data_collection import StockDataCollector
+from data_cleaning import StockDataCleaner
+from technical_indicators import TechnicalIndicators
+from feature_engineering import FeatureEngineer
+from incremental_indicators import IndicatorState
+from panel_indicators import Panel
+from parameter_sweep import SharedIndicators, ParameterSweep
+from recommendation_engine import RecommendationScorer
+
+params = {
+    "sma_fast": 20,
+    "sma_slow": 100,
+    "ema_fast": 8,
+    "ema_slow": 21,
+    "macd_signal": 5,
+    "rsi_window": 9,
+    "stoch_window": 10,
+    "stoch_smooth": 4,
+    "bb_window": 15,
+    "bb_dev": 2.5,
+    "atr_window": 10,
+    "rsi_oversold": 25,
+    "rsi_overbought": 75,
+    "stoch_oversold": 15,
+    "stoch_overbought": 85,
+    "stop_atr": 3,
+}
+
+collector = StockDataCollector()
+collector.collect_data()
+cleaned_data = StockDataCleaner.clean_all(collector, sort_descending=False)
+
+panel = Panel.from_frames(cleaned_data)
+shared = SharedIndicators(panel)
+# Warm the shared cache with other windows first, so the check covers reused intermediates
+shared.panel_for({"stoch_window": 5, "sma_fast": 10})
+shared_panel = shared.panel_for(params)
+
+for j, (ticker, df) in enumerate(sorted(cleaned_data.items())):
+    oracle = FeatureEngineer.create_all_features(
+        TechnicalIndicators.calculate_all_indicators(df.copy(), params=params), params
+    )
+    kernels = TechnicalIndicators.calculate_all_indicators(
+        df.copy(), backend="numpy", params=params
+    )
+    rows = panel.dates.get_indexer(df["Date"])
+    worst = 0.0
+    for col in IndicatorState.COLUMNS + ["Stop_Loss_Long", "Stop_Loss_Short"]:
+        scale = oracle[col].abs().clip(lower=1).to_numpy()
+        if col in kernels:
+            worst = max(worst, np.max(np.abs(kernels[col].to_numpy() - oracle[col].to_numpy()) / scale))
+        worst = max(worst, np.max(np.abs(shared_panel[col][rows, j] - oracle[col].to_numpy()) / scale))
+    differing = sum(
+        int((shared_panel[col][rows, j] != FeatureEngineer.signal_codes(oracle[col])).sum())
+        for col in FeatureEngineer.SIGNAL_COLUMNS
+    )
+    status = "OK" if worst < 1e-8 and differing == 0 else "MISMATCH"
+    print(f"{ticker}: max rel diff {worst:.2e}, differing signals {differing}  {status}")
+    recorded = (
+        oracle.attrs["params"] == {**ParameterSweep.parameters(), **params}
+        and kernels.attrs["params"] == IndicatorState.parameters(params)
+    )
+    print(f"{ticker}: df.attrs[\"params\"] records the windows and thresholds  {'OK' if recorded else 'MISMATCH'}")
+
+codes = FeatureEngineer.CODES
+listed = ~np.isnan(shared_panel["Close"])
+for name, contribution, signal in [("RSI", "RSI", "RSI_Signal"), ("Stochastic", "Stochastic", "Stoch_Signal")]:
+    agree = {}
+    for label, thresholds in [("swept", params), ("default", None)]:
+        scored = RecommendationScorer.score_history(shared_panel, 0.0, np.inf, params=thresholds)
+        expected = np.select(
+            [shared_panel[signal] == codes["Oversold"], shared_panel[signal] == codes["Overbought"]],
+            [1, -1],
+            default=0,
+        )
+        agree[label] = np.array_equal(np.sign(scored[contribution])[listed], expected[listed])
+    status = "OK" if agree["swept"] and not agree["default"] else "MISMATCH"
+    print(f"{name} contribution vs {signal} with the swept thresholds: {status}")
+
+output_path = os.path.join(tempfile.mkdtemp(prefix="sweep_"), "sweep.csv")
+start = time.perf_counter()
+results = ParameterSweep.run(panel, output_path=output_path)
+print(
+    f"\nSweep of {len(results)} configurations: {time.perf_counter() - start:.2f} s, "
+    f"{results.memory_usage(deep=True).sum()} bytes, streamed to {output_path}"
+)
+print(results.head(10).to_string(index=False))
+
+streamed = pd.read_csv(output_path)
+defaults = ParameterSweep.parameters()
+recorded = (
+    list(streamed.columns) == list(defaults) + ParameterSweep.METRICS
+    and len(streamed) == len(results)
+    and all((streamed[name] == value).all() for name, value in defaults.items() if name not in ParameterSweep.DEFAULT_GRID)
+    and results.attrs["params"] == {name: value for name, value in defaults.items() if name not in ParameterSweep.DEFAULT_GRID}
+)
+print(f"Sweep CSV header and results.attrs record every parameter: {'OK' if recorded else 'MISMATCH'}")
@@ -0,0 +1,108 @@
+"""
+This code provides a simple check of the date range summary statistics.
+
+1. It loads and cleans the historical data, calculates the indicators and builds a Panel and its RangeStatistics (min/max of every column).
+
+2. For a set of date ranges (full history, one year, one day, none) it compares RangeStatistics.summary with the pandas mean/std/min/max of every ticker's rows in that range.
+
+3. It times one summary of all tickers against the per ticker pandas computation the Summary Statistics tab used before.
+
+4. It checks that the default RangeStatistics (min/max of Close only, as the dashboard shows) gives the same summary without the other Min/Max columns, and compares the memory of both.
+"""
+
+import time
+import numpy as np
+import pandas as pd
+from data_collection import StockDataCollector
+from data_cleaning import StockDataCleaner
+from technical_indicators import TechnicalIndicators
+from panel_indicators import Panel
+from range_statistics import RangeStatistics
+
+COLUMNS = ["Close", "Volume", "RSI", "ATR"]
+
+collector = StockDataCollector()
+collector.collect_data()
+data = {
+    ticker: TechnicalIndicators.calculate_all_indicators(df)
+    for ticker, df in StockDataCleaner.clean_all(collector, sort_descending=False).items()
+}
+panel = Panel.from_frames(data, COLUMNS)
+
+start = time.perf_counter()
+statistics = RangeStatistics.from_panel(panel, COLUMNS, extremes=COLUMNS)
+print(f"Built RangeStatistics for {len(panel.tickers)} tickers in {(time.perf_counter() - start) * 1000:.2f} ms")
+
+
+def pandas_summary(start, end):
+    rows = []
+    for ticker in panel.tickers:
+        df = data[ticker]
+        df = df[(df["Date"] >= pd.Timestamp(start)) & (df["Date"] <= pd.Timestamp(end))]
+        row = {"Ticker": ticker, "Rows": len(df)}
+        for col in COLUMNS:
+            row[f"Mean {col}"] = df[col].mean()
+            row[f"Std {col}"] = df[col].std()
+            row[f"Min {col}"] = df[col].min()
+            row[f"Max {col}"] = df[col].max()
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+ranges = [
+    ("1900-01-01", "2100-01-01"),
+    ("2024-01-01", "2024-12-31"),
+    ("2024-03-15", "2024-03-15"),
+    ("2030-01-01", "2031-01-01"),
+]
+for start_date, end_date in ranges:
+    expected = pandas_summary(start_date, end_date)
+    result = statistics.summary(start_date, end_date)
+    try:
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False, rtol=1e-9)
+        status = "OK"
+    except AssertionError as e:
+        status = f"MISMATCH {e}"
+    print(f"{start_date} .. {end_date}: {int(result['Rows'].sum())} rows  {status}")
+
+# Random ranges, compared column by column
+rng = np.random.default_rng(0)
+worst = 0.0
+for _ in range(200):
+    first, last = np.sort(rng.integers(0, len(panel.dates), 2))
+    expected = pandas_summary(panel.dates[first], panel.dates[last])
+    result = statistics.summary(panel.dates[first], panel.dates[last])
+    for col in expected.columns[1:]:
+        scale = np.maximum(np.abs(expected[col].to_numpy(float)), 1.0)
+        error = np.abs(result[col].to_numpy(float) - expected[col].to_numpy(float)) / scale
+        worst = max(worst, np.nanmax(error, initial=0.0))
+print(f"Worst relative error over 200 random ranges: {worst:.2e}")
+
+start = time.perf_counter()
+for _ in range(100):
+    statistics.summary("2020-01-01", "2025-01-01")
+summary_ms = (time.perf_counter() - start) * 10
+start = time.perf_counter()
+for _ in range(10):
+    pandas_summary("2020-01-01", "2025-01-01")
+pandas_ms = (time.perf_counter() - start) * 100
+print(f"Summary of all tickers: {summary_ms:.3f} ms (pandas per ticker: {pandas_ms:.2f} ms)")
+
+
+def nbytes(statistics):
+    """Bytes of the prefix sums and sparse tables of a RangeStatistics"""
+    arrays = [table for tables in (statistics.sums, statistics.sums_sq, statistics.counts) for table in tables.values()]
+    arrays += [level for tables in (statistics.minima, statistics.maxima) for levels in tables.values() for level in levels]
+    return sum(array.nbytes for array in arrays)
+
+
+default = RangeStatistics.from_panel(panel, COLUMNS)
+expected = statistics.summary("2020-01-01", "2025-01-01")
+expected = expected.drop(columns=[f"{stat} {col}" for col in COLUMNS[1:] for stat in ("Min", "Max")])
+try:
+    pd.testing.assert_frame_equal(default.summary("2020-01-01", "2025-01-01"), expected)
+    status = "OK"
+except AssertionError as e:
+    status = f"MISMATCH {e}"
+print(f"Default extremes (Close only) summary: {status}")
+print(f"Memory: {nbytes(default) / 2**20:.1f} MB with Close extremes vs {nbytes(statistics) / 2**20:.1f} MB with every column's")
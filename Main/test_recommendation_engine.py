@@ -0,0 +1,98 @@
+"""
+This code provides a simple check of the vectorized RecommendationScorer.
+
+1. It collects and cleans the historical data oldest bar first (like the dashboard's load_data) and checks that iloc[-1] of every frame is its latest bar, which the newest first order of clean_all's default does not give.
+
+2. For every ticker it scores all bars with score and compares the contributions, final_score and recommendation with get_recommendation on each row, with a sentiment and an ATR threshold that reach all five recommendations, and with non default RSI/Stochastic thresholds.
+
+3. It checks that rank_latest on a Panel scores each ticker's latest bar in a date range (Date is the ticker's last date in the range) exactly like get_recommendation on the last row of the filtered frame with the dashboard's ATR quantile, and times both.
+"""
+
+import time
+import numpy as np
+import pandas as pd
+from data_collection import StockDataCollector
+from data_cleaning import StockDataCleaner
+from technical_indicators import TechnicalIndicators
+from feature_engineering import FeatureEngineer
+from recommendation_engine import RecommendationScorer
+from panel_indicators import Panel
+
+
+def report(name, ok):
+    print(f"{name}: {'OK' if ok else 'MISMATCH'}")
+
+
+collector = StockDataCollector()
+collector.collect_data()
+newest_first = StockDataCleaner.clean_all(collector)
+cleaned_data = StockDataCleaner.clean_all(collector, sort_descending=False)
+report(
+    "sort_descending=False: iloc[-1] is the latest bar",
+    all(df["Date"].iloc[-1] == df["Date"].max() for df in cleaned_data.values())
+    and not any(df["Date"].iloc[-1] == df["Date"].max() for df in newest_first.values()),
+)
+
+featured = {
+    ticker: FeatureEngineer.create_all_features(TechnicalIndicators.calculate_all_indicators(df.copy()))
+    for ticker, df in sorted(cleaned_data.items())
+}
+contributions = ["Composite", "MA", "MACD", "RSI", "Stochastic", "Sentiment"]
+thresholds = {"rsi_oversold": 35, "rsi_overbought": 65, "stoch_oversold": 25, "stoch_overbought": 75}
+
+for ticker, df in featured.items():
+    for params in [None, thresholds]:
+        rng = np.random.default_rng(0)
+        sentiment = rng.uniform(-1, 1, len(df))
+        atr_threshold = df["ATR"].quantile(0.5)
+        scored = RecommendationScorer.score(df, sentiment, atr_threshold, params=params)
+        mismatches = 0
+        seen = set()
+        for i, (_, bar) in enumerate(df.iterrows()):
+            recommendation, _, final_score, signal_contributions = RecommendationScorer.get_recommendation(
+                bar, sentiment[i], atr_threshold, params=params
+            )
+            seen.add(recommendation)
+            same = (
+                RecommendationScorer.RECOMMENDATIONS[scored["Recommendation"][i]] == recommendation
+                and scored["final_score"][i] == final_score
+                and all(scored[name][i] == signal_contributions[name] for name in contributions)
+            )
+            mismatches += not same
+        label = "default thresholds" if params is None else "custom thresholds"
+        report(
+            f"{ticker}, {label}: score vs get_recommendation on {len(df)} rows ({len(seen)} recommendations seen, {mismatches} differing)",
+            mismatches == 0 and len(seen) == len(RecommendationScorer.RECOMMENDATIONS),
+        )
+
+panel = Panel.from_frames(featured, ["Close", "Composite_Signal", "MA_Signal", "MACD_Cross", "RSI", "Stoch_%K", "Stoch_%D", "ATR"])
+sentiment = {ticker: s for ticker, s in zip(panel.tickers, np.linspace(-0.9, 0.9, len(panel.tickers)))}
+for start, end in [(None, None), (pd.Timestamp("2020-01-01"), pd.Timestamp("2022-06-30"))]:
+    begin = time.perf_counter()
+    ranked = RecommendationScorer.rank_latest(panel, sentiment, start, end).set_index("Ticker")
+    ranked_ms = (time.perf_counter() - begin) * 1000
+
+    begin = time.perf_counter()
+    ok = sorted(ranked.index) == sorted(featured)
+    for ticker, df in featured.items():
+        mask = pd.Series(True, index=df.index)
+        if start is not None:
+            mask &= df["Date"] >= start
+        if end is not None:
+            mask &= df["Date"] <= end
+        filtered = df[mask]
+        latest = filtered.iloc[-1]
+        recommendation, _, final_score, _ = RecommendationScorer.get_recommendation(
+            latest, sentiment[ticker], filtered["ATR"].quantile(0.75)
+        )
+        row = ranked.loc[ticker]
+        ok = (
+            ok
+            and row["Date"] == filtered["Date"].max()
+            and row["Recommendation"] == recommendation
+            and np.isclose(row["Score"], final_score, rtol=0, atol=1e-12)
+        )
+    loop_ms = (time.perf_counter() - begin) * 1000
+    span = "all dates" if start is None else f"{start:%Y-%m-%d} to {end:%Y-%m-%d}"
+    report(f"rank_latest vs get_recommendation on the last row, {span}", ok)
+    print(f"  rank_latest {ranked_ms:.1f} ms, filter + get_recommendation loop {loop_ms:.1f} ms")
@@ -0,0 +1,132 @@
+"""
+This code provides a simple check of the sentiment model module.
+
+1. It trains StockSentimentAnalyzer on the Kaggle sentiment data into a temporary model file with load_or_train, and loads it again (which must not retrain).
+
+2. It checks that preprocess_texts matches preprocess_text on every row, and that the batched predict_sentiment of the whole corpus matches the one-text-at-a-time predictions of the notebook (model.predict / predict_proba).
+
+3. It prints the per-ticker scores the dashboard uses and times training, loading and batched scoring.
+
+4. It compares analyze_stock_sentiments with the notebook's row by row version (iterrows and extract_tickers), checks generate_recommendations against Datasets/Stock Suggestion/top5_stock_recommendations.csv, and times the single pass aggregation on a corpus repeated 100 times, with and without a known ticker universe.
+
+5. It matches lower case English text against a universe of real symbols that are also words (ALL, NOW, IT, ON, CAT, A, T, F, ...), which must find no mention, and texts with cashtags, upper case, lower case and dotted symbols, which must find exactly the expected ones, with extract and mentions.
+"""
+
+import os
+import shutil
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from sentiment_analysis import StockSentimentAnalyzer
+
+data_path, _ = StockSentimentAnalyzer.default_paths()
+df = pd.read_csv(data_path)
+work_dir = tempfile.mkdtemp(prefix="sentiment_")
+model_path = os.path.join(work_dir, "sentiment_model.joblib")
+
+start = time.perf_counter()
+analyzer = StockSentimentAnalyzer.load_or_train(data_path, model_path)
+train_s = time.perf_counter() - start
+start = time.perf_counter()
+loaded = StockSentimentAnalyzer.load_or_train(data_path, model_path)
+load_s = time.perf_counter() - start
+print(f"Trained in {train_s:.2f} s (accuracy {analyzer.metadata['accuracy']:.3f}), loaded in {load_s:.3f} s, retrained on load: {loaded.metadata['trained'] != analyzer.metadata['trained']}")
+
+expected = [analyzer.preprocess_text(text) for text in df["Text"]]
+status = "OK" if list(analyzer.preprocess_texts(df["Text"])) == expected else "MISMATCH"
+print(f"preprocess_texts vs preprocess_text: {status}")
+
+start = time.perf_counter()
+batch = loaded.predict_sentiment(df["Text"], batch_size=2000)
+batch_ms = (time.perf_counter() - start) * 1000
+sample = df["Text"].iloc[:500]
+start = time.perf_counter()
+single = [loaded.predict_sentiment(text) for text in sample]
+single_ms = (time.perf_counter() - start) * 1000 * len(df) / len(sample)
+
+X = loaded.vectorizer.transform(expected)
+reference = loaded.model.predict(X)
+probability = loaded.model.predict_proba(X)
+status = "OK" if (
+    np.array_equal(batch["Prediction"].to_numpy(), reference)
+    and np.allclose(batch["Positive"].to_numpy(), probability[:, list(loaded.model.classes_).index(1)])
+    and [result["prediction"] for result in single] == list(reference[: len(sample)])
+) else "MISMATCH"
+print(f"Batched predictions vs model.predict: {status}")
+print(f"Scoring {len(df)} texts: {batch_ms:.1f} ms batched vs ~{single_ms:.0f} ms one at a time")
+
+print(loaded.ticker_scores(df["Text"], ["AAPL", "AMZN", "GOOGL", "META", "NFLX", "XYZQ"]).round(3).to_string(index=False))
+
+
+def reference_summary(analyzer, df):
+    """The notebook's analyze_stock_sentiments: one extract_tickers call and one dictionary per row"""
+    stock_data = []
+    for idx, row in df.iterrows():
+        for ticker in analyzer.extract_tickers(row["Text"]):
+            stock_data.append({"ticker": ticker, "sentiment": row["Sentiment"], "text": row["Text"]})
+    summary = pd.DataFrame(stock_data).groupby("ticker").agg({"sentiment": ["count", "mean", "sum"], "text": "count"}).round(3)
+    summary.columns = ["mention_count", "avg_sentiment", "total_sentiment", "text_count"]
+    summary = summary.reset_index()
+    summary = summary[summary["mention_count"] >= 2]
+    return summary.sort_values("avg_sentiment", ascending=False)
+
+
+start = time.perf_counter()
+expected = reference_summary(loaded, df)
+reference_ms = (time.perf_counter() - start) * 1000
+start = time.perf_counter()
+summary = loaded.analyze_stock_sentiments(df, chunk_size=1000)
+summary_ms = (time.perf_counter() - start) * 1000
+try:
+    pd.testing.assert_frame_equal(summary, expected, check_dtype=False)
+    status = "OK"
+except AssertionError as e:
+    status = f"MISMATCH {e}"
+print(f"analyze_stock_sentiments vs row by row: {status} ({summary_ms:.1f} ms vs {reference_ms:.1f} ms, {len(summary)} tickers)")
+
+saved = pd.read_csv(os.path.join(os.path.dirname(data_path), "..", "Stock Suggestion", "top5_stock_recommendations.csv"))
+try:
+    pd.testing.assert_frame_equal(loaded.generate_recommendations(summary), saved, check_dtype=False)
+    status = "OK"
+except AssertionError as e:
+    status = f"MISMATCH {e}"
+print(f"generate_recommendations vs top5_stock_recommendations.csv: {status}")
+
+large = pd.concat([df] * 100, ignore_index=True)
+for universe in [None, ["AAPL", "AMZN", "GOOGL", "META", "NFLX"]]:
+    start = time.perf_counter()
+    loaded.analyze_stock_sentiments(large, universe=universe)
+    elapsed = time.perf_counter() - start
+    print(f"{len(large)} texts, universe {universe}: {elapsed:.2f} s ({len(large) / elapsed:,.0f} texts/s), {len(loaded.sentiment_counts.frame())} tickers")
+
+UNIVERSE = [
+    "A", "AAPL", "ALL", "AMZN", "ARE", "BE", "BRK.B", "C", "CAT", "D", "DD", "ED", "ES", "F", "GE", "GOOGL", "HAS", "HD", "IT",
+    "K", "KEY", "L", "LOW", "MA", "META", "MO", "MS", "MSFT", "NFLX", "NOW", "O", "ON", "PM", "SO", "T", "TAP", "V", "WELL",
+]
+english = [
+    "it is all on the cat now, so we will see what happens next.",
+    "a key reason to be careful is that the low end of the market has been weak.",
+    "are you going to the game on saturday? ed said it was sold out.",
+    "i think it has to go up from here, but who knows, so be patient and keep calm.",
+    "the cat sat on the mat all day while o and t were busy with their homework.",
+    "well, that is a lot to take in; tap the screen to continue or go back.",
+]
+matcher = loaded.ticker_matcher(UNIVERSE)
+found = matcher.mentions(english)
+status = "OK" if found.empty and not any(matcher.extract(text) for text in english) else f"MISMATCH {found['Ticker'].tolist()}"
+print(f"\nLower case English text vs a universe of {len(UNIVERSE)} symbols: {status}")
+
+texts = [
+    "bought $aapl and $BRK.B today, sold some $F",
+    "MSFT and CAT rallied while nflx slipped; brk.b is flat",
+    "ALL IN ON IT NOW",
+    "$all and $it report tomorrow, fb is up",
+]
+expected = [["AAPL", "BRK.B", "F"], ["MSFT", "CAT", "NFLX", "BRK.B"], [], ["ALL", "IT"]]
+found = matcher.mentions(texts).groupby("Row")["Ticker"].apply(list).reindex(range(len(texts)))
+found = [tickers if isinstance(tickers, list) else [] for tickers in found]
+status = "OK" if found == expected and [matcher.extract(text) for text in texts] == expected else f"MISMATCH {found}"
+print(f"Cashtags, upper case, lower case and dotted symbols: {status}")
+
+shutil.rmtree(work_dir)
@@ -0,0 +1,128 @@
+"""
+This code provides a simple check of the time decaying sentiment index.
+
+1. The bundled sentiment corpus has no dates, so it stamps every text with a random time between 2015 and 2024 and extracts the ticker mentions with SentimentIndex.mentions (labels and model scores).
+
+2. It checks that one update per mention (in random order), one update_many and two halves built separately and merged give the same sums, that save/load round trips, and compares the scores as of a date with a brute force decayed sum over every mention.
+
+3. It builds the (dates x tickers) history over the panel dates and checks a few rows against indices built only from the mentions up to that date and every row against brute force decayed sums (also with a half life short enough to need several blocks), then runs RecommendationBacktester with the per bar sentiment and with the whole corpus score.
+
+4. It times single updates, update_many and history.
+"""
+
+import os
+import shutil
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from data_collection import StockDataCollector
+from data_cleaning import StockDataCleaner
+from backtest import RecommendationBacktester
+from recommendation_engine import RecommendationScorer
+from sentiment_analysis import StockSentimentAnalyzer
+from sentiment_index import SentimentIndex
+
+HALF_LIFE = 30.0
+data_path, _ = StockSentimentAnalyzer.default_paths()
+df = pd.read_csv(data_path)
+rng = np.random.default_rng(42)
+first, last = pd.Timestamp("2015-01-01").value, pd.Timestamp("2024-12-31").value
+df["Date"] = pd.to_datetime(rng.integers(first, last, len(df)))
+
+work_dir = tempfile.mkdtemp(prefix="sentiment_index_")
+analyzer = StockSentimentAnalyzer.load_or_train(data_path, os.path.join(work_dir, "model.joblib"))
+collector = StockDataCollector()
+collector.collect_data()
+panel = RecommendationBacktester.prepare(StockDataCleaner.clean_all(collector, sort_descending=False))
+
+mentions = pd.concat(SentimentIndex.mentions(analyzer, df, panel.tickers, chunk_size=1000, use_labels=True), ignore_index=True)
+scored = pd.concat(SentimentIndex.mentions(analyzer, df, panel.tickers), ignore_index=True)
+print(f"{len(mentions)} mentions of {mentions['Ticker'].nunique()} panel tickers, model scores in [{scored['Sentiment'].min():.2f}, {scored['Sentiment'].max():.2f}]")
+
+
+def report(name, ok):
+    print(f"{name}: {'OK' if ok else 'MISMATCH'}")
+
+
+def same(a, b):
+    tickers = sorted(a.slots)
+    return tickers == sorted(b.slots) and np.allclose(
+        a.values[:, a._columns(tickers)], b.values[:, b._columns(tickers)], rtol=1e-9, atol=1e-12
+    ) and np.allclose(a.last[a._columns(tickers)], b.last[b._columns(tickers)])
+
+
+start = time.perf_counter()
+single = SentimentIndex(HALF_LIFE)
+shuffled = mentions.sample(frac=1, random_state=1)
+for date, ticker, sentiment in zip(shuffled["Date"], shuffled["Ticker"], shuffled["Sentiment"]):
+    single.update(date, ticker, sentiment)
+single_us = (time.perf_counter() - start) * 1e6 / len(mentions)
+
+start = time.perf_counter()
+batch = SentimentIndex(HALF_LIFE).ingest(mentions)
+batch_ms = (time.perf_counter() - start) * 1000
+report("update per mention (shuffled) vs update_many", same(single, batch))
+
+half = len(mentions) // 2
+merged = SentimentIndex(HALF_LIFE).ingest(mentions.iloc[:half]).merge(SentimentIndex(HALF_LIFE).ingest(mentions.iloc[half:]))
+report("Two halves merged vs whole", same(merged, batch))
+
+path = os.path.join(work_dir, "index.npz")
+batch.save(path)
+report(f"save/load ({os.path.getsize(path)} bytes)", same(SentimentIndex.load(path), batch))
+
+as_of = pd.Timestamp("2025-03-01")
+age = (as_of - mentions["Date"]).dt.total_seconds().to_numpy() / 86400
+weight = np.exp2(-age / HALF_LIFE)
+brute = (
+    pd.DataFrame({"Ticker": mentions["Ticker"], "Total": weight * mentions["Sentiment"], "Count": weight})
+    .groupby("Ticker")
+    .sum()
+)
+expected = (brute["Total"] / (brute["Count"] + batch.prior)).to_numpy()
+result = batch.frame(as_of).set_index("Ticker").loc[brute.index, "Score"].to_numpy()
+report("Scores as of 2025-03-01 vs brute force decayed sums", np.allclose(result, expected))
+
+start = time.perf_counter()
+history = SentimentIndex.history(mentions, panel.dates, panel.tickers, HALF_LIFE)
+history_ms = (time.perf_counter() - start) * 1000
+ok = True
+for row in [0, len(panel.dates) // 3, len(panel.dates) // 2, len(panel.dates) - 1]:
+    date = panel.dates[row]
+    upto = SentimentIndex(HALF_LIFE).ingest(mentions[mentions["Date"] <= date])
+    ok &= np.allclose(history[row], upto.scores(date, panel.tickers))
+report("history rows vs indices of the mentions up to each date", ok)
+
+
+def brute_history(half_life):
+    """(dates x tickers) scores from the decayed sums of all mentions at or before each date"""
+    age = (panel.dates.to_numpy()[:, None] - mentions["Date"].to_numpy()[None, :]) / np.timedelta64(1, "D")
+    weight = np.where(age >= 0, np.exp2(-np.clip(age, 0, None) / half_life), 0.0)
+    scores = np.zeros((len(panel.dates), len(panel.tickers)))
+    for j, ticker in enumerate(panel.tickers):
+        mine = (mentions["Ticker"] == ticker).to_numpy()
+        scores[:, j] = weight[:, mine] @ mentions["Sentiment"].to_numpy()[mine] / (weight[:, mine].sum(axis=1) + 1.0)
+    return scores
+
+
+# A half life of one day spans several blocks of 500 half lives over the panel dates
+for half_life in [HALF_LIFE, 1.0]:
+    report(
+        f"history vs brute force decayed sums on every date (half life {half_life:g} days)",
+        np.allclose(SentimentIndex.history(mentions, panel.dates, panel.tickers, half_life), brute_history(half_life), rtol=1e-9, atol=1e-12),
+    )
+
+latest = RecommendationScorer.rank_latest(panel, history)
+report("rank_latest with the history reads the latest bar", np.allclose(latest["Sentiment"], history[-1][[panel.tickers.index(t) for t in latest["Ticker"]]]))
+
+static = analyzer.ticker_scores(df["Text"], panel.tickers).set_index("Ticker")["Sentiment Score"]
+static = [static.get(ticker, 0.0) for ticker in panel.tickers]
+columns = ["Ticker", "Trades", "Hit Rate", "Total Return"]
+print("Backtest, whole corpus score:")
+print(RecommendationBacktester.run(panel, sentiment=static)[columns].round(3).to_string(index=False))
+print("Backtest, per bar sentiment index:")
+print(RecommendationBacktester.run(panel, sentiment=history)[columns].round(3).to_string(index=False))
+
+print(f"update: {single_us:.1f} us per mention, update_many: {batch_ms:.1f} ms for {len(mentions)} mentions, history: {history_ms:.1f} ms for {len(panel.dates)} dates x {len(panel.tickers)} tickers")
+shutil.rmtree(work_dir)
@@ -0,0 +1,76 @@
+"""
+This code provides a simple check of the chunked (streaming) sentiment scoring.
+
+1. It checks that reading the sentiment CSV in chunks gives the same analyze_stock_sentiments summary and the same ticker_scores as the whole DataFrame, and that the SentimentCounts of two halves merge into those of the whole corpus.
+
+2. It trains a StreamingSentimentAnalyzer (HashingVectorizer + SGDClassifier, partial_fit) on 80% of the data and reports its progressive and held-out accuracy next to the TF-IDF model.
+
+3. It writes the corpus 50 times over into a temporary CSV and scores it chunk by chunk, reporting the throughput and the peak memory (tracemalloc) for two chunk sizes, against the size of the file.
+"""
+
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+from sentiment_analysis import SentimentCounts, StockSentimentAnalyzer, StreamingSentimentAnalyzer
+
+TICKERS = ["AAPL", "AMZN", "GOOGL", "META", "NFLX"]
+data_path, _ = StockSentimentAnalyzer.default_paths()
+df = pd.read_csv(data_path)
+work_dir = tempfile.mkdtemp(prefix="sentiment_stream_")
+analyzer = StockSentimentAnalyzer.load_or_train(data_path, os.path.join(work_dir, "tfidf.joblib"))
+
+
+def check(name, result, expected):
+    try:
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+        print(f"{name}: OK")
+    except AssertionError as e:
+        print(f"{name}: MISMATCH {e}")
+
+
+check(
+    "analyze_stock_sentiments, CSV in chunks of 700 vs DataFrame",
+    analyzer.analyze_stock_sentiments(data_path, chunk_size=700),
+    analyzer.analyze_stock_sentiments(df),
+)
+check(
+    "ticker_scores, CSV in chunks of 500 vs Series",
+    analyzer.ticker_scores(data_path, TICKERS, 500),
+    analyzer.ticker_scores(df["Text"], TICKERS, len(df)),
+)
+half = len(df) // 2
+merged = analyzer.score_stream(df.iloc[:half], TICKERS).merge(analyzer.score_stream(df.iloc[half:], TICKERS))
+check("SentimentCounts of two halves merged vs whole", merged.frame(), analyzer.score_stream(df, TICKERS).frame())
+
+train, test = train_test_split(df, test_size=0.2, random_state=42)
+streaming = StreamingSentimentAnalyzer()
+progressive = streaming.train_model(train, chunk_size=1000)
+held_out = (streaming.predict_sentiment(test["Text"])["Prediction"].to_numpy() == test["Sentiment"].to_numpy()).mean()
+print(f"Streaming model: progressive accuracy {progressive:.3f}, held-out accuracy {held_out:.3f} (TF-IDF model: {analyzer.metadata['accuracy']:.3f})")
+
+large_path = os.path.join(work_dir, "large.csv")
+for _ in range(50):
+    df.to_csv(large_path, mode="a", header=not os.path.exists(large_path), index=False)
+file_mb = os.path.getsize(large_path) / 2**20
+print(f"Large corpus: {len(df) * 50} texts, {file_mb:.0f} MB on disk")
+
+for chunk_size in [10000, 100000]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    counts = streaming.score_stream(large_path, TICKERS, chunk_size)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    total = counts.frame()
+    print(f"chunk_size {chunk_size}: {len(df) * 50 / elapsed:,.0f} texts/s, peak {peak / 2**20:.0f} MB, {int(total['Count'].sum())} ticker mentions scored")
+
+expected = streaming.ticker_scores(df["Text"], TICKERS)
+result = counts.frame()
+status = "OK" if np.array_equal(result["Count"].to_numpy(), 50 * expected.set_index("Ticker").loc[result["Ticker"], "Count"].to_numpy()) else "MISMATCH"
+print(f"Mention counts of the large corpus are 50x those of the corpus: {status}")
+shutil.rmtree(work_dir)
@@ -0,0 +1,80 @@
+"""
+This code provides a simple check of the LSTM sequence dataset.
+
+1. It builds the META dataset of Notebooks/LSTM_prediction.ipynb (indicators, Target, MinMaxScaler, 30 backcandles, 80% split) with the notebook's loop of slices and np.moveaxis, and with SequenceDataset, and checks that X_train, X_test, y_train and y_test are equal.
+
+2. It checks that the windows are views of the float32 array (no copy), that the shuffled batches cover the training windows once, and that the windows of a multi-ticker dataset never cross from one ticker into the next.
+
+3. It times both builds and reports their memory, for META and for 200 synthetic tickers of 20 years.
+"""
+
+import time
+import numpy as np
+from sklearn.preprocessing import MinMaxScaler
+from data_collection import StockDataCollector
+from data_cleaning import StockDataCleaner
+from sequence_dataset import SequenceDataset
+from synthetic_data import SyntheticOHLCVGenerator
+
+BACKCANDLES = 30
+
+
+def notebook_build(data_set_scaled):
+    """The notebook's windowing: one list of slices per feature, then np.moveaxis"""
+    X = []
+    for j in range(15):
+        X.append([])
+        for i in range(BACKCANDLES, data_set_scaled.shape[0]):
+            X[j].append(data_set_scaled[i - BACKCANDLES : i, j])
+    X = np.moveaxis(X, [0], [2])
+    X, yi = np.array(X), np.array(data_set_scaled[BACKCANDLES:, -1])
+    y = np.reshape(yi, (len(yi), 1))
+    splitlimit = int(len(X) * 0.8)
+    return X[:splitlimit], X[splitlimit:], y[:splitlimit], y[splitlimit:]
+
+
+collector = StockDataCollector()
+collector.collect_data()
+cleaned = StockDataCleaner.clean_all(collector)
+data_set = SequenceDataset.prepare(cleaned["META"])
+
+start = time.perf_counter()
+expected = notebook_build(MinMaxScaler(feature_range=(0, 1)).fit_transform(data_set))
+notebook_ms = (time.perf_counter() - start) * 1000
+start = time.perf_counter()
+dataset = SequenceDataset(SequenceDataset.scale(data_set.to_numpy()), backcandles=BACKCANDLES)
+(X_train, y_train), (X_test, y_test) = dataset.train(), dataset.test()
+build_ms = (time.perf_counter() - start) * 1000
+
+print(f"Shapes: {X_train.shape} {X_test.shape} {y_train.shape} {y_test.shape} (notebook {expected[0].shape} {expected[1].shape} {expected[2].shape} {expected[3].shape})")
+same = all(
+    np.allclose(result, reference, rtol=0, atol=1e-6)
+    for result, reference in zip([X_train, X_test, y_train, y_test], expected)
+)
+print(f"X_train, X_test, y_train, y_test vs notebook (float32 vs float64): {'OK' if same else 'MISMATCH'}")
+views = all(np.shares_memory(part, dataset.values) for part in [X_train, X_test, y_train, y_test])
+print(f"Windows are views of the float32 array: {'OK' if views else 'MISMATCH'}")
+print(f"META: {build_ms:.2f} ms and {dataset.values.nbytes / 2**10:.0f} KB vs notebook {notebook_ms:.1f} ms and {sum(part.nbytes for part in expected) / 2**10:.0f} KB")
+
+seen = np.concatenate([y for _, y in dataset.batches(15, shuffle=True, seed=0)])
+print(f"Shuffled batches cover the training windows once: {'OK' if np.array_equal(np.sort(seen, axis=0), np.sort(y_train, axis=0)) else 'MISMATCH'}")
+
+frames = {ticker: StockDataCleaner.clean_data(df) for ticker, df in SyntheticOHLCVGenerator(n_tickers=200, n_years=20).generate().items()}
+multi = SequenceDataset.from_frames(dict(list(frames.items())[:3]), BACKCANDLES)
+offsets = np.cumsum([0] + multi.lengths)
+starts = np.concatenate([multi.train_starts, multi.test_starts])
+crossing = ((starts[:, None] < offsets[1:-1]) & (starts[:, None] + BACKCANDLES >= offsets[1:-1])).any()
+print(f"Multi-ticker windows and targets stay inside one ticker: {'MISMATCH' if crossing else 'OK'} ({len(starts)} windows of {len(multi.lengths)} tickers)")
+
+prepared = [SequenceDataset.scale(SequenceDataset.prepare(df).to_numpy()) for df in frames.values()]
+rows = sum(len(part) for part in prepared)
+start = time.perf_counter()
+large = SequenceDataset(np.concatenate(prepared), [len(part) for part in prepared], BACKCANDLES)
+large_ms = (time.perf_counter() - start) * 1000
+samples = len(large.train_starts) + len(large.test_starts)
+print(f"{len(prepared)} synthetic tickers, {rows} rows: dataset built in {large_ms:.1f} ms, {large.values.nbytes / 2**20:.1f} MB float32 "
+      f"(a materialized float64 tensor like the notebook's would take {samples * BACKCANDLES * 15 * 8 / 2**30:.1f} GB)")
+
+start = time.perf_counter()
+batches = sum(1 for _ in large.batches(256, shuffle=True, seed=0))
+print(f"One shuffled epoch of {batches} batches of 256: {(time.perf_counter() - start) * 1000:.0f} ms")
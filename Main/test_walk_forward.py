@@ -0,0 +1,77 @@
+"""
+This code provides a simple check of the walk-forward linear regression engine.
+
+1. It prepares AAPL as Notebooks/stock_prediction_linear_regression.ipynb does (newest first, Previous_Close, indicators, dropna) and compares the overall MAE and MSE of WalkForwardRegression.run with the numbers printed by the notebook.
+
+2. It checks the normal equations built with rank-one add/drop updates against sums rebuilt from the rows of every window, and the predictions of a sample of windows against a least squares solve of the window rows (SVD) and against the notebook's loop (LinearRegression per window, one row per predict), on the standardized features without the two exactly collinear columns (MACD, MACD_Hist), where LinearRegression is stable (with every raw feature it is not: this sklearn version gives AAPL an MAE of about 6.5 instead of the notebook's 0.419).
+
+3. It times the notebook's loop on a sample of windows (extrapolated to all windows) against run for one ticker, and run_all over every ticker serially and in parallel, in notebook order and oldest first.
+"""
+
+import time
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LinearRegression
+from data_collection import StockDataCollector
+from data_cleaning import StockDataCleaner
+from walk_forward import WalkForwardRegression
+
+NOTEBOOK = {"Linear Regression MAE": 0.419, "Linear Regression MSE": 0.395, "Baseline MAE": 1.192, "Baseline MSE": 3.649}
+
+collector = StockDataCollector()
+collector.collect_data()
+cleaned = StockDataCleaner.clean_all(collector)
+engine = WalkForwardRegression()
+df = engine.prepare(cleaned["AAPL"])
+
+start = time.perf_counter()
+result = engine.run(df)
+run_ms = (time.perf_counter() - start) * 1000
+summary = engine.summary(result)
+status = "OK" if all(round(summary[name], 3) == value for name, value in NOTEBOOK.items()) else "MISMATCH"
+print(f"AAPL overall metrics vs notebook output {NOTEBOOK}: {status} ({', '.join(f'{k} {v:.3f}' for k, v in summary.items())})")
+print(f"{len(result)} predictions, {result['Date'].nunique()} distinct dates")
+
+X = engine._standardize(df[engine.features].to_numpy(dtype=float))
+y = df["Close"].to_numpy(dtype=float)
+updated = engine.normal_equations(X, y)
+rows = np.column_stack([X, np.ones(len(X)), y])
+w = engine.train_window
+rebuilt = np.array([rows[i - w : i].T @ rows[i - w : i] for i in engine._windows(len(X))])
+error = np.abs(updated - rebuilt).max() / np.abs(rebuilt).max()
+print(f"Rank-one updated vs rebuilt normal equations: {'OK' if error < 1e-12 else 'MISMATCH'} (max relative error {error:.1e})")
+
+t = engine.test_window
+predictions = result["Prediction"].to_numpy().reshape(-1, t)
+sample = engine._windows(len(df))[::50]
+independent = [f for f in engine.features if f not in ("MACD", "MACD_Hist")]
+# LinearRegression solves the raw features with a cutoff relative to the Volume scale, so it gets the standardized ones
+scaled = pd.DataFrame(X, columns=engine.features)[independent].assign(Close=y)
+svd_error = sklearn_error = 0.0
+start = time.perf_counter()
+for i in sample:
+    window, test = X[i - w : i], X[i : i + t]
+    center = window.mean(axis=0)
+    beta = np.linalg.lstsq(window - center, y[i - w : i] - y[i - w : i].mean(), rcond=1e-5)[0]
+    svd = (test - center) @ beta + y[i - w : i].mean()
+    svd_error = max(svd_error, np.abs(svd - predictions[i - w]).max())
+
+    # The notebook's loop body, on the independent features
+    train_data, test_data = scaled.iloc[i - w : i], scaled.iloc[i : i + t]
+    model = LinearRegression().fit(train_data[independent], train_data["Close"])
+    notebook = [model.predict(test_data[independent].iloc[[j]])[0] for j in range(len(test_data))]
+    sklearn_error = max(sklearn_error, np.abs(np.array(notebook) - predictions[i - w]).max())
+loop_s = (time.perf_counter() - start) / len(sample) * len(predictions)
+print(f"Predictions of {len(sample)} windows vs SVD least squares: {'OK' if svd_error < 1e-6 else 'MISMATCH'} (max abs error {svd_error:.1e})")
+print(f"Predictions of {len(sample)} windows vs notebook loop without MACD/MACD_Hist: {'OK' if sklearn_error < 1e-6 else 'MISMATCH'} (max abs error {sklearn_error:.1e})")
+print(f"AAPL: run {run_ms:.1f} ms vs notebook loop ~{loop_s:.1f} s")
+
+for name, data in [("notebook order", cleaned), ("oldest first", StockDataCleaner.clean_all(collector, sort_descending=False))]:
+    timings = {}
+    for workers in [1, None]:
+        start = time.perf_counter()
+        results = engine.run_all(data, max_workers=workers)
+        timings[workers] = time.perf_counter() - start
+    print(f"\nrun_all, {name}: {timings[1]:.2f} s serial, {timings[None]:.2f} s parallel")
+    table = pd.DataFrame([{"Ticker": ticker, **engine.summary(r)} for ticker, r in results.items()])
+    print(table.round(3).to_string(index=False))
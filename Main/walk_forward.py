@@ -0,0 +1,217 @@
+"""
+This code provides a walk-forward linear regression engine for the next day close, as in Notebooks/stock_prediction_linear_regression.ipynb, without refitting a LinearRegression per window.
+
+Usage: python walk_forward.py [--data-dir DIR] [--workers N] [--chronological] [TICKER...]
+Prints the overall Linear Regression and Baseline (previous close) MAE and MSE of every ticker.
+"""
+
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from data_collection import StockDataCollector
+from data_cleaning import StockDataCleaner
+from technical_indicators import TechnicalIndicators
+
+
+class WalkForwardRegression:
+    """
+    WalkForwardRegression class runs the notebook's walk-forward validation: for every position i, an ordinary least squares model with intercept is fitted on the train_window rows before i and predicts the test_window rows from i.
+    Class Methods:
+    1. __init__(features=None, target="Close", train_window=252, test_window=20, refresh=252): Sets the notebook's features, target and window sizes; refresh is the number of windows after which the normal equations are rebuilt from the rows instead of updated.
+    2. prepare(df): Adds Previous_Close and the technical indicators to a cleaned frame and drops rows with NaN, as the notebook does.
+    3. normal_equations(X, y): Returns the normal equations (XᵀX, Xᵀ1, Xᵀy, n, Σy) of every train window, built with one rank-one add and one rank-one drop per step.
+    4. coefficients(X, y): Returns (beta, intercept) of every train window.
+    5. run(df): Returns one row per prediction (window by window, in the notebook's order): Date, Actual, Prediction, Baseline, Prediction MAE and Baseline MAE.
+    6. summary(result): Returns the overall MAE and MSE of the predictions and of the baseline.
+    7. run_all(data, max_workers=None): Runs every ticker of a dictionary of cleaned frames in parallel and returns {ticker: result}.
+
+    The features are standardized once per ticker (the least squares predictions do not depend on an affine rescaling of the features), and every window is solved on the eigenvectors of its centered XᵀX above RCOND times the largest eigenvalue.
+    This is the minimum norm solution LinearRegression aims for, and stays stable with the notebook's features, which are exactly collinear (MACD = EMA_12 - EMA_26, MACD_Hist = MACD - MACD_Signal).
+    Each test block is predicted with one matrix product against its window's coefficients.
+
+    The notebook cleans the data newest first, so its "walk forward" runs back in time and its Previous_Close is the next day's close; pass frames sorted oldest first (clean_data(df, sort_descending=False)) for a forecast that only uses the past.
+    """
+
+    FEATURES = [
+        "Previous_Close",
+        "Volume",
+        "Open",
+        "High",
+        "Low",
+        "SMA_50",
+        "SMA_200",
+        "EMA_12",
+        "EMA_26",
+        "MACD",
+        "MACD_Signal",
+        "MACD_Hist",
+        "RSI",
+        "Stoch_%K",
+        "Stoch_%D",
+        "BB_Upper",
+        "BB_Lower",
+        "ATR",
+    ]
+    RCOND = 1e-10
+
+    def __init__(self, features=None, target="Close", train_window=252, test_window=20, refresh=252):
+        self.features = list(self.FEATURES if features is None else features)
+        self.target = target
+        self.train_window = train_window
+        self.test_window = test_window
+        self.refresh = refresh
+
+    @staticmethod
+    def prepare(df):
+        """
+        Notebook feature engineering: Previous_Close (the close of the row before), the technical indicators, then rows with NaN dropped
+        """
+        df = df.copy()
+        df["Previous_Close"] = df["Close"].shift(1)
+        df = TechnicalIndicators.calculate_all_indicators(df)
+        df.dropna(inplace=True)
+        return df
+
+    def _windows(self, n):
+        """Helper returning the first rows of the test windows (the notebook's range(train_window, n - test_window))"""
+        return np.arange(self.train_window, n - self.test_window)
+
+    @staticmethod
+    def _standardize(X):
+        """Helper scaling every feature to zero mean and unit variance (constant features are only centered)"""
+        scale = X.std(axis=0)
+        scale[scale == 0] = 1.0
+        return (X - X.mean(axis=0)) / scale
+
+    def normal_equations(self, X, y):
+        """
+        Sums of the outer products of the rows [x, 1, y] over every train window, as an array of shape (windows, p + 2, p + 2).
+        The first window is summed from its rows; every next one adds the row entering the window and drops the row leaving it (a cumulative sum of the rank-one differences), and every refresh windows the sums are rebuilt from the rows so rounding errors cannot build up.
+        """
+        rows = np.column_stack([X, np.ones(len(X)), y])
+        starts = self._windows(len(rows))
+        sums = np.empty((len(starts), rows.shape[1], rows.shape[1]))
+        w = self.train_window
+        for block in range(0, len(starts), self.refresh):
+            first = starts[block]
+            stop = min(block + self.refresh, len(starts))
+            window = rows[first - w : first]
+            sums[block] = window.T @ window
+            if stop - block > 1:
+                added = rows[first : first + stop - block - 1]
+                dropped = rows[first - w : first - w + stop - block - 1]
+                updates = np.einsum("ni,nj->nij", added, added) - np.einsum("ni,nj->nij", dropped, dropped)
+                sums[block + 1 : stop] = sums[block] + np.cumsum(updates, axis=0)
+        return sums
+
+    def coefficients(self, X, y):
+        """
+        Least squares (beta, intercept) of every train window: beta has shape (windows, p), intercept (windows,)
+        """
+        p = X.shape[1]
+        sums = self.normal_equations(X, y)
+        n = sums[:, p, p]
+        mean_x = sums[:, :p, p] / n[:, None]
+        mean_y = sums[:, p, p + 1] / n
+        # Centered XᵀX and Xᵀy, i.e. the normal equations of the model with intercept
+        gram = sums[:, :p, :p] - n[:, None, None] * mean_x[:, :, None] * mean_x[:, None, :]
+        cross = sums[:, :p, p + 1] - n[:, None] * mean_x * mean_y[:, None]
+
+        values, vectors = np.linalg.eigh(gram)
+        keep = values > self.RCOND * values[:, -1:]
+        inverse = np.divide(1.0, values, out=np.zeros_like(values), where=keep)
+        projected = np.einsum("wji,wj->wi", vectors, cross) * inverse
+        beta = np.einsum("wij,wj->wi", vectors, projected)
+        intercept = mean_y - np.einsum("wi,wi->w", mean_x, beta)
+        return beta, intercept
+
+    def run(self, df):
+        """
+        Walk-forward predictions of a prepared frame (see prepare): for every window, its test_window rows in order, as the notebook appends them
+        """
+        columns = ["Date", "Actual", "Prediction", "Baseline", "Prediction MAE", "Baseline MAE"]
+        starts = self._windows(len(df))
+        if len(starts) == 0:
+            return pd.DataFrame(columns=columns)
+        X = self._standardize(df[self.features].to_numpy(dtype=float))
+        y = df[self.target].to_numpy(dtype=float)
+        beta, intercept = self.coefficients(X, y)
+
+        t = self.test_window
+        # (windows, test_window, p) view of the test blocks, one matrix product per block
+        blocks = sliding_window_view(X, t, axis=0)[starts].transpose(0, 2, 1)
+        prediction = (np.einsum("wtp,wp->wt", blocks, beta) + intercept[:, None]).ravel()
+        positions = (starts[:, None] + np.arange(t)).ravel()
+        actual = y[positions]
+        baseline = df["Previous_Close"].to_numpy(dtype=float)[positions]
+        return pd.DataFrame(
+            {
+                "Date": df["Date"].to_numpy()[positions],
+                "Actual": actual,
+                "Prediction": prediction,
+                "Baseline": baseline,
+                "Prediction MAE": np.abs(actual - prediction),
+                "Baseline MAE": np.abs(actual - baseline),
+            }
+        )
+
+    @staticmethod
+    def summary(result):
+        """
+        Overall MAE and MSE of the predictions and of the baseline, as a dictionary
+        """
+        errors = {
+            "Linear Regression": result["Actual"] - result["Prediction"],
+            "Baseline": result["Actual"] - result["Baseline"],
+        }
+        summary = {}
+        for name, error in errors.items():
+            summary[f"{name} MAE"] = float(np.abs(error).mean())
+            summary[f"{name} MSE"] = float((error * error).mean())
+        return summary
+
+    def run_all(self, data, max_workers=None):
+        """
+        Prepare and run every ticker of {ticker: cleaned frame}; tickers run in parallel on a process pool (max_workers=1 runs them in this process)
+        """
+        tickers = list(data)
+        if max_workers == 1 or len(tickers) <= 1:
+            results = [_run_ticker(self, data[ticker]) for ticker in tickers]
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers or min(len(tickers), os.cpu_count())) as executor:
+                results = list(executor.map(_run_ticker, [self] * len(tickers), [data[ticker] for ticker in tickers]))
+        return dict(zip(tickers, results))
+
+
+def _run_ticker(engine, df):
+    """Worker: prepare and run one ticker"""
+    return engine.run(engine.prepare(df))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Walk-forward linear regression of the next day close")
+    parser.add_argument("tickers", nargs="*", help="Tickers to run (default: all)")
+    parser.add_argument("--data-dir", default=None, help="Folder with the HistoricalData_ CSV files")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (1 runs in this process)")
+    parser.add_argument(
+        "--chronological", action="store_true", help="Sort oldest first instead of the notebook's newest first"
+    )
+    args = parser.parse_args()
+
+    collector = StockDataCollector(args.data_dir)
+    collector.collect_data()
+    data = StockDataCleaner.clean_all(collector, sort_descending=not args.chronological)
+    if args.tickers:
+        data = {ticker: data[ticker] for ticker in args.tickers}
+
+    engine = WalkForwardRegression()
+    results = engine.run_all(data, args.workers)
+    table = pd.DataFrame([{"Ticker": ticker, **engine.summary(result)} for ticker, result in results.items()])
+    print(table.round(3).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()